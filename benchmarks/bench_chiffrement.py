@@ -0,0 +1,95 @@
+import sys, os, getopt, random, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cryptanalyse_vigenere import alphabet, chiffre_vigenere, dechiffre_vigenere
+
+# Tailles de textes mesurees par defaut : de 1 Ko a 100 Mo
+TAILLES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+
+# Au-dela de cette taille, l'ancienne implementation est trop lente
+# pour etre mesuree par defaut (voir l'option -n)
+MAX_NAIF = 10 ** 6
+
+
+# Anciennes implementations, caractere par caractere, gardees comme reference
+def chiffre_vigenere_naif(txt, key):
+    encrypted = ""
+    for position, ch in enumerate(txt):
+        encrypted += alphabet[(alphabet.index(ch) + key[position % len(key)]) % len(alphabet)]
+    return encrypted
+
+
+def dechiffre_vigenere_naif(txt, key):
+    decrypted = ""
+    for position, ch in enumerate(txt):
+        decrypted += alphabet[(alphabet.index(ch) - key[position % len(key)]) % len(alphabet)]
+    return decrypted
+
+
+def texte_aleatoire(taille, graine=0):
+    rng = random.Random(graine)
+    return "".join(rng.choices(alphabet, k=taille))
+
+
+def chrono(fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return time.perf_counter() - debut, resultat
+
+
+def debit(taille, duree):
+    return taille / duree / 10 ** 6 if duree > 0 else float("inf")
+
+
+def compare(tailles, max_naif, key):
+    print("%12s %14s %14s %14s %10s" % ("taille", "naif (Mo/s)", "octets (Mo/s)", "dechiffre", "gain"))
+    for taille in tailles:
+        txt = texte_aleatoire(taille)
+        duree, chiffre = chrono(chiffre_vigenere, txt, key)
+        duree_dechiffre, clair = chrono(dechiffre_vigenere, chiffre, key)
+        assert clair == txt
+        if taille <= max_naif:
+            duree_naif, chiffre_naif = chrono(chiffre_vigenere_naif, txt, key)
+            assert chiffre_naif == chiffre
+            assert dechiffre_vigenere_naif(chiffre, key) == txt
+            naif = "%14.2f" % debit(taille, duree_naif)
+            gain = "%9.0fx" % (duree_naif / duree)
+        else:
+            naif = "%14s" % "-"
+            gain = "%10s" % "-"
+        print("%12d %s %14.2f %14.2f %s" % (taille, naif, debit(taille, duree),
+                                           debit(taille, duree_dechiffre), gain))
+
+
+def usage():
+    print("Usage: python3 benchmarks/bench_chiffrement.py [-t <tailles,...>] [-n <taille max naif>] [-k <longueur clef>]",
+          file=sys.stderr)
+    sys.exit(1)
+
+
+def main(argv):
+    tailles = TAILLES
+    max_naif = MAX_NAIF
+    key_length = 7
+    try:
+        opts, args = getopt.getopt(argv, "ht:n:k:")
+    except getopt.GetoptError:
+        usage()
+    for opt, arg in opts:
+        if opt == '-h':
+            usage()
+        elif opt == '-t':
+            tailles = [int(t) for t in arg.split(",")]
+        elif opt == '-n':
+            max_naif = int(arg)
+        elif opt == '-k':
+            key_length = int(arg)
+
+    rng = random.Random(1)
+    key = [rng.randrange(len(alphabet)) for _ in range(key_length)]
+    compare(tailles, max_naif, key)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
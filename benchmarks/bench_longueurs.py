@@ -0,0 +1,72 @@
+import sys, os, getopt, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cryptanalyse_vigenere import read, cryptanalyse_v3_clef, dechiffre_vigenere
+
+# Bornes de longueur de clé mesurées par défaut
+MAX_KEY_LENGTHS = [26, 50, 100, 200, 500]
+
+# Au-delà de cette borne, l'évaluation de toutes les longueurs est trop
+# lente pour être mesurée par défaut (voir l'option -m)
+MAX_COMPLET = 100
+
+SELECTIONS = [None, "ic", "kasiski"]
+
+
+def mesure(textes, max_key_length, selection):
+    """
+    Cryptanalyse les textes et renvoie le nombre de succès et la durée.
+    Args:
+        textes (list): Les couples (texte chiffré, texte clair)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): La sélection des longueurs (voir cryptanalyse_v3_clef())
+    Returns:
+        (int, float): Le nombre de textes déchiffrés et la durée en secondes
+    """
+    succes = 0
+    debut = time.perf_counter()
+    for cipher, plain in textes:
+        score, key = cryptanalyse_v3_clef(cipher, None, max_key_length, selection)
+        if key is not None and dechiffre_vigenere(cipher, key) == plain:
+            succes += 1
+    return succes, time.perf_counter() - debut
+
+
+def usage():
+    print("Usage: python3 benchmarks/bench_longueurs.py [-l <bornes,...>] [-m <borne max de la recherche complete>]"
+          " [-n <nombre de textes>]", file=sys.stderr)
+    sys.exit(1)
+
+
+def main(argv):
+    bornes = MAX_KEY_LENGTHS
+    max_complet = MAX_COMPLET
+    nb_textes = 100
+    try:
+        opts, args = getopt.getopt(argv, "hl:m:n:")
+    except getopt.GetoptError:
+        usage()
+    for opt, arg in opts:
+        if opt == '-h':
+            usage()
+        elif opt == '-l':
+            bornes = [int(b) for b in arg.split(",")]
+        elif opt == '-m':
+            max_complet = int(arg)
+        elif opt == '-n':
+            nb_textes = int(arg)
+
+    textes = [(read("data/text" + str(i) + ".cipher"), read("data/text" + str(i) + ".plain"))
+              for i in range(1, nb_textes + 1)]
+    print("%8s %10s %8s %12s" % ("borne", "selection", "succes", "duree (s)"))
+    for borne in bornes:
+        for selection in SELECTIONS:
+            if selection is None and borne > max_complet:
+                continue
+            succes, duree = mesure(textes, borne, selection)
+            print("%8d %10s %8d %12.2f" % (borne, selection or "toutes", succes, duree))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,206 @@
+import sys, os, getopt, json, platform, random, time, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cryptanalyse_vigenere import (alphabet, read, chiffre_vigenere, freq, longueur_clef,
+                                   tableau_decalages_ICM, clef_correlations,
+                                   cryptanalyse_v1, cryptanalyse_v2, cryptanalyse_v3)
+
+# Tailles de textes et longueurs de clé mesurées par défaut
+TAILLES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+LONGUEURS_CLEF = [1, 10, 100]
+
+# Fonctions mesurées : chacune reçoit le texte chiffré et la clé
+FONCTIONS = {
+    "chiffre_vigenere": lambda cipher, key: chiffre_vigenere(cipher, key),
+    "freq": lambda cipher, key: freq(cipher),
+    "longueur_clef": lambda cipher, key: longueur_clef(cipher),
+    "tableau_decalages_ICM": lambda cipher, key: tableau_decalages_ICM(cipher, len(key)),
+    "clef_correlations": lambda cipher, key: clef_correlations(cipher, len(key)),
+    "cryptanalyse_v1": lambda cipher, key: cryptanalyse_v1(cipher),
+    "cryptanalyse_v2": lambda cipher, key: cryptanalyse_v2(cipher),
+    "cryptanalyse_v3": lambda cipher, key: cryptanalyse_v3(cipher),
+}
+
+# Une mesure est répétée jusqu'à cumuler cette durée (en secondes),
+# sans dépasser MAX_REPETITIONS : la durée retenue est la plus courte
+DUREE_MIN = 0.2
+MAX_REPETITIONS = 5
+
+# Seuil par défaut du mode comparaison : 25 % de temps ou de mémoire en plus
+SEUIL = 0.25
+
+# En dessous de ces valeurs de référence, les écarts ne sont que du bruit de mesure
+PLANCHERS = {"duree": 10 ** -3, "memoire_max": 1024}
+
+VERSION_RESULTATS = 1
+
+
+def texte_francais(taille):
+    """
+    Renvoie un texte clair de la taille demandée, en répétant le corpus data/.
+    """
+    corpus = "".join(read("data/text" + str(i) + ".plain") for i in range(1, 101))
+    return (corpus * (taille // len(corpus) + 1))[:taille]
+
+
+def mesure(fonction, cipher, key):
+    """
+    Mesure la durée et la mémoire maximale d'un appel de fonction(cipher, key).
+    La mémoire est mesurée par un appel à part sous tracemalloc, pour ne pas
+    fausser la durée.
+    Args:
+        fonction (function): La fonction mesurée
+        cipher (str): Le texte chiffré
+        key (list): La clé du texte
+    Returns:
+        (float, int, int): La durée la plus courte en secondes, la mémoire
+        maximale allouée en octets et le nombre de répétitions
+    """
+    durees = []
+    while len(durees) < MAX_REPETITIONS and sum(durees) < DUREE_MIN:
+        debut = time.perf_counter()
+        fonction(cipher, key)
+        durees.append(time.perf_counter() - debut)
+
+    tracemalloc.start()
+    try:
+        fonction(cipher, key)
+        memoire = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(durees), memoire, len(durees)
+
+
+def lance(fonctions, tailles, longueurs):
+    """
+    Mesure chaque fonction pour chaque taille de texte et longueur de clé.
+    Args:
+        fonctions (list): Les noms des fonctions (clés de FONCTIONS)
+        tailles (list): Les tailles de textes, en caractères
+        longueurs (list): Les longueurs de clé
+    Returns:
+        dict: Les résultats, au format écrit par ecrit_resultats()
+    """
+    rng = random.Random(1)
+    clair = texte_francais(max(tailles))
+    resultats = []
+    print("%22s %10s %6s %12s %12s %12s" % ("fonction", "taille", "clef", "duree (s)", "debit (Mo/s)", "memoire (Ko)"))
+    for taille in tailles:
+        for key_length in longueurs:
+            key = [rng.randrange(len(alphabet)) for _ in range(key_length)]
+            cipher = chiffre_vigenere(clair[:taille], key)
+            for nom in fonctions:
+                resultat = {"fonction": nom, "taille": taille, "longueur_clef": key_length}
+                try:
+                    duree, memoire, repetitions = mesure(FONCTIONS[nom], cipher, key)
+                except (IndexError, ValueError) as e:
+                    # Par exemple, la V1 ne trouve aucune clé dans un texte trop court
+                    resultat["erreur"] = str(e)
+                    resultats.append(resultat)
+                    print("%22s %10d %6d %s" % (nom, taille, key_length, e))
+                    continue
+                debit = taille / duree / 10 ** 6 if duree > 0 else None
+                resultat.update({"duree": duree, "debit": debit, "memoire_max": memoire,
+                                 "repetitions": repetitions})
+                resultats.append(resultat)
+                print("%22s %10d %6d %12.4f %12.2f %12d" % (nom, taille, key_length, duree, debit or 0, memoire // 1024))
+    return {"version": VERSION_RESULTATS,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "resultats": resultats}
+
+
+def ecrit_resultats(resultats, fichier):
+    with open(fichier, "w") as f:
+        json.dump(resultats, f, indent=1)
+        f.write("\n")
+
+
+def lit_resultats(fichier):
+    with open(fichier) as f:
+        resultats = json.load(f)
+    if resultats.get("version") != VERSION_RESULTATS:
+        raise ValueError(fichier + " : version de résultats inconnue")
+    return resultats
+
+
+def compare(reference, nouveau, seuil=SEUIL):
+    """
+    Compare deux séries de résultats mesure par mesure.
+    Args:
+        reference (dict): Les résultats de référence
+        nouveau (dict): Les résultats à comparer
+        seuil (float): L'augmentation relative tolérée de la durée et de la mémoire
+    Returns:
+        list: Les régressions, sous forme de tuples (fonction, taille,
+        longueur de clé, grandeur, valeur de référence, nouvelle valeur)
+    """
+    index = {(r["fonction"], r["taille"], r["longueur_clef"]): r for r in reference["resultats"]}
+    regressions = []
+    for r in nouveau["resultats"]:
+        ref = index.get((r["fonction"], r["taille"], r["longueur_clef"]))
+        if ref is None or "erreur" in ref or "erreur" in r:
+            continue
+        for grandeur in ["duree", "memoire_max"]:
+            if ref[grandeur] > PLANCHERS[grandeur] and r[grandeur] > ref[grandeur] * (1 + seuil):
+                regressions.append((r["fonction"], r["taille"], r["longueur_clef"],
+                                    grandeur, ref[grandeur], r[grandeur]))
+    return regressions
+
+
+def usage():
+    print("Usage: python3 benchmarks/bench_suite.py [-f <fonctions,...>] [-t <tailles,...>] [-k <longueurs,...>]"
+          " [-o <resultats.json>]\n"
+          "       python3 benchmarks/bench_suite.py -r <reference.json> [-s <seuil>] <nouveau.json>",
+          file=sys.stderr)
+    sys.exit(1)
+
+
+def main(argv):
+    fonctions = list(FONCTIONS)
+    tailles = TAILLES
+    longueurs = LONGUEURS_CLEF
+    sortie = None
+    reference = None
+    seuil = SEUIL
+    try:
+        opts, args = getopt.getopt(argv, "hf:t:k:o:r:s:")
+    except getopt.GetoptError:
+        usage()
+    for opt, arg in opts:
+        if opt == '-h':
+            usage()
+        elif opt == '-f':
+            fonctions = arg.split(",")
+            if any(nom not in FONCTIONS for nom in fonctions):
+                usage()
+        elif opt == '-t':
+            tailles = [int(t) for t in arg.split(",")]
+        elif opt == '-k':
+            longueurs = [int(k) for k in arg.split(",")]
+        elif opt == '-o':
+            sortie = arg
+        elif opt == '-r':
+            reference = arg
+        elif opt == '-s':
+            seuil = float(arg)
+
+    if reference is not None:
+        if len(args) != 1:
+            usage()
+        regressions = compare(lit_resultats(reference), lit_resultats(args[0]), seuil)
+        for nom, taille, key_length, grandeur, avant, apres in regressions:
+            print("REGRESSION %s taille=%d clef=%d %s : %.6g -> %.6g (%+.0f %%)"
+                  % (nom, taille, key_length, grandeur, avant, apres, 100 * (apres / avant - 1)))
+        print(str(len(regressions)) + " regression(s)")
+        sys.exit(1 if regressions else 0)
+
+    resultats = lance(fonctions, tailles, longueurs)
+    if sortie is not None:
+        ecrit_resultats(resultats, sortie)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
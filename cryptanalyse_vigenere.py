@@ -1,10 +1,16 @@
-import sys, getopt, string, math
+import sys, os, getopt, string, math, operator, time, struct, mmap, unicodedata, json, hashlib, re, heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from collections import Counter, OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import accumulate
 
 # Alphabet français/anglais
 alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
 # Fréquence moyenne des lettres en français
-# À modifier
+# À modifier : entraine_langue.py recalcule une table sur un corpus (voir compte_corpus())
 freq_FR = [0.09213414037491088, 0.010354463742221126, 0.030178915678726964,
            0.03753683726285317, 0.17174710607479665, 0.010939030914707838,
            0.01061497737343803, 0.010717912027723734, 0.07507240372750529,
@@ -45,79 +51,459 @@ freq_EN = [
 ]
 
 
+# Tables de traduction pour le moteur par octets.
+# _TABLES_DECALAGE[d] remplace chaque lettre (en ASCII) par la lettre
+# située d positions plus loin dans l'alphabet, ce qui permet de
+# décaler un texte entier en un seul appel à bytes.translate().
+_LETTRES = alphabet.encode("ascii")
+_TABLES_DECALAGE = [bytes.maketrans(_LETTRES, _LETTRES[d:] + _LETTRES[:d])
+                    for d in range(len(alphabet))]
+
+
+def _verifie_octets(buf):
+    """
+    Vérifie que des octets ASCII ne contiennent que des lettres de l'alphabet.
+    Args:
+        buf (bytes): Les octets à vérifier
+    Raises:
+        ValueError: si un octet n'est pas une lettre de l'alphabet
+    """
+    if buf.translate(None, _LETTRES):
+        raise ValueError("Le texte contient des caractères hors de l'alphabet")
+
+
+def _vers_octets(txt):
+    """
+    Convertit un texte en octets ASCII en verifiant qu'il ne contient
+    que des lettres de l'alphabet.
+    Args:
+        txt (str): Le texte à convertir
+    Returns:
+        bytes: Le texte en octets ASCII
+    Raises:
+        ValueError: si le texte contient un caractère hors de l'alphabet
+    """
+    try:
+        buf = txt.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("Le texte contient des caractères hors de l'alphabet")
+    _verifie_octets(buf)
+    return buf
+
+
+def _decale_octets(buf, key, signe, phase=0, tables=_TABLES_DECALAGE):
+    """
+    Applique une clé de Vigenère à des octets, colonne par colonne.
+    Chaque colonne buf[i::k] est décalée en un seul appel à translate()
+    puis réinsérée à sa place, sans boucle par caractère.
+    Args:
+        buf (bytes): Les lettres en octets ASCII
+        key (list): La liste des décalages
+        signe (int): 1 pour chiffrer, -1 pour déchiffrer
+        phase (int): La position dans la clé du premier octet
+        tables (list): Les tables de traduction de chaque décalage (par défaut, celles de alphabet)
+    Returns:
+        bytes: Les octets décalés
+    """
+    if not buf:
+        return b""
+    key_length = len(key)
+    if key_length == 0:
+        raise ValueError("La clé est vide")
+    if key_length == 1:
+        return buf.translate(tables[(signe * key[0]) % len(tables)])
+
+    out = bytearray(len(buf))
+    for i in range(min(key_length, len(buf))):
+        decalage = signe * key[(phase + i) % key_length]
+        out[i::key_length] = buf[i::key_length].translate(tables[decalage % len(tables)])
+    return bytes(out)
+
+
+def _decale_vigenere(txt, key, signe):
+    """
+    Applique une clé de Vigenère à un texte (voir _decale_octets()).
+    Args:
+        txt (str): Le texte
+        key (list): La liste des décalages
+        signe (int): 1 pour chiffrer, -1 pour déchiffrer
+    Returns:
+        str: Le texte décalé
+    """
+    return _decale_octets(_vers_octets(txt), key, signe).decode("ascii")
+
+
+class Alphabet:
+    """
+    Alphabet de chiffrement configurable (lettres accentuées, chiffres...).
+    Les tables de traduction de chaque décalage et la table des indices des
+    lettres sont calculées une seule fois : chiffrer ne fait aucune recherche
+    linéaire dans l'alphabet. Un alphabet en ASCII utilise le moteur par
+    octets (voir _decale_octets()), les autres str.translate() colonne par colonne.
+    En mode conserve, le texte est d'abord ramené à l'alphabet (voir
+    normalise()) : les minuscules et les lettres accentuées absentes de
+    l'alphabet sont chiffrées comme leur majuscule sans accent, et seuls les
+    autres caractères (espaces, ponctuation, chiffres, fins de ligne...) sont
+    recopiés tels quels, sans avancer la clé. Aucune lettre ne reste en clair.
+    Attributs:
+        lettres (str): Les lettres de l'alphabet, dans l'ordre
+        indices (dict): L'indice de chaque lettre dans l'alphabet
+    """
+
+    def __init__(self, lettres):
+        if len(set(lettres)) != len(lettres) or not lettres:
+            raise ValueError("Les lettres d'un alphabet doivent être distinctes")
+        self.lettres = lettres
+        self.indices = {c: i for i, c in enumerate(lettres)}
+        self._ascii = lettres.isascii()
+        if self._ascii:
+            octets = lettres.encode("ascii")
+            self._tables = [bytes.maketrans(octets, octets[d:] + octets[:d]) for d in range(len(lettres))]
+        else:
+            self._tables = [str.maketrans(lettres, lettres[d:] + lettres[:d]) for d in range(len(lettres))]
+        self._suppression = str.maketrans("", "", lettres)
+        self._hors_alphabet = re.compile("([^" + re.escape(lettres) + "]+)")
+        self._normalisations = {}
+
+    def __len__(self):
+        return len(self.lettres)
+
+    def indice(self, lettre):
+        """
+        Renvoie l'indice d'une lettre dans l'alphabet.
+        Raises:
+            ValueError: si la lettre n'est pas dans l'alphabet
+        """
+        try:
+            return self.indices[lettre]
+        except KeyError:
+            raise ValueError(repr(lettre) + " n'est pas dans l'alphabet")
+
+    def normalise(self, txt):
+        """
+        Ramène les lettres d'un texte à l'alphabet : une lettre hors de
+        l'alphabet est remplacée par sa majuscule si elle y est, sinon par sa
+        majuscule sans accent (É devient E, Œ devient OE). Les caractères qui
+        ne sont pas des lettres sont laissés tels quels.
+        Args:
+            txt (str): Le texte
+        Returns:
+            str: Le texte normalisé
+        Raises:
+            ValueError: si une lettre ne peut pas être ramenée à l'alphabet
+        """
+        remplacements = {}
+        for c in set(txt).difference(self.indices):
+            if c not in self._normalisations:
+                self._normalisations[c] = self._normalise_caractere(c)
+            if self._normalisations[c] != c:
+                remplacements[c] = self._normalisations[c]
+        return txt.translate(str.maketrans(remplacements)) if remplacements else txt
+
+    def _normalise_caractere(self, c):
+        majuscule = c.upper()
+        if all(x in self.indices for x in majuscule):
+            return majuscule
+        sans_accent = "".join(x for x in unicodedata.normalize("NFD", majuscule.translate(_LIGATURES))
+                              if not unicodedata.combining(x))
+        if sans_accent and all(x in self.indices for x in sans_accent):
+            return sans_accent
+        if c.isalpha():
+            raise ValueError("La lettre " + repr(c) + " ne peut pas être ramenée à l'alphabet")
+        return c
+
+    def lettres_de(self, txt):
+        """
+        Renvoie les seules lettres d'un texte, ramenées à l'alphabet (voir
+        normalise()), sans les autres caractères : ce sont les lettres que le
+        mode conserve chiffre.
+        """
+        return "".join(self._hors_alphabet.split(self.normalise(txt))[0::2])
+
+    def decale(self, txt, key, signe, conserve=False):
+        """
+        Applique une clé de Vigenère à un texte.
+        Args:
+            txt (str): Le texte
+            key (list): La liste des décalages
+            signe (int): 1 pour chiffrer, -1 pour déchiffrer
+            conserve (bool): True pour ramener les lettres à l'alphabet et recopier
+            les autres caractères (voir normalise())
+        Returns:
+            str: Le texte décalé
+        Raises:
+            ValueError: si conserve est False et que le texte contient un caractère hors de
+            l'alphabet, ou si une lettre ne peut pas être ramenée à l'alphabet
+        """
+        if not conserve:
+            if txt.translate(self._suppression):
+                raise ValueError("Le texte contient des caractères hors de l'alphabet")
+            return self._decale_lettres(txt, key, signe)
+
+        # Le texte alterne suites de lettres et suites d'autres caractères :
+        # les lettres sont décalées d'un seul tenant, puis remises à leur place
+        morceaux = self._hors_alphabet.split(self.normalise(txt))
+        decalees = self._decale_lettres("".join(morceaux[0::2]), key, signe)
+        position = 0
+        for i in range(0, len(morceaux), 2):
+            taille = len(morceaux[i])
+            morceaux[i] = decalees[position:position + taille]
+            position += taille
+        return "".join(morceaux)
+
+    def _decale_lettres(self, txt, key, signe):
+        if self._ascii:
+            return _decale_octets(txt.encode("ascii"), key, signe, 0, self._tables).decode("ascii")
+        if not txt:
+            return ""
+        key_length = len(key)
+        if key_length == 0:
+            raise ValueError("La clé est vide")
+        out = [""] * len(txt)
+        for i in range(min(key_length, len(txt))):
+            out[i::key_length] = txt[i::key_length].translate(self._tables[(signe * key[i]) % len(self.lettres)])
+        return "".join(out)
+
+    def chiffre(self, txt, key, conserve=False):
+        return self.decale(txt, key, 1, conserve)
+
+    def dechiffre(self, txt, key, conserve=False):
+        return self.decale(txt, key, -1, conserve)
+
+
+# Alphabets prédéfinis
+ALPHABET_LATIN = Alphabet(alphabet)
+ALPHABET_FRANCAIS = Alphabet(alphabet + "ÀÂÆÇÈÉÊËÎÏÔŒÙÛÜŸ")
+ALPHABET_ALPHANUMERIQUE = Alphabet(alphabet + "0123456789")
+
+
+def _decale_alphabet(txt, key, signe, alpha, conserve):
+    """
+    Applique une clé de Vigenère avec le moteur A-Z par défaut, ou avec un
+    alphabet et le mode conserve (voir Alphabet.decale()).
+    """
+    if alpha is None and not conserve:
+        return _decale_vigenere(txt, key, signe)
+    return (alpha or ALPHABET_LATIN).decale(txt, key, signe, conserve)
+
+
 # Chiffrement César
-def chiffre_cesar(txt, key):
+def chiffre_cesar(txt, key, alpha=None, conserve=False):
     """
     Chiffre un texte avec le chiffrement César
     Args:
         txt (str): Le texte à chiffrer
         key (int): La clé de chiffrement
+        alpha (Alphabet): L'alphabet (par défaut, les 26 lettres de alphabet)
+        conserve (bool): True pour recopier tels quels les caractères hors de
+        l'alphabet, sans avancer la clé
     Returns:
         str: Le texte chiffré
     """
-    encrypted = ""
-    for c in txt:
-        encrypted += alphabet[(alphabet.index(c) + key) % len(alphabet)]
-    return encrypted
+    return _decale_alphabet(txt, [key], 1, alpha, conserve)
 
 
 # Déchiffrement César
-def dechiffre_cesar(txt, key):
+def dechiffre_cesar(txt, key, alpha=None, conserve=False):
     """
     Déchiffre un texte avec le chiffrement César
     Args:
         txt (str): Le texte à déchiffrer
         key (int): La clé de chiffrement
+        alpha (Alphabet): L'alphabet (par défaut, les 26 lettres de alphabet)
+        conserve (bool): True pour recopier tels quels les caractères hors de
+        l'alphabet, sans avancer la clé
     Returns:
         str: Le texte déchiffré
     """
-    decrypted = ""
-    for c in txt:
-        decrypted += alphabet[(alphabet.index(c) - key) % len(alphabet)]
-    return decrypted
+    return _decale_alphabet(txt, [key], -1, alpha, conserve)
 
 
 # Chiffrement Vigenere
-def chiffre_vigenere(txt, key):
+def chiffre_vigenere(txt, key, alpha=None, conserve=False):
     """
     Chiffre un texte avec le chiffrement Vigenere
     Args:
         txt (str): Le texte à chiffrer
-        key (str): La clé de chiffrement
+        key (list): La clé de chiffrement (liste de décalages)
+        alpha (Alphabet): L'alphabet (par défaut, les 26 lettres de alphabet)
+        conserve (bool): True pour recopier tels quels les caractères hors de
+        l'alphabet, sans avancer la clé
     Returns:
         str: Le texte chiffré
     """
-    encrypted = ""
-
-    def encryptChar(char, decalage):
-        return alphabet[(alphabet.index(char) + decalage) % len(alphabet)]
-
-    for position, ch in enumerate(txt):
-        encrypted += encryptChar(ch, key[position % len(key)])
-
-    return encrypted
+    return _decale_alphabet(txt, key, 1, alpha, conserve)
 
 
 # Déchiffrement Vigenere
-def dechiffre_vigenere(txt, key):
+def dechiffre_vigenere(txt, key, alpha=None, conserve=False):
     """
     Déchiffre un texte avec le chiffrement Vigenere
     Args:
         txt (str): Le texte à déchiffrer
         key (list): La clé de chiffrement
+        alpha (Alphabet): L'alphabet (par défaut, les 26 lettres de alphabet)
+        conserve (bool): True pour recopier tels quels les caractères hors de
+        l'alphabet, sans avancer la clé
     Returns:
         str: Le texte déchiffré
     """
+    return _decale_alphabet(txt, key, -1, alpha, conserve)
+
+
+# Chiffrement de nombreux messages, chacun avec sa clé.
+# Tous les messages sont mis bout à bout dans un seul tampon, leurs clés
+# répétées dans un second tampon de même longueur, puis les deux tampons
+# sont additionnés d'un coup comme deux grands entiers : chaque octet est
+# un indice de 0 à 25, donc la somme de deux octets tient dans un octet et
+# les octets ne se mélangent pas. Une table de traduction ramène ensuite
+# chaque somme, de 0 à 50, à la lettre de la table de Vigénère.
+_VERS_INDICES = bytes.maketrans(_LETTRES, bytes(range(len(alphabet))))
+_SOMMES_VERS_LETTRES = bytes(_LETTRES[s % len(alphabet)] for s in range(256))
+# Décalages d'une clé en octets (0 à 255) vers leurs indices pour chiffrer (1) et déchiffrer (-1)
+_DECALAGES_LOT = {signe: bytes((signe * d) % len(alphabet) for d in range(256)) for signe in (1, -1)}
+
+
+def _decale_lot(messages, keys, signe):
+    """
+    Applique à chaque message sa clé de Vigenère (voir chiffre_vigenere_lot()).
+    Args:
+        messages (list): Les messages
+        keys (list): La clé de chaque message
+        signe (int): 1 pour chiffrer, -1 pour déchiffrer
+    Returns:
+        list: Les messages décalés, dans le même ordre
+    """
+    if len(messages) != len(keys):
+        raise ValueError("Il faut une clé par message")
+    codes = _vers_octets("".join(messages)).translate(_VERS_INDICES)
+    table = _DECALAGES_LOT[signe]
+    flux = []
+    for message, key in zip(messages, keys):
+        if not key:
+            raise ValueError("La clé est vide")
+        try:
+            motif = bytes(key).translate(table)
+        except ValueError:
+            # Décalages négatifs ou supérieurs à 255
+            motif = bytes([(signe * d) % len(alphabet) for d in key])
+        flux.append((motif * (len(message) // len(motif) + 1))[:len(message)])
+    sommes = int.from_bytes(codes, "big") + int.from_bytes(b"".join(flux), "big")
+    texte = sommes.to_bytes(len(codes), "big").translate(_SOMMES_VERS_LETTRES).decode("ascii")
+    fins = list(accumulate(map(len, messages)))
+    return [texte[fin - len(message):fin] for message, fin in zip(messages, fins)]
+
+
+def chiffre_vigenere_lot(messages, keys):
+    """
+    Chiffre de nombreux messages, chacun avec sa propre clé, en un seul
+    passage sur un tampon qui les contient tous : beaucoup plus rapide qu'un
+    appel à chiffre_vigenere() par message quand les messages sont courts.
+    Args:
+        messages (list): Les textes à chiffrer
+        keys (list): La clé de chaque texte (liste de décalages)
+    Returns:
+        list: Les textes chiffrés, dans l'ordre des messages
+    Raises:
+        ValueError: si un texte contient un caractère hors de l'alphabet, si une clé
+        est vide ou s'il n'y a pas autant de clés que de messages
+    """
+    return _decale_lot(messages, keys, 1)
+
+
+def dechiffre_vigenere_lot(messages, keys):
+    """
+    Déchiffre de nombreux messages, chacun avec sa propre clé (voir chiffre_vigenere_lot()).
+    Args:
+        messages (list): Les textes à déchiffrer
+        keys (list): La clé de chaque texte (liste de décalages)
+    Returns:
+        list: Les textes déchiffrés, dans l'ordre des messages
+    """
+    return _decale_lot(messages, keys, -1)
+
+
+# Taille des blocs lus par le chiffrement de fichiers (1 Mo)
+TAILLE_BLOC = 1 << 20
+
+
+def _decale_flux(entree, sortie, key, signe, taille_bloc=TAILLE_BLOC):
+    """
+    Applique une clé de Vigenère à un flux d'octets, bloc par bloc.
+    La position dans la clé est reportée d'un bloc au suivant, de sorte
+    que le résultat est le même que pour le texte entier, et la mémoire
+    utilisée ne dépend que de taille_bloc. Les fins de ligne sont ignorées.
+    Args:
+        entree: Le fichier à lire, ouvert en binaire
+        sortie: Le fichier à écrire, ouvert en binaire
+        key (list): La liste des décalages
+        signe (int): 1 pour chiffrer, -1 pour déchiffrer
+        taille_bloc (int): Le nombre d'octets lus à la fois
+    Returns:
+        int: Le nombre de lettres traitées
+    Raises:
+        ValueError: si le flux contient un caractère hors de l'alphabet
+    """
+    if len(key) == 0:
+        raise ValueError("La clé est vide")
+    traitees = 0
+    while True:
+        bloc = entree.read(taille_bloc)
+        if not bloc:
+            return traitees
+        bloc = bloc.translate(None, b"\r\n")
+        _verifie_octets(bloc)
+        sortie.write(_decale_octets(bloc, key, signe, traitees % len(key)))
+        traitees += len(bloc)
+
+
+# Chiffrement Vigenere d'un fichier
+def chiffre_vigenere_fichier(source, destination, key, taille_bloc=TAILLE_BLOC):
+    """
+    Chiffre un fichier avec le chiffrement Vigenere, par blocs de taille_bloc
+    octets, sans jamais charger le fichier entier en mémoire.
+    Args:
+        source (str): Le fichier à chiffrer
+        destination (str): Le fichier chiffré à écrire
+        key (list): La clé de chiffrement
+        taille_bloc (int): Le nombre d'octets lus à la fois
+    Returns:
+        int: Le nombre de lettres chiffrées
+    """
+    with open(source, "rb") as entree, open(destination, "wb") as sortie:
+        return _decale_flux(entree, sortie, key, 1, taille_bloc)
+
 
-    def decryptChar(char, decalage):
-        # print(char, decalage)
-        return alphabet[(alphabet.index(char) - decalage) % len(alphabet)]
+# Déchiffrement Vigenere d'un fichier
+def dechiffre_vigenere_fichier(source, destination, key, taille_bloc=TAILLE_BLOC):
+    """
+    Déchiffre un fichier avec le chiffrement Vigenere, par blocs de taille_bloc
+    octets, sans jamais charger le fichier entier en mémoire.
+    Args:
+        source (str): Le fichier à déchiffrer
+        destination (str): Le fichier déchiffré à écrire
+        key (list): La clé de chiffrement
+        taille_bloc (int): Le nombre d'octets lus à la fois
+    Returns:
+        int: Le nombre de lettres déchiffrées
+    """
+    with open(source, "rb") as entree, open(destination, "wb") as sortie:
+        return _decale_flux(entree, sortie, key, -1, taille_bloc)
 
-    decrypted = ""
-    for position, ch in enumerate(txt):
-        decrypted += decryptChar(ch, key[position % len(key)])
 
-    return decrypted
+# Convertit une clé donnée en ligne de commande
+def clef_depuis_texte(texte):
+    """
+    Convertit une clé écrite en lettres ("KJHAYWA", A = 0) ou en décalages
+    séparés par des virgules ("10,9,7,0,24,22,0") en liste de décalages.
+    Args:
+        texte (str): La clé
+    Returns:
+        list: La liste des décalages
+    """
+    if texte.isalpha():
+        return [ALPHABET_LATIN.indice(c) for c in texte.upper()]
+    return [int(d) for d in texte.split(",")]
 
 
 # Analyse de fréquences
@@ -129,10 +515,18 @@ def freq(txt):
     Returns:
         list: Une liste de fréquences des lettres arrangees par index de l'alphabet
     """
-    hist = [0.0] * len(alphabet)
-    for c in txt:
-        hist[alphabet.index(c)] += 1
-    return hist
+    return _histogramme(_vers_octets(txt))
+
+
+def _histogramme(codes):
+    """
+    Compte chaque lettre d'octets ASCII, en un appel à bytes.count() par lettre.
+    Args:
+        codes (bytes): Les lettres en octets ASCII
+    Returns:
+        list: L'histogramme, dans le format de freq()
+    """
+    return [float(codes.count(lettre)) for lettre in _LETTRES]
 
 
 # Renvoie l'indice dans l'alphabet
@@ -177,10 +571,8 @@ def columnsExtractor(cipher, key_length):
     Returns:
         list: Une liste de colonnes de longueur key_length
     """
-    columns = [""] * key_length
-    for index, char in enumerate(cipher):
-        columns[index % key_length] += char
-    return columns
+    # La colonne i est la tranche cipher[i::key_length] : une seule copie par colonne
+    return [cipher[i::key_length] for i in range(key_length)]
 
 
 def constructTextFromColumns(columns):
@@ -192,30 +584,421 @@ def constructTextFromColumns(columns):
         str: Le texte construit
     """
     key_length = len(columns)
-    text = ""
     cipher_length = sum([len(col) for col in columns])
-    for i in range(cipher_length):
-        index = i % key_length
-        text += columns[index][i // key_length]
-    return text
+    # Entrelacement : chaque colonne est copiée d'un coup dans la tranche
+    # [i::key_length] du texte, en octets si le texte est en ASCII
+    try:
+        text = bytearray(cipher_length)
+        for i, col in enumerate(columns):
+            text[i::key_length] = col.encode("ascii")
+        return text.decode("ascii")
+    except UnicodeEncodeError:
+        text = [""] * cipher_length
+        for i, col in enumerate(columns):
+            text[i::key_length] = col
+        return "".join(text)
+
+
+class Mesures:
+    """
+    Instrumentation facultative d'une cryptanalyse : la durée cumulée et le
+    nombre d'appels de chaque étape, et des compteurs (caractères lus,
+    histogrammes construits, correlations calculées, longueurs évaluées...).
+    Les fonctions de cryptanalyse prennent un argument mesures ; sans lui,
+    elles utilisent SANS_MESURES, dont les méthodes ne font rien, et les
+    étapes ne coûtent qu'un appel de méthode chacune.
+    Attributs:
+        etapes (dict): Pour chaque étape, sa durée cumulée en secondes et son nombre d'appels
+        compteurs (dict): La valeur de chaque compteur
+    """
+
+    def __init__(self):
+        self.etapes = {}
+        self.compteurs = {}
+
+    @contextmanager
+    def etape(self, nom):
+        """
+        Mesure la durée d'un bloc with et l'ajoute à l'étape nom.
+        """
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            etape = self.etapes.setdefault(nom, {"duree": 0.0, "appels": 0})
+            etape["duree"] += time.perf_counter() - debut
+            etape["appels"] += 1
+
+    def compte(self, nom, n=1):
+        """
+        Ajoute n au compteur nom.
+        """
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + n
+
+    def en_dict(self):
+        return {"etapes": self.etapes, "compteurs": self.compteurs}
+
+    def ecrire(self, fichier):
+        """
+        Ecrit les mesures dans un fichier JSON.
+        Args:
+            fichier (str): Le fichier à écrire
+        """
+        with open(fichier, "w") as f:
+            json.dump(self.en_dict(), f, indent=1)
+            f.write("\n")
+
+
+class _MesuresInactives(Mesures):
+    """
+    Mesures qui ne mesurent rien, utilisées quand l'instrumentation est désactivée.
+    """
+
+    def etape(self, nom):
+        return _ETAPE_INACTIVE
+
+    def compte(self, nom, n=1):
+        pass
+
+
+_ETAPE_INACTIVE = nullcontext()
+SANS_MESURES = _MesuresInactives()
+
+
+class AnalyseInterrompue(Exception):
+    """
+    Levée par une fonction de progression (voir cryptanalyse_v3_clef()) pour
+    arrêter une cryptanalyse entre deux longueurs de clé.
+    """
+
+
+# Nombre minimal de lettres par colonne d'une période commune à plusieurs
+# longueurs de clé : en deçà, le coût des appels à bytes.count() domine
+_LETTRES_PAR_COLONNE = 1024
+
+
+def _regroupe_longueurs(longueurs, periode_max):
+    """
+    Regroupe des longueurs de clé pour les compter en un seul passage : les
+    colonnes de toute longueur k qui divise une période p sont des réunions de
+    colonnes de p (la colonne i de k réunit les colonnes i, i + k, ... de p).
+    Chaque groupe part de la plus grande longueur restante et lui ajoute les
+    suivantes tant que leur plus petit multiple commun reste sous periode_max.
+    Args:
+        longueurs (list): Les longueurs de clé à compter, par ordre décroissant
+        periode_max (int): La plus grande période acceptée
+    Returns:
+        list: Les tuples (période, longueurs qui la divisent par ordre décroissant)
+    """
+    groupes = []
+    restantes = list(longueurs)
+    while restantes:
+        periode = restantes[0]
+        for key_length in restantes[1:]:
+            commune = periode * key_length // math.gcd(periode, key_length)
+            if commune <= periode_max:
+                periode = commune
+        groupes.append((periode, [key_length for key_length in restantes if periode % key_length == 0]))
+        restantes = [key_length for key_length in restantes if periode % key_length]
+    return groupes
+
+
+class AnalyseChiffre:
+    """
+    Histogrammes des colonnes d'un texte chiffré pour toutes les longueurs
+    de clé de 1 à max_key_length, construits une seule fois par texte et
+    partagés par toutes les versions de la cryptanalyse.
+    Le texte est converti une seule fois en un tampon d'octets contigu ;
+    chaque colonne est la tranche codes[i::k] de ce tampon, dont les lettres
+    sont comptées en C par bytes.count(). Seules les longueurs
+    k > max_key_length // 2 sont comptées sur le texte ; pour les autres,
+    la colonne i est la réunion des colonnes i et i + k de la longueur 2k,
+    donc son histogramme est la somme de ces deux histogrammes.
+    Chaque passage sur le texte coûte autant qu'un appel à freq(). Sur un long
+    texte, plusieurs longueurs sont comptées en un seul passage, sur une période
+    multiple commune (voir _regroupe_longueurs()) : 6 passages au lieu de 13 pour
+    max_key_length = 26 sur un million de lettres. Un seul passage pour toutes
+    les longueurs demanderait une période multiple de 14, 15, ..., 26, bien plus
+    longue que le texte.
+    Attributs:
+        cipher (str): Le texte chiffré
+        codes (bytes): Le texte chiffré en octets ASCII
+        max_key_length (int): La plus grande longueur de clé pré-calculée
+        mesures (Mesures): L'instrumentation de la cryptanalyse qui utilise ces histogrammes
+    La fonction progression, si elle est donnée, est appelée avec "histogrammes",
+    le nombre de longueurs comptées sur le texte et le nombre total de longueurs
+    à compter (voir cryptanalyse_v3_clef()).
+    """
+
+    def __init__(self, cipher, max_key_length=26, mesures=None, progression=None):
+        self.cipher = cipher
+        self.codes = _vers_octets(cipher)
+        self.max_key_length = max_key_length
+        self.mesures = SANS_MESURES if mesures is None else mesures
+        self._histogrammes = {}
+        a_compter = list(range(max_key_length, max_key_length // 2, -1))
+        with self.mesures.etape("histogrammes"):
+            faites = 0
+            for periode, longueurs in _regroupe_longueurs(a_compter, len(self.codes) // _LETTRES_PAR_COLONNE):
+                if progression is not None:
+                    progression("histogrammes", faites, len(a_compter))
+                if longueurs == [periode]:
+                    self._histogrammes[periode] = self._compte(periode)
+                else:
+                    colonnes = [_histogramme(self.codes[i::periode]) for i in range(periode)]
+                    self.mesures.compte("caracteres_lus", len(self.codes))
+                    for key_length in longueurs:
+                        self._histogrammes[key_length] = [[sum(comptes) for comptes in zip(*colonnes[i::key_length])]
+                                                          for i in range(key_length)]
+                        self.mesures.compte("histogrammes", key_length)
+                faites += len(longueurs)
+            for key_length in range(max_key_length // 2, 0, -1):
+                double = self._histogrammes[2 * key_length]
+                self._histogrammes[key_length] = [
+                    [a + b for a, b in zip(double[i], double[i + key_length])]
+                    for i in range(key_length)]
+                self.mesures.compte("histogrammes", key_length)
+
+    def _compte(self, key_length):
+        """
+        Compte les lettres de chaque colonne pour une longueur de clé.
+        Args:
+            key_length (int): La longueur de la clé
+        Returns:
+            list: Les histogrammes des colonnes
+        """
+        hists = [_histogramme(self.codes[i::key_length]) for i in range(key_length)]
+        self.mesures.compte("caracteres_lus", len(self.codes))
+        self.mesures.compte("histogrammes", key_length)
+        return hists
+
+    def histogrammes(self, key_length):
+        """
+        Renvoie les histogrammes des colonnes du texte pour une longueur de clé,
+        dans le même format que freq(). Les longueurs au-delà de max_key_length
+        sont comptées à la demande puis gardées.
+        Les listes renvoyées sont partagées et ne doivent pas être modifiées.
+        Args:
+            key_length (int): La longueur de la clé
+        Returns:
+            list: La liste des key_length histogrammes
+        """
+        if key_length not in self._histogrammes:
+            with self.mesures.etape("histogrammes"):
+                self._histogrammes[key_length] = self._compte(key_length)
+        return self._histogrammes[key_length]
+
+    def coincidences(self, key_length):
+        """
+        Compte les paires de lettres égales dans une même colonne, et le nombre
+        total de paires, pour une longueur de clé. Au-delà de max_key_length,
+        les colonnes sont comptées sans garder leurs histogrammes, ce qui permet
+        de parcourir des centaines de longueurs sans occuper de mémoire.
+        Args:
+            key_length (int): La longueur de la clé
+        Returns:
+            (int, int): Le nombre de paires de lettres égales et le nombre de paires
+        """
+        if key_length in self._histogrammes:
+            comptes = [c for hist in self._histogrammes[key_length] for c in hist]
+        else:
+            comptes = [c for i in range(key_length) for c in _histogramme(self.codes[i::key_length])]
+            self.mesures.compte("caracteres_lus", len(self.codes))
+        egales = sum([int(c) * (int(c) - 1) for c in comptes]) // 2
+        taille, reste = divmod(len(self.codes), key_length)
+        paires = (reste * (taille + 1) * taille + (key_length - reste) * taille * (taille - 1)) // 2
+        return egales, paires
+
+
+class AnalyseIncrementale(AnalyseChiffre):
+    """
+    Histogrammes des colonnes d'un texte chiffré qui arrive par morceaux.
+    Chaque morceau ajouté par append() est compté seul, puis ses histogrammes
+    sont ajoutés à ceux des colonnes où il tombe : la colonne i du morceau est
+    la colonne (n + i) % k du texte, n étant le nombre de lettres déjà reçues.
+    Un morceau d'au plus 16 * max_key_length lettres est compté lettre par lettre
+    dans les seules colonnes qu'il touche, un plus long par AnalyseChiffre. Un ajout
+    coûte donc le comptage du morceau plus au plus une addition par colonne,
+    quelle que soit la longueur du texte déjà reçu, et clef() donne à tout
+    moment la clé de la V3 sans relire le texte. Les longueurs comptées à la
+    demande au-delà de max_key_length suivent aussi les ajouts.
+    Attributs:
+        codes (bytearray): Les lettres reçues, en octets ASCII
+        max_key_length (int): La plus grande longueur de clé suivie
+        mesures (Mesures): L'instrumentation des comptages
+    """
+
+    def __init__(self, max_key_length=26, mesures=None):
+        self.codes = bytearray()
+        self.max_key_length = max_key_length
+        self.mesures = SANS_MESURES if mesures is None else mesures
+        self._histogrammes = {key_length: [[0.0] * len(alphabet) for i in range(key_length)]
+                              for key_length in range(1, max_key_length + 1)}
+
+    @property
+    def cipher(self):
+        return self.codes.decode("ascii")
+
+    def append(self, fragment):
+        """
+        Ajoute un morceau de texte chiffré à la suite du texte déjà reçu.
+        Args:
+            fragment (str): Le morceau de texte chiffré
+        Raises:
+            ValueError: si le morceau contient un caractère hors de l'alphabet
+        """
+        codes = _vers_octets(fragment)
+        debut = len(self.codes)
+        if len(codes) <= 16 * self.max_key_length:
+            # Un morceau court est compté lettre par lettre, directement dans
+            # les colonnes où il tombe : O(len(fragment) * max_key_length), moins
+            # que les histogrammes de toutes les longueurs jusqu'à ce seuil
+            lettres = codes.translate(_VERS_CODES)
+            for key_length, hists in self._histogrammes.items():
+                copiees = {}
+                for i, lettre in enumerate(lettres):
+                    colonne = (debut + i) % key_length
+                    if colonne not in copiees:
+                        # Les listes déjà renvoyées par histogrammes() ne sont pas modifiées
+                        copiees[colonne] = hists[colonne] = hists[colonne][:]
+                    copiees[colonne][lettre] += 1
+            self.mesures.compte("caracteres_lus", len(codes))
+        else:
+            morceau = AnalyseChiffre(fragment, self.max_key_length, self.mesures)
+            for key_length, hists in self._histogrammes.items():
+                # Seules les min(len(fragment), key_length) colonnes touchées changent
+                for i, hist in enumerate(morceau.histogrammes(key_length)[:len(codes)]):
+                    colonne = (debut + i) % key_length
+                    hists[colonne] = [a + b for a, b in zip(hists[colonne], hist)]
+        self.codes += codes
+
+    def clef(self, freqs=None):
+        """
+        Renvoie la meilleure clé de la V3 pour le texte reçu jusqu'ici,
+        comme cryptanalyse_v3_clef(self.cipher, freqs, self.max_key_length),
+        à partir des seuls histogrammes.
+        Args:
+            freqs (list): Table de frequence ou code de la langue (français par défaut)
+        Returns:
+            (float, list): Un tuple du score et de la clé (None si aucune clé n'a un score positif)
+        """
+        return _meilleure_clef(self, range(1, min(self.max_key_length, len(self.codes)) + 1), freqs)
+
+
+class AnalyseMessages(AnalyseChiffre):
+    """
+    Histogrammes des colonnes de plusieurs messages chiffrés avec la même clé,
+    chacun depuis le début de la clé : la colonne i de chaque message est
+    chiffrée avec le même décalage, donc les histogrammes des colonnes i de tous
+    les messages s'additionnent. Des messages trop courts pour être cassés
+    seuls le sont ensemble, et chaque message ajouté rend les comptes plus sûrs.
+    Chaque message est compté une seule fois (voir AnalyseChiffre).
+    Attributs:
+        messages (list): Les messages en octets ASCII
+        max_key_length (int): La plus grande longueur de clé pré-calculée
+        mesures (Mesures): L'instrumentation de la cryptanalyse qui utilise ces histogrammes
+    """
+
+    def __init__(self, messages, max_key_length=26, mesures=None):
+        self.messages = []
+        self.max_key_length = max_key_length
+        self.mesures = SANS_MESURES if mesures is None else mesures
+        self._histogrammes = {key_length: [[0.0] * len(alphabet) for i in range(key_length)]
+                              for key_length in range(1, max_key_length + 1)}
+        for message in messages:
+            analyse = AnalyseChiffre(message, max_key_length, self.mesures)
+            for key_length in range(1, max_key_length + 1):
+                self._histogrammes[key_length] = [
+                    [a + b for a, b in zip(somme, hist)]
+                    for somme, hist in zip(self._histogrammes[key_length], analyse.histogrammes(key_length))]
+            self.messages.append(analyse.codes)
+
+    def _compte(self, key_length):
+        hists = [[0.0] * len(alphabet) for i in range(key_length)]
+        for codes in self.messages:
+            hists = [[a + b for a, b in zip(somme, _histogramme(codes[i::key_length]))]
+                     for i, somme in enumerate(hists)]
+            self.mesures.compte("caracteres_lus", len(codes))
+        self.mesures.compte("histogrammes", key_length)
+        return hists
+
+    def coincidences(self, key_length):
+        hists = self.histogrammes(key_length)
+        egales = sum([int(c) * (int(c) - 1) for hist in hists for c in hist]) // 2
+        paires = sum([int(sum(hist)) * (int(sum(hist)) - 1) for hist in hists]) // 2
+        return egales, paires
+
+
+def _meilleure_clef(analyse, longueurs, freqs):
+    """
+    Renvoie la meilleure clé par correlation (voir clef_correlations()) parmi
+    les longueurs données, et son score, à partir des seuls histogrammes.
+    """
+    max_score = 0.0
+    key = None
+    with analyse.mesures.etape("correlations"):
+        for key_length in longueurs:
+            entry = clef_correlations(None, key_length, freqs, analyse)
+            if entry[0] > max_score:
+                max_score = entry[0]
+                key = entry[1]
+    return max_score, key
+
+
+# Cryptanalyse de plusieurs messages chiffrés avec la même clé
+def cryptanalyse_messages_clef(messages, freqs=None, max_key_length=26, mesures=None):
+    """
+    Renvoie la clé commune à plusieurs messages, chacun chiffré depuis le début
+    de la clé, et son score : la V3 appliquée aux histogrammes de tous les
+    messages réunis (voir AnalyseMessages). Les longueurs évaluées vont de 1 à
+    max_key_length, sans dépasser la longueur du plus long message.
+    Args:
+        messages (list): Les messages chiffrés
+        freqs (list): Table de frequence ou code de la langue (français par défaut)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        (float, list): Un tuple du score et de la clé (None si aucune clé n'a un score positif)
+    """
+    analyse = AnalyseMessages(messages, min(max_key_length, 26), mesures)
+    longueur = max([len(codes) for codes in analyse.messages], default=0)
+    return _meilleure_clef(analyse, range(1, min(max_key_length, longueur) + 1), freqs)
+
+
+def cryptanalyse_messages(messages, freqs=None, max_key_length=26, mesures=None):
+    """
+    Renvoie les messages déchiffrés avec leur clé commune (voir cryptanalyse_messages_clef()).
+    Args:
+        messages (list): Les messages chiffrés
+        freqs (list): Table de frequence ou code de la langue (français par défaut)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        list: Les messages déchiffrés
+    """
+    key = cryptanalyse_messages_clef(messages, freqs, max_key_length, mesures)[1]
+    return [_dechiffre_clef(message, key, mesures) for message in messages]
 
 
 # Recherche la longueur de la clé
-def longueur_clef(cipher):
+def longueur_clef(cipher, analyse=None, max_key_length=20):
     """
     Cherche la longueur de la clé en essayant plusieurs longueurs de cles et
     calcualant la moyenne des indices de coïncidence des colonnes pour chaque
     longueur de clé.
     Args:
         cipher (str): Le texte
+        analyse (AnalyseChiffre): Les histogrammes du texte, s'ils sont déjà calculés
+        max_key_length (int): La plus grande longueur de clé essayée
     Returns:
         int: La longueur de la clé
     """
-    MAX_KEY_LENGTH = 20
+    if analyse is None:
+        analyse = AnalyseChiffre(cipher, max_key_length)
 
-    for key_length in range(1, MAX_KEY_LENGTH + 1):
-        columns = columnsExtractor(cipher, key_length)
-        hists = [freq(col) for col in columns]
+    for key_length in range(1, max_key_length + 1):
+        analyse.mesures.compte("longueurs_evaluees")
+        hists = analyse.histogrammes(key_length)
         indices = [indice_coincidence(h) for h in hists]
         average = sum(indices) / len(indices)
 
@@ -225,11 +1008,46 @@ def longueur_clef(cipher):
     return 0
 
 
+# Probabilité que deux lettres tirées au hasard soient égales
+IC_ALEATOIRE = 1 / len(alphabet)
+
+
+# Classe les longueurs de clé par indice de coïncidence des colonnes
+def longueurs_ic(cipher, max_key_length=26, nb_candidats=5, analyse=None):
+    """
+    Classe les longueurs de clé de 1 à max_key_length par l'indice de
+    coïncidence de leurs colonnes, sans déchiffrer ni calculer de correlation.
+    Pour la bonne longueur, chaque colonne est un texte de la langue décalé,
+    donc ses lettres coïncident plus souvent qu'au hasard. Pour chaque longueur,
+    on compte les paires de lettres égales dans les colonnes et on mesure leur
+    excès sur le hasard en écarts-types : les multiples de la vraie longueur
+    ont le même indice mais moitié moins de paires, et les longueurs qui ne
+    laissent que quelques lettres par colonne ne sont pas favorisées par le bruit.
+    Seules les longueurs qui laissent au moins deux lettres par colonne sont classées.
+    Args:
+        cipher (str): Le texte chiffré
+        max_key_length (int): La plus grande longueur de clé cherchée
+        nb_candidats (int): Le nombre de longueurs renvoyées
+        analyse (AnalyseChiffre): Les histogrammes du texte, s'ils sont déjà calculés
+    Returns:
+        list: Les nb_candidats meilleures longueurs, de la plus probable à la moins probable
+    """
+    if analyse is None:
+        analyse = AnalyseChiffre(cipher, min(max_key_length, 26))
+    scores = {}
+    for key_length in range(1, min(max_key_length, len(cipher) // 2) + 1):
+        egales, paires = analyse.coincidences(key_length)
+        ecart = math.sqrt(paires * IC_ALEATOIRE * (1 - IC_ALEATOIRE))
+        scores[key_length] = (egales - paires * IC_ALEATOIRE) / ecart
+    analyse.mesures.compte("longueurs_classees", len(scores))
+    return sorted(scores, key=lambda k: (-scores[k], k))[:nb_candidats]
+
+
 # Renvoie le tableau des décalages probables étant
 # donné la longueur de la clé
 # en utilisant la lettre la plus fréquente
 # de chaque colonne
-def clef_par_decalages(cipher, key_length):
+def clef_par_decalages(cipher, key_length, analyse=None):
     """
     Renvoie le tableau des décalages probables, etant
     donné la longueur de la clé en utilisant la lettre
@@ -239,13 +1057,16 @@ def clef_par_decalages(cipher, key_length):
     Args:
         cipher (str): Le texte
         key_length (int): La longueur de la clé
+        analyse (AnalyseChiffre): Les histogrammes du texte, s'ils sont déjà calculés
     Returns:
         list: Le tableau des décalages probables
     """
+    if analyse is None:
+        # Sans pré-calcul, seule la longueur demandée est comptée
+        analyse = AnalyseChiffre(cipher, 0)
     decalages = [0] * key_length
-    columns = columnsExtractor(cipher, key_length)
-    for index, col in enumerate(columns):
-        mostFrequentIndex = lettre_freq_max(col)
+    for index, hist in enumerate(analyse.histogrammes(key_length)):
+        mostFrequentIndex = hist.index(max(hist))
         decalageRaw = mostFrequentIndex - alphabet.index("E")
         if decalageRaw < 0:
             decalageRaw += len(alphabet)
@@ -254,8 +1075,17 @@ def clef_par_decalages(cipher, key_length):
     return decalages
 
 
+# Déchiffre le texte avec la clé trouvée, en mesurant le déchiffrement
+def _dechiffre_clef(cipher, key, mesures):
+    if mesures is None:
+        return dechiffre_vigenere(cipher, key)
+    with mesures.etape("dechiffrement"):
+        mesures.compte("caracteres_dechiffres", len(cipher))
+        return dechiffre_vigenere(cipher, key)
+
+
 # Cryptanalyse V1 avec décalages par frequence max
-def cryptanalyse_v1(cipher):
+def cryptanalyse_v1(cipher, mesures=None):
     """
     Renvoie le texte déchiffré.
     Dechiffre un texte en utilisant les decalages suggerés par clef_par_decalages()
@@ -277,15 +1107,25 @@ def cryptanalyse_v1(cipher):
         la mauvaise longeur de clef.
     """
 
-    key_length = longueur_clef(cipher)
-    decalages = clef_par_decalages(cipher, key_length)
-    decrypted = ""
-    for index, char in enumerate(cipher):
-        diff = alphabet.index(char) - decalages[index % key_length]
-        if diff < 0:
-            diff += len(alphabet)
-        decrypted += alphabet[diff]
-    return decrypted
+    return _dechiffre_clef(cipher, cryptanalyse_v1_clef(cipher, mesures=mesures)[1], mesures)
+
+
+def cryptanalyse_v1_clef(cipher, max_key_length=20, mesures=None):
+    """
+    Renvoie la clé trouvée par la cryptanalyse V1 (voir cryptanalyse_v1()).
+    Cette version ne donne pas de score à la clé.
+    Args:
+        cipher (str): Le texte chiffré
+        max_key_length (int): La plus grande longueur de clé essayée
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        (None, list): Un tuple du score (None) et de la clé
+    """
+    analyse = AnalyseChiffre(cipher, max_key_length, mesures)
+    with analyse.mesures.etape("longueur_clef"):
+        key_length = longueur_clef(cipher, analyse, max_key_length)
+    with analyse.mesures.etape("decalages"):
+        return None, clef_par_decalages(cipher, key_length, analyse)
 
 
 ################################################################
@@ -312,11 +1152,42 @@ def indice_coincidence_mutuelle(h1, h2, d):
     return icm
 
 
+# Matrice des rotations d'un histogramme de référence
+def matrice_decalages(ref):
+    """
+    Renvoie la matrice des rotations d'un histogramme de référence.
+    La ligne d vérifie ligne[j] = ref[(j - d) % n], de sorte que le produit
+    scalaire de la ligne d avec un histogramme h vaut
+    sum(ref[i] * h[(i + d) % n]), c'est-à-dire le produit de ref avec
+    l'histogramme h tourné de d cases (déchiffré avec le décalage d).
+    Args:
+        ref (list): L'histogramme de référence
+    Returns:
+        list: La matrice n x n des rotations
+    """
+    n = len(ref)
+    return [ref[n - d:] + ref[:n - d] for d in range(n)]
+
+
+# Produits de l'histogramme par tous les décalages à la fois
+def scores_decalages(matrice, hist):
+    """
+    Calcule en un seul passage le produit de la référence avec
+    l'histogramme hist tourné de chacun des décalages possibles.
+    Args:
+        matrice (list): La matrice renvoyée par matrice_decalages()
+        hist (list): L'histogramme à comparer
+    Returns:
+        list: Les n produits, indexés par décalage
+    """
+    return [sum(map(operator.mul, ligne, hist)) for ligne in matrice]
+
+
 # Renvoie le tableau des décalages probables étant
 # donné la longueur de la clé
 # en comparant l'indice de décalage mutuel par rapport
 # à la première colonne
-def tableau_decalages_ICM(cipher, key_length):
+def tableau_decalages_ICM(cipher, key_length, analyse=None):
     """
     Renvoie le tableau des décalages probables, etant
     donné la longueur de la clé en comparant l'indice
@@ -326,29 +1197,34 @@ def tableau_decalages_ICM(cipher, key_length):
     Args:
         cipher (str): Le texte
         key_length (int): La longueur de la clé
+        analyse (AnalyseChiffre): Les histogrammes du texte, s'ils sont déjà calculés
     Returns:
         list: Le tableau des décalages probables
     """
+    if analyse is None:
+        # Sans pré-calcul, seule la longueur demandée est comptée
+        analyse = AnalyseChiffre(cipher, 0)
     decalages = [0] * key_length
-    cols = columnsExtractor(cipher, key_length)
-    f0 = freq(cols[0])
-
-    for i, c in enumerate(cols):
-        f = freq(c)
-        max_icm = 0.0
-        max_decalage = 0.0
-        for d in range(len(alphabet)):
-            icm = indice_coincidence_mutuelle(f0, f, d)
-            if icm > max_icm:
-                max_decalage = d
-                max_icm = icm
-        decalages[i] = max_decalage
+    hists = analyse.histogrammes(key_length)
+    f0 = hists[0]
+    n0 = sum(f0)
+    matrice = matrice_decalages(f0)
+
+    # Les ICM des 26 décalages de chaque colonne sont calculés ensemble :
+    # indice_coincidence_mutuelle(f0, f, d) == scores_decalages(matrice, f)[d] / (n0 * n)
+    for i, f in enumerate(hists):
+        normalisation = n0 * sum(f)
+        icms = [produit / normalisation for produit in scores_decalages(matrice, f)]
+        analyse.mesures.compte("icm", len(icms))
+        max_icm = max(icms)
+        if max_icm > 0.0:
+            decalages[i] = icms.index(max_icm)
 
     return decalages
 
 
 # Cryptanalyse V2 avec décalages par ICM
-def cryptanalyse_v2(cipher):
+def cryptanalyse_v2(cipher, mesures=None):
     """
     Renvoie le texte déchiffré.
     En premier temps, dechiffrer chaque colonne du texte en utilisant
@@ -365,26 +1241,45 @@ def cryptanalyse_v2(cipher):
     propre contexte statistique, au lieu de le comparer au contexte statistique 'general'.
     Args:
         cipher (str): Le texte à dechiffrer
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
     Returns:
         str: Le texte déchiffré
     """
-    key_length = longueur_clef(cipher)
-    decalages = tableau_decalages_ICM(cipher, key_length)
-    colonnes = columnsExtractor(cipher, key_length)
+    return _dechiffre_clef(cipher, cryptanalyse_v2_clef(cipher, mesures=mesures)[1], mesures)
 
-    for i in range(len(colonnes)):
-        colonnes[i] = dechiffre_cesar(colonnes[i], decalages[i])
 
-    levelOneDecrypted = constructTextFromColumns(colonnes)
-    e_chiffre = lettre_freq_max(levelOneDecrypted)
+def cryptanalyse_v2_clef(cipher, max_key_length=20, mesures=None):
+    """
+    Renvoie la clé trouvée par la cryptanalyse V2 (voir cryptanalyse_v2()).
+    Les deux déchiffrements successifs de la V2 se composent en une seule
+    clé de Vigenère. Cette version ne donne pas de score à la clé.
+    Args:
+        cipher (str): Le texte chiffré
+        max_key_length (int): La plus grande longueur de clé essayée
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        (None, list): Un tuple du score (None) et de la clé
+    """
+    analyse = AnalyseChiffre(cipher, max_key_length, mesures)
+    with analyse.mesures.etape("longueur_clef"):
+        key_length = longueur_clef(cipher, analyse, max_key_length)
+    with analyse.mesures.etape("decalages"):
+        decalages = tableau_decalages_ICM(cipher, key_length, analyse)
+
+    # Histogramme du texte après le premier déchiffrement : somme des
+    # histogrammes des colonnes, chacun tourné de son décalage.
+    levelOneHist = [0.0] * len(alphabet)
+    for hist, decalage in zip(analyse.histogrammes(key_length), decalages):
+        for j in range(len(alphabet)):
+            levelOneHist[j] += hist[(j + decalage) % len(alphabet)]
+    e_chiffre = levelOneHist.index(max(levelOneHist))
 
     decalage_final = e_chiffre - alphabet.index("E")
 
     if decalage_final < 0:
         decalage_final += len(alphabet)
-    levelTwoDecrypted = dechiffre_cesar(levelOneDecrypted, decalage_final)
 
-    return levelTwoDecrypted
+    return None, [(d + decalage_final) % len(alphabet) for d in decalages]
 
 
 ################################################################
@@ -426,53 +1321,131 @@ def correlation(L1, L2):
     return round(numerator / denominator, 10)
 
 
+# Prépare une table de fréquences pour le calcul
+# des correlations avec tous les décalages à la fois
+@lru_cache(maxsize=32)
+def _reference_correlation(freqs):
+    """
+    Renvoie la matrice des rotations de la table de fréquences centrée
+    et l'écart de cette table (voir correlation()).
+    Comme la moyenne et l'écart d'un histogramme ne changent pas par
+    rotation, la correlation de freqs avec l'histogramme h tourné de d
+    cases vaut scores_decalages(matrice, h)[d] / (ecart * ecart(h)).
+    Args:
+        freqs (tuple): La table de fréquences
+    Returns:
+        (list, float): La matrice des rotations et l'écart
+    """
+    moyenne = sum(freqs) / len(freqs)
+    centree = [f - moyenne for f in freqs]
+    ecart = math.sqrt(sum([x * x for x in centree]))
+    return matrice_decalages(centree), ecart
+
+
+# Correlations d'un histogramme avec une table de fréquences
+# pour tous les décalages à la fois
+def correlations_decalages(freqs, hist, ecart_hist=None):
+    """
+    Renvoie les correlations de Pearson entre freqs et l'histogramme hist
+    déchiffré avec chacun des décalages, arrondies comme correlation() :
+    correlations_decalages(freqs, hist)[d] == correlation(freqs, hist[d:] + hist[:d])
+    Args:
+        freqs (list): La table de fréquences de la langue
+        hist (list): L'histogramme d'une colonne chiffrée
+        ecart_hist (float): L'écart de hist (voir _ecart()), pour le partager
+        entre plusieurs tables de fréquences
+    Returns:
+        list: Les correlations, indexées par décalage
+    """
+    matrice, ecart_freqs = _reference_correlation(tuple(freqs))
+    if ecart_hist is None:
+        ecart_hist = _ecart(hist)
+    denominator = ecart_freqs * ecart_hist
+    if denominator == 0:
+        raise ValueError('Length too small to calculate a standard deviation')
+    return [round(produit / denominator, 10) for produit in scores_decalages(matrice, hist)]
+
+
+def _ecart(hist):
+    """
+    Renvoie la racine de la somme des carrés des écarts à la moyenne d'un histogramme.
+    """
+    moyenne = sum(hist) / len(hist)
+    return math.sqrt(sum([(x - moyenne) ** 2 for x in hist]))
+
+
 # Renvoie la meilleur clé possible par correlation
 # étant donné une longueur de clé fixée
-def clef_correlations(cipher, key_length, freqs=None):
+def clef_correlations(cipher, key_length, freqs=None, analyse=None):
     """
     Renvoie un tuple de la meilleur clé possible par correlation etant
     donné une longueur de clé et le score de cette clé.
     Pour chaque colonne, on choisi le decalage qui maximise la correlation
     entre l'histogramme de cette colonne et l'histogramme de la langue.
+    L'histogramme de la colonne déchiffrée avec un décalage d est obtenu
+    par rotation de d cases de l'histogramme de la colonne chiffrée.
     La cle renvoyee sera la liste des decalages choisis.
     Le score est la moyenne des correlations.
     Args:
         cipher (str): Le texte à dechiffrer
         key_length (int): La longueur de la cle
-        freqs (list) : Table de frequence
+        freqs (list) : Table de frequence, ou code d'une langue de langues_disponibles()
+        analyse (AnalyseChiffre): Les histogrammes du texte, s'ils sont déjà calculés
     Returns:
         (float, list): Un tuple du score et la cle
     """
-    if freqs is None:
-        freqs = freq_FR
-    key = [0] * key_length
-    score = 0.0
+    return clef_correlations_langues(cipher, key_length, [freqs], analyse)[0]
+
 
-    columns = columnsExtractor(cipher, key_length)
+# Renvoie la meilleure clé par correlation pour
+# plusieurs langues à la fois
+def clef_correlations_langues(cipher, key_length, tables, analyse=None):
+    """
+    Fait le travail de clef_correlations() pour plusieurs tables de fréquences
+    à la fois : les histogrammes des colonnes et leurs écarts ne sont calculés
+    qu'une fois, quel que soit le nombre de langues.
+    Args:
+        cipher (str): Le texte à dechiffrer
+        key_length (int): La longueur de la cle
+        tables (list): Les tables de fréquences ou codes de langues
+        analyse (AnalyseChiffre): Les histogrammes du texte, s'ils sont déjà calculés
+    Returns:
+        list: Un tuple (score, clé) par table, dans l'ordre des tables
+    """
+    tables = [frequences_langue(freqs) for freqs in tables]
+    if analyse is None:
+        # Sans pré-calcul, seule la longueur demandée est comptée
+        analyse = AnalyseChiffre(cipher, 0)
+    analyse.mesures.compte("longueurs_evaluees")
+    keys = [[0] * key_length for freqs in tables]
+    scores = [0.0] * len(tables)
 
-    for index, col in enumerate(columns):
-        key[index] = 0
-        max_corr = 0
-        for decal in range(len(alphabet)):
-            col_dechiffre = dechiffre_cesar(col, decal)
-            corr = correlation(freqs, freq(col_dechiffre))
-            if corr > max_corr:
-                key[index] = decal
-                max_corr = corr
+    # Déchiffrer une colonne avec le décalage decal revient à faire
+    # tourner son histogramme de decal cases : les lettres de chaque
+    # colonne ne sont donc comptées qu'une seule fois.
+    for index, hist in enumerate(analyse.histogrammes(key_length)):
+        ecart_hist = _ecart(hist)
+        for t, freqs in enumerate(tables):
+            correlations = correlations_decalages(freqs, hist, ecart_hist)
+            analyse.mesures.compte("correlations", len(correlations))
+            max_corr = max(correlations)
+            if max_corr > 0:
+                keys[t][index] = correlations.index(max_corr)
+            else:
+                max_corr = 0
 
-        score += max_corr
-    score /= key_length
+            scores[t] += max_corr
 
-    return score, key
+    return [(score / key_length, key) for score, key in zip(scores, keys)]
 
-def clef_correlations_anglais(cipher, key_length):
-    return clef_correlations(cipher, key_length, freq_EN)
+def clef_correlations_anglais(cipher, key_length, analyse=None):
+    return clef_correlations(cipher, key_length, freq_EN, analyse)
 
 
 
 
 # Cryptanalyse V3 avec correlations
-def cryptanalyse_v3(cipher):
+def cryptanalyse_v3(cipher, max_key_length=26, selection=None, nb_candidats=5, mesures=None):
     """
     Renvoie le texte déchiffré
     Pour chaque longueur de clé possible, on choisi la clé qui maximise le score.
@@ -494,14 +1467,63 @@ def cryptanalyse_v3(cipher):
 
     Args:
         cipher (str): Le texte à dechiffrer
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): Le choix des longueurs évaluées (voir cryptanalyse_v3_clef())
+        nb_candidats (int): Le nombre de longueurs gardées par la sélection
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
     Returns:
         str: Le texte déchiffré
     """
-    MAX_KEY_LENGTH = 26
+    key = cryptanalyse_v3_clef(cipher, None, max_key_length, selection, nb_candidats, mesures)[1]
+    return _dechiffre_clef(cipher, key, mesures)
+
+def cryptanalyse_v3_anglais(cipher, max_key_length=26, selection=None, nb_candidats=5, mesures=None):
+    key = cryptanalyse_v3_clef(cipher, freq_EN, max_key_length, selection, nb_candidats, mesures)[1]
+    return _dechiffre_clef(cipher, key, mesures)
+
+
+def cryptanalyse_v3_clef(cipher, freqs=None, max_key_length=26, selection=None, nb_candidats=5, mesures=None,
+                         progression=None):
+    """
+    Renvoie la meilleure clé trouvée par la cryptanalyse V3 (voir cryptanalyse_v3())
+    et son score, la moyenne des correlations de ses colonnes.
+    Par défaut toutes les longueurs de 1 à max_key_length (sans dépasser
+    la longueur du texte) sont évaluées. Pour chercher des clés beaucoup
+    plus longues pour moins de calcul, une sélection rapide peut d'abord
+    classer toutes les longueurs et ne garder que les nb_candidats meilleures :
+        - selection="ic" : indice de coïncidence des colonnes (longueurs_ic())
+        - selection="kasiski" : examen de Kasiski (longueurs_kasiski()), la
+        longueur 1 étant toujours évaluée en plus.
+    La fonction progression, si elle est donnée, est appelée avec le nom de
+    l'étape, le travail fait et le travail total de l'étape : d'abord avec
+    "histogrammes" avant de compter chaque longueur sur le texte (voir
+    AnalyseChiffre), puis avec "longueurs", le nombre de longueurs évaluées et
+    le nombre de longueurs à évaluer, avant la première longueur et après
+    chacune. Elle peut lever AnalyseInterrompue pour arrêter la recherche.
+    Args:
+        cipher (str): Le texte chiffré
+        freqs (list): Table de frequence ou code de la langue (français par défaut)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): None pour évaluer toutes les longueurs, "ic" ou "kasiski"
+        nb_candidats (int): Le nombre de longueurs gardées par la sélection
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+        progression (function): La fonction de progression (aucune par défaut)
+    Returns:
+        (float, list): Un tuple du score et de la clé (None si aucune clé n'a un score positif)
+    """
+    analyse = AnalyseChiffre(cipher, min(max_key_length, 26), mesures, progression)
+    with analyse.mesures.etape("selection_longueurs"):
+        longueurs = _longueurs_evaluees(cipher, analyse, max_key_length, selection, nb_candidats)
+
     results = []
+    if progression is not None:
+        progression("longueurs", 0, len(longueurs))
 
-    for key_length in range(1, MAX_KEY_LENGTH + 1):
-        results.append(clef_correlations(cipher, key_length))
+    with analyse.mesures.etape("correlations"):
+        for key_length in longueurs:
+            results.append(clef_correlations(cipher, key_length, freqs, analyse))
+            if progression is not None:
+                progression("longueurs", len(results), len(longueurs))
 
     max_score = 0.0
     key = None
@@ -510,26 +1532,1312 @@ def cryptanalyse_v3(cipher):
             max_score = entry[0]
             key = entry[1]
 
-    decrypted = dechiffre_vigenere(cipher, key)
-    return decrypted
+    return max_score, key
 
-def cryptanalyse_v3_anglais(cipher):
-    MAX_KEY_LENGTH = 26
-    results = []
 
-    for key_length in range(1, MAX_KEY_LENGTH + 1):
-        results.append(clef_correlations_anglais(cipher, key_length))
+def _longueurs_evaluees(cipher, analyse, max_key_length, selection, nb_candidats):
+    """
+    Renvoie, dans l'ordre croissant, les longueurs de clé que la V3 doit évaluer
+    (voir cryptanalyse_v3_clef()).
+    """
+    if selection is None:
+        return list(range(1, min(max_key_length, len(cipher)) + 1))
+    elif selection == "ic":
+        return sorted(longueurs_ic(cipher, max_key_length, nb_candidats, analyse))
+    elif selection == "kasiski":
+        return sorted(set([1] + longueurs_kasiski(cipher, max_key_length, nb_candidats)))
+    raise ValueError("Sélection de longueurs inconnue : " + str(selection))
+
+
+# Les N meilleures clés de la V3
+def candidats_clefs(cipher, nb=5, freqs=None, max_key_length=26, selection=None, nb_candidats=5, mesures=None):
+    """
+    Renvoie les nb meilleures clés de la cryptanalyse V3, au lieu de la seule
+    meilleure : quand la première clé ne donne pas le bon texte, les suivantes
+    se relisent sans relancer l'analyse.
+    Pour chaque longueur évaluée, les décalages de chaque colonne sont classés
+    par correlation décroissante. Les clés sont ensuite parcourues par score
+    décroissant, toutes longueurs confondues, avec un tas : une clé est un
+    vecteur de rangs dans ces classements, et ses successeurs avancent d'un
+    rang une colonne située à partir de la dernière colonne avancée, ce qui
+    atteint chaque clé une seule fois. Seules les clés retenues et leurs
+    successeurs sont évalués, aucune n'est déchiffrée.
+    Une clé qui répète une clé plus courte (KEYKEY) donne le même texte que
+    celle-ci : seule la mieux classée des deux est gardée.
+    La marge d'une colonne est l'écart entre la correlation du décalage choisi
+    et la meilleure correlation des autres décalages de la colonne : positive
+    si le décalage choisi est le meilleur, elle mesure la confiance dans ce choix.
+    Args:
+        cipher (str): Le texte chiffré
+        nb (int): Le nombre de clés renvoyées
+        freqs (list): Table de frequence ou code de la langue (français par défaut)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): Le choix des longueurs évaluées (voir cryptanalyse_v3_clef())
+        nb_candidats (int): Le nombre de longueurs gardées par la sélection
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        list: Au plus nb tuples (score, clé, marges), par score décroissant ;
+        le premier est la clé de cryptanalyse_v3_clef() quand toutes ses
+        colonnes ont une correlation positive
+    """
+    freqs = frequences_langue(freqs)
+    analyse = AnalyseChiffre(cipher, min(max_key_length, 26), mesures)
+    with analyse.mesures.etape("selection_longueurs"):
+        longueurs = _longueurs_evaluees(cipher, analyse, max_key_length, selection, nb_candidats)
+
+    # Pour chaque longueur : les correlations de chaque colonne, indexées
+    # par décalage, et les décalages de chaque colonne dans l'ordre du classement
+    classements = {}
+    tas = []
+
+    def score(key_length, rangs):
+        correlations, ordres = classements[key_length]
+        return sum(correlations[i][ordres[i][r]] for i, r in enumerate(rangs)) / key_length
+
+    with analyse.mesures.etape("correlations"):
+        for key_length in longueurs:
+            analyse.mesures.compte("longueurs_evaluees")
+            correlations = []
+            for hist in analyse.histogrammes(key_length):
+                correlations.append(correlations_decalages(freqs, hist))
+                analyse.mesures.compte("correlations", len(alphabet))
+            ordres = [sorted(range(len(alphabet)), key=lambda d: (-colonne[d], d)) for colonne in correlations]
+            classements[key_length] = (correlations, ordres)
+            rangs = (0,) * key_length
+            heapq.heappush(tas, (-score(key_length, rangs), key_length, rangs, 0))
+
+    resultats = []
+    vues = set()
+    while tas and len(resultats) < nb:
+        oppose, key_length, rangs, derniere = heapq.heappop(tas)
+        for i in range(derniere, key_length):
+            if rangs[i] + 1 < len(alphabet):
+                suivant = rangs[:i] + (rangs[i] + 1,) + rangs[i + 1:]
+                heapq.heappush(tas, (-score(key_length, suivant), key_length, suivant, i))
+
+        correlations, ordres = classements[key_length]
+        key = [ordres[i][r] for i, r in enumerate(rangs)]
+        periode = next(p for p in range(1, key_length + 1)
+                       if key_length % p == 0 and key == key[:p] * (key_length // p))
+        if tuple(key[:periode]) in vues:
+            continue
+        vues.add(tuple(key[:periode]))
+
+        marges = [correlations[i][key[i]] - correlations[i][ordres[i][1 if r == 0 else 0]]
+                  for i, r in enumerate(rangs)]
+        resultats.append((-oppose, key, marges))
+
+    return resultats
+
+
+# Cryptanalyse V3 sur un échantillon des très longs textes
+
+# Nombre de lettres par colonne de l'échantillon de départ pour la plus
+# grande longueur de clé, et au plus après élargissement
+TAILLE_ECHANTILLON = 256
+TAILLE_ECHANTILLON_MAX = 1 << 14
+
+# Confiance visée pour le décalage de chaque colonne
+CONFIANCE_MIN = 0.999
+
+# Fréquence donnée aux lettres absentes d'une table pour le calcul des vraisemblances
+_FREQUENCE_PLANCHER = 1e-5
+
+
+class AnalyseEchantillon:
+    """
+    Histogrammes des colonnes d'un texte chiffré estimés sur un échantillon,
+    utilisables à la place d'un AnalyseChiffre par clef_correlations().
+    La colonne i de la longueur k est découpée en strates, les tranches
+    cipher[i + k * o::k * pas] pour o de 0 à pas - 1, chacune répartie sur tout
+    le texte. Le pas ne dépend pas de k : comme sur le texte entier, une
+    longueur double a deux fois moins de lettres par colonne, ce qui évite de
+    préférer les multiples de la longueur de la clé. C'est un nombre premier
+    plus grand que max_key_length, pour que chaque strate passe par toutes les
+    positions dans la clé, quelle que soit sa longueur (un pas de 2 ne verrait,
+    pour k = 10, qu'une colonne sur deux d'une clé de longueur 20). Une strate
+    contient environ taille lettres pour la longueur max_key_length. L'échantillon d'une
+    colonne commence par une strate et double à chaque élargissement, sans
+    dépasser taille_max lettres ; seules les lettres échantillonnées sont lues.
+    Attributs:
+        cipher (str): Le texte chiffré
+        taille (int): Le nombre de lettres par colonne de l'échantillon de départ,
+        pour la longueur max_key_length
+        taille_max (int): Le nombre de lettres par colonne après élargissement, au plus
+        max_key_length (int): La plus grande longueur de clé cherchée
+        mesures (Mesures): L'instrumentation de la cryptanalyse qui utilise ces histogrammes
+    """
+
+    def __init__(self, cipher, taille=TAILLE_ECHANTILLON, taille_max=TAILLE_ECHANTILLON_MAX, max_key_length=26,
+                 mesures=None):
+        self.cipher = cipher
+        self.taille = taille
+        self.taille_max = taille_max
+        self.max_key_length = max_key_length
+        self.mesures = SANS_MESURES if mesures is None else mesures
+        pas = len(cipher) // (max_key_length * taille)
+        if pas <= max_key_length:
+            pas = 1
+        else:
+            while any(pas % d == 0 for d in range(2, math.isqrt(pas) + 1)):
+                pas += 1
+        self._pas = pas
+        self._histogrammes = {}
+        self._strates = {}
+
+    def _compte(self, key_length, i, strates):
+        """
+        Compte les lettres des strates données de la colonne i.
+        """
+        hist = [0.0] * len(alphabet)
+        for o in strates:
+            echantillon = _vers_octets(self.cipher[i + key_length * o::key_length * self._pas])
+            hist = [a + b for a, b in zip(hist, _histogramme(echantillon))]
+            self.mesures.compte("caracteres_lus", len(echantillon))
+        return hist
+
+    def histogrammes(self, key_length):
+        """
+        Renvoie les histogrammes des colonnes de l'échantillon pour une longueur de clé.
+        Args:
+            key_length (int): La longueur de la clé
+        Returns:
+            list: La liste des key_length histogrammes
+        """
+        if key_length not in self._histogrammes:
+            with self.mesures.etape("histogrammes"):
+                self._histogrammes[key_length] = [self._compte(key_length, i, [0]) for i in range(key_length)]
+                self._strates[key_length] = [1] * key_length
+                self.mesures.compte("histogrammes", key_length)
+        return self._histogrammes[key_length]
+
+    def elargit(self, key_length, i):
+        """
+        Double l'échantillon de la colonne i, dans la limite de taille_max
+        lettres et de la colonne entière.
+        Args:
+            key_length (int): La longueur de la clé
+            i (int): La colonne
+        Returns:
+            bool: False si l'échantillon ne peut plus être élargi
+        """
+        hists = self.histogrammes(key_length)
+        strates = self._strates[key_length][i]
+        par_strate = max(1, len(self.cipher) // (key_length * self._pas))
+        maximum = min(self._pas, max(1, self.taille_max // par_strate))
+        if strates >= maximum:
+            return False
+        nouvelles = min(2 * strates, maximum)
+        with self.mesures.etape("histogrammes"):
+            ajout = self._compte(key_length, i, range(strates, nouvelles))
+        hists[i] = [a + b for a, b in zip(hists[i], ajout)]
+        self._strates[key_length][i] = nouvelles
+        return True
+
+
+def confiance_decalage(freqs, hist, decalage):
+    """
+    Renvoie la probabilité qu'un décalage soit le bon pour une colonne, si les
+    lettres claires de la colonne suivent la table de fréquences : la
+    vraisemblance des lettres comptées avec ce décalage, rapportée à la somme
+    des vraisemblances avec les 26 décalages.
+    Args:
+        freqs (list): La table de fréquences de la langue
+        hist (list): L'histogramme de la colonne chiffrée
+        decalage (int): Le décalage
+    Returns:
+        float: La probabilité, entre 0 et 1
+    """
+    logs = [math.log(max(f, _FREQUENCE_PLANCHER)) for f in freqs]
+    vraisemblances = [sum([hist[c] * logs[(c - d) % len(alphabet)] for c in range(len(alphabet))])
+                      for d in range(len(alphabet))]
+    reference = vraisemblances[decalage]
+    return 1 / sum([math.exp(min(v - reference, 700)) for v in vraisemblances])
+
+
+def cryptanalyse_v3_echantillon_clef(cipher, freqs=None, max_key_length=26, taille=TAILLE_ECHANTILLON,
+                                     taille_max=TAILLE_ECHANTILLON_MAX, confiance_min=CONFIANCE_MIN, mesures=None):
+    """
+    Cryptanalyse V3 (voir cryptanalyse_v3_clef()) sur un échantillon du texte,
+    pour les très longs textes : le travail ne dépend plus de la longueur du
+    texte, seulement de taille, de taille_max et de max_key_length.
+    La longueur de la clé est choisie sur un échantillon de taille lettres
+    par colonne pour la longueur max_key_length (voir AnalyseEchantillon). Pour cette longueur, l'échantillon
+    de chaque colonne est ensuite élargi tant que la confiance dans son
+    décalage (voir confiance_decalage()) reste sous confiance_min, sauf si
+    taille_max est atteint. La confiance renvoyée est celle de la clé entière,
+    le produit des confiances de ses colonnes.
+    Sur un texte de moins de (max_key_length + 1) * max_key_length * taille
+    lettres (180 000 par défaut), l'échantillon est le texte entier et le
+    résultat est celui de cryptanalyse_v3_clef().
+    Args:
+        cipher (str): Le texte chiffré
+        freqs (list): Table de frequence ou code de la langue (français par défaut)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        taille (int): Le nombre de lettres par colonne de l'échantillon de départ,
+        pour la longueur max_key_length
+        taille_max (int): Le nombre de lettres par colonne après élargissement, au plus
+        confiance_min (float): La confiance visée pour chaque colonne
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        (float, list, float): Le score, la clé (None si aucune clé n'a un score
+        positif) et la confiance
+    """
+    freqs = frequences_langue(freqs)
+    analyse = AnalyseEchantillon(cipher, taille, taille_max, max_key_length, mesures)
+    score, key = _meilleure_clef(analyse, range(1, min(max_key_length, len(cipher)) + 1), freqs)
+    if key is None:
+        return score, key, 0.0
+
+    key_length = len(key)
+    with analyse.mesures.etape("affinage"):
+        hists = analyse.histogrammes(key_length)
+        for i in range(key_length):
+            while confiance_decalage(freqs, hists[i], key[i]) < confiance_min and analyse.elargit(key_length, i):
+                correlations = correlations_decalages(freqs, hists[i])
+                key[i] = correlations.index(max(correlations))
+    score, key = clef_correlations(None, key_length, freqs, analyse)
+    confiance = 1.0
+    for i in range(key_length):
+        confiance *= confiance_decalage(freqs, hists[i], key[i])
+    return score, key, confiance
+
+
+def cryptanalyse_v3_echantillon(cipher, freqs=None, max_key_length=26, mesures=None):
+    """
+    Renvoie le texte déchiffré avec la clé de cryptanalyse_v3_echantillon_clef().
+    Args:
+        cipher (str): Le texte à dechiffrer
+        freqs (list): Table de frequence ou code de la langue (français par défaut)
+        max_key_length (int): La plus grande longueur de clé cherchée
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        str: Le texte déchiffré
+    """
+    key = cryptanalyse_v3_echantillon_clef(cipher, freqs, max_key_length, mesures=mesures)[1]
+    return _dechiffre_clef(cipher, key, mesures)
+
+
+# Cryptanalyse V3 en plusieurs langues à la fois
+def cryptanalyse_langues(cipher, langues=None, max_key_length=26, selection=None, nb_candidats=5, mesures=None,
+                         progression=None):
+    """
+    Renvoie la langue la plus probable d'un texte chiffré, avec la meilleure
+    clé de la V3 dans cette langue et son score.
+    Les histogrammes des colonnes sont calculés une seule fois pour toutes
+    les langues. Quand il y a plusieurs langues et plus de nb_candidats
+    longueurs à évaluer, les longueurs sont d'abord classées avec la moyenne
+    des tables de fréquences des langues (la longueur de la clé ne dépend pas
+    de la langue), puis seules les nb_candidats meilleures sont évaluées dans
+    chaque langue : essayer cinq langues coûte à peine plus qu'en essayer une.
+    Args:
+        cipher (str): Le texte chiffré
+        langues (list): Les codes des langues (par défaut, langues_disponibles())
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): Le choix des longueurs évaluées (voir cryptanalyse_v3_clef())
+        nb_candidats (int): Le nombre de longueurs évaluées dans chaque langue
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+        progression (function): La fonction de progression (voir cryptanalyse_v3_clef()),
+        dont l'étape "longueurs" compte les longueurs classées puis les longueurs évaluées
+        dans toutes les langues
+    Returns:
+        (str, float, list): La langue, le score et la clé
+        (langue et clé None si aucune clé n'a un score positif)
+    """
+    if langues is None:
+        langues = langues_disponibles()
+    tables = [frequences_langue(langue) for langue in langues]
+    analyse = AnalyseChiffre(cipher, min(max_key_length, 26), mesures, progression)
+    with analyse.mesures.etape("selection_longueurs"):
+        longueurs = _longueurs_evaluees(cipher, analyse, max_key_length, selection, nb_candidats)
+
+        classement = len(tables) > 1 and len(longueurs) > nb_candidats
+        total = len(longueurs) + nb_candidats if classement else len(longueurs)
+        faites = 0
+        if progression is not None:
+            progression("longueurs", faites, total)
+
+        if classement:
+            moyenne = [sum(f) / len(tables) for f in zip(*tables)]
+            scores = {}
+            for k in longueurs:
+                scores[k] = clef_correlations(cipher, k, moyenne, analyse)[0]
+                faites += 1
+                if progression is not None:
+                    progression("longueurs", faites, total)
+            longueurs = sorted(sorted(longueurs, key=lambda k: -scores[k])[:nb_candidats])
 
     max_score = 0.0
+    langue = None
     key = None
-    for entry in results:
-        if entry[0] > max_score:
-            max_score = entry[0]
-            key = entry[1]
+    with analyse.mesures.etape("correlations"):
+        for key_length in longueurs:
+            for code, entry in zip(langues, clef_correlations_langues(cipher, key_length, tables, analyse)):
+                if entry[0] > max_score:
+                    max_score = entry[0]
+                    langue = code
+                    key = entry[1]
+            faites += 1
+            if progression is not None:
+                progression("longueurs", faites, total)
+
+    return langue, max_score, key
+
+
+################################################################
+
+
+### Modèles de langue : la table de fréquences des lettres et les tables
+### de n-grammes d'une langue, stockées dans un fichier binaire du dossier
+### langues/ et projetées en mémoire à la première utilisation.
+###
+### Format d'un fichier (petit-boutiste) :
+###     - en-tête : "VGLM", version (uint16), taille de l'alphabet n (uint16),
+###       ordre maximal des n-grammes (uint8), nom de la langue (32 octets UTF-8)
+###     - fréquences des lettres : n float64
+###     - pour chaque ordre k de 1 à l'ordre maximal : n**k float32, le log10 de
+###       la probabilité de chaque k-gramme, indexé par sum(code_i * n**(k-1-i))
+
+DOSSIER_LANGUES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "langues")
+EXTENSION_MODELE = ".vlm"
+_ENTETE_MODELE = struct.Struct("<4sHHB7x32s")
+_MAGIQUE_MODELE = b"VGLM"
+_VERSION_MODELE = 1
+
+# Tous les octets qui ne sont pas des lettres de l'alphabet
+_NON_LETTRES = bytes(b for b in range(256) if b not in _LETTRES)
+
+# Lettres qui ne se décomposent pas en lettre + accent
+_LIGATURES = str.maketrans({"Œ": "OE", "Æ": "AE", "ß": "SS"})
+
+
+class ModeleLangue:
+    """
+    Modèle de langue chargé depuis un fichier binaire. Les tables de
+    n-grammes ne sont pas copiées : elles restent des vues sur le fichier
+    projeté en mémoire, ce qui garde le chargement instantané.
+    Attributs:
+        nom (str): Le nom de la langue
+        ordre (int): L'ordre maximal des n-grammes
+        frequences (list): La fréquence de chaque lettre, dans le format de freq_FR
+        empreinte (str): L'empreinte SHA-256 du fichier, en hexadécimal
+    """
+
+    def __init__(self, fichier):
+        with open(fichier, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magique, version, taille, ordre, nom = _ENTETE_MODELE.unpack_from(self._mmap)
+        if magique != _MAGIQUE_MODELE or version != _VERSION_MODELE or taille != len(alphabet):
+            raise ValueError("Fichier de modèle de langue invalide : " + fichier)
+        self.nom = nom.rstrip(b"\0").decode("utf-8")
+        self.ordre = ordre
+        self.empreinte = hashlib.sha256(self._mmap).hexdigest()
+
+        vue = memoryview(self._mmap)
+        position = _ENTETE_MODELE.size
+        self.frequences = list(_vue_tableau(vue[position:position + 8 * taille], "d"))
+        position += 8 * taille
+        self._tables = [None]
+        for n in range(1, ordre + 1):
+            longueur = 4 * taille ** n
+            self._tables.append(_vue_tableau(vue[position:position + longueur], "f"))
+            position += longueur
+
+    def table(self, n):
+        """
+        Renvoie la table des log10 des probabilités des n-grammes.
+        Args:
+            n (int): L'ordre des n-grammes, de 1 à self.ordre
+        Returns:
+            memoryview: La table, indexée par sum(code_i * 26**(n-1-i))
+        """
+        return self._tables[n]
+
+
+def _vue_tableau(octets, format):
+    """
+    Renvoie une vue typée sur des octets petit-boutistes, sans copie
+    sauf sur une machine gros-boutiste.
+    """
+    if sys.byteorder == "little":
+        return octets.cast(format)
+    tableau = array(format, octets)
+    tableau.byteswap()
+    return tableau
+
+
+def normalise_texte(txt):
+    """
+    Ramène un texte à l'alphabet : majuscules, accents retirés
+    (É devient E, Œ devient OE) et tout autre caractère supprimé.
+    Args:
+        txt (str): Le texte
+    Returns:
+        bytes: Les lettres du texte en octets ASCII
+    """
+    txt = unicodedata.normalize("NFD", txt.upper().translate(_LIGATURES))
+    return txt.encode("ascii", "ignore").translate(None, _NON_LETTRES)
+
+
+def compte_ngrammes(lettres, n):
+    """
+    Compte les n-grammes d'un texte.
+    Args:
+        lettres (bytes): Les lettres du texte en octets ASCII (voir normalise_texte())
+        n (int): L'ordre des n-grammes
+    Returns:
+        list: Le nombre d'occurrences de chaque n-gramme, indexé comme ModeleLangue.table()
+    """
+    comptes = [0] * len(alphabet) ** n
+    for indice, compte in _compte_ngrammes_indices(lettres, n).items():
+        comptes[indice] = compte
+    return comptes
+
+
+def _compte_ngrammes_indices(lettres, n):
+    """
+    Compte les n-grammes d'un texte, sous forme creuse.
+    Returns:
+        dict: Le nombre d'occurrences de chaque n-gramme présent, par indice (voir compte_ngrammes())
+    """
+    codes = lettres.translate(bytes.maketrans(_LETTRES, bytes(range(len(alphabet)))))
+    comptes = {}
+    for ngramme, compte in Counter(zip(*[codes[i:] for i in range(n)])).items():
+        indice = 0
+        for code in ngramme:
+            indice = indice * len(alphabet) + code
+        comptes[indice] = compte
+    return comptes
+
+
+def ecrire_modele_langue(fichier, nom, frequences, comptes):
+    """
+    Ecrit un modèle de langue dans un fichier binaire.
+    Les n-grammes jamais vus reçoivent le log10 de 0.01 / total.
+    Args:
+        fichier (str): Le fichier à écrire
+        nom (str): Le nom de la langue
+        frequences (list): La fréquence de chaque lettre
+        comptes (list): comptes[k - 1] est la liste renvoyée par compte_ngrammes(lettres, k)
+    """
+    def petit_boutiste(tableau):
+        if sys.byteorder != "little":
+            tableau.byteswap()
+        return tableau.tobytes()
+
+    with open(fichier, "wb") as f:
+        f.write(_ENTETE_MODELE.pack(_MAGIQUE_MODELE, _VERSION_MODELE, len(alphabet), len(comptes),
+                                    nom.encode("utf-8")))
+        f.write(petit_boutiste(array("d", frequences)))
+        for compte in comptes:
+            total = sum(compte)
+            if total == 0:
+                raise ValueError("Aucun n-gramme compté pour le modèle " + nom)
+            plancher = math.log10(0.01 / total)
+            f.write(petit_boutiste(array("f", [math.log10(c / total) if c else plancher for c in compte])))
+
+
+# Entraînement d'un modèle sur un corpus : les fichiers sont lus par
+# morceaux, chaque morceau est normalisé et compté dans un processus du
+# groupe, et les comptes des morceaux sont additionnés au fur et à mesure.
 
-    decrypted = dechiffre_vigenere(cipher, key)
-    return decrypted
+# Taille des morceaux de corpus envoyés aux processus, en caractères
+TAILLE_MORCEAU_CORPUS = 1 << 22
 
+# Ordre maximal des n-grammes comptés par défaut
+ORDRE_MODELE = 4
+
+
+def _compte_morceau(tache):
+    """
+    Normalise et compte un morceau de corpus. Exécutée dans les processus de compte_corpus().
+    Args:
+        tache (tuple): Les dernières lettres (au plus ordre - 1) qui précèdent
+        le morceau dans son fichier, le texte du morceau et l'ordre maximal
+    Returns:
+        list: Pour chaque ordre n de 1 à l'ordre maximal, le nombre d'occurrences
+        de chaque n-gramme qui finit dans le morceau, par indice
+    """
+    recouvrement, texte, ordre = tache
+    lettres = normalise_texte(texte)
+    # Les n-grammes à cheval sur deux morceaux sont comptés avec le second :
+    # on y ajoute les n - 1 lettres qui précèdent, sans recompter les autres
+    return [_compte_ngrammes_indices(recouvrement[len(recouvrement) - min(n - 1, len(recouvrement)):] + lettres, n)
+            for n in range(1, ordre + 1)]
+
+
+def _morceaux_corpus(fichiers, ordre, taille_morceau):
+    """
+    Lit les fichiers d'un corpus par morceaux de taille_morceau caractères.
+    Renvoie (générateur) les tâches de _compte_morceau() : le recouvrement
+    d'un morceau est calculé en normalisant la fin du morceau précédent du
+    même fichier, et les n-grammes ne passent pas d'un fichier à l'autre.
+    """
+    for fichier in fichiers:
+        recouvrement = b""
+        with open(fichier, encoding="utf-8", errors="replace") as f:
+            while True:
+                texte = f.read(taille_morceau)
+                if not texte:
+                    break
+                yield recouvrement, texte, ordre
+                if ordre > 1:
+                    fin = normalise_texte(texte[-64:])
+                    if len(fin) < ordre - 1:
+                        fin = recouvrement + normalise_texte(texte)
+                    recouvrement = fin[len(fin) - min(ordre - 1, len(fin)):]
+
+
+def compte_corpus(fichiers, ordre=ORDRE_MODELE, processus=None, taille_morceau=TAILLE_MORCEAU_CORPUS):
+    """
+    Compte les lettres et les n-grammes d'un corpus de textes de n'importe
+    quelle taille, normalisés à l'alphabet (voir normalise_texte()).
+    Les morceaux du corpus sont comptés en parallèle par un groupe de
+    processus ; au plus deux morceaux par processus sont en attente, donc la
+    mémoire utilisée ne dépend pas de la taille du corpus.
+    Args:
+        fichiers (list): Les fichiers texte (UTF-8) du corpus
+        ordre (int): L'ordre maximal des n-grammes comptés
+        processus (int): Le nombre de processus (par défaut, le nombre de coeurs)
+        taille_morceau (int): Le nombre de caractères lus par morceau
+    Returns:
+        (list, list): La fréquence de chaque lettre, dans le format de freq_FR,
+        et les comptes des n-grammes, au format attendu par ecrire_modele_langue()
+    """
+    if processus is None:
+        processus = os.cpu_count() or 1
+    comptes = [[0] * len(alphabet) ** n for n in range(1, ordre + 1)]
+
+    def ajoute(resultat):
+        for total, morceau in zip(comptes, resultat):
+            for indice, compte in morceau.items():
+                total[indice] += compte
+
+    taches = _morceaux_corpus(fichiers, ordre, taille_morceau)
+    with ProcessPoolExecutor(max_workers=processus) as executor:
+        en_cours = set()
+        for tache in taches:
+            if len(en_cours) >= 2 * processus:
+                faits, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                for futur in faits:
+                    ajoute(futur.result())
+            en_cours.add(executor.submit(_compte_morceau, tache))
+        for futur in en_cours:
+            ajoute(futur.result())
+
+    lettres = sum(comptes[0])
+    if lettres == 0:
+        raise ValueError("Le corpus ne contient aucune lettre")
+    return [c / lettres for c in comptes[0]], comptes
+
+
+def entraine_modele_langue(fichiers, fichier_modele, nom, ordre=ORDRE_MODELE, processus=None,
+                           taille_morceau=TAILLE_MORCEAU_CORPUS):
+    """
+    Construit un modèle de langue à partir d'un corpus (voir compte_corpus())
+    et l'écrit dans un fichier. Placé dans le dossier langues/ sous le nom
+    <code>.vlm, il est aussitôt utilisable par toute la cryptanalyse.
+    Args:
+        fichiers (list): Les fichiers texte (UTF-8) du corpus
+        fichier_modele (str): Le fichier du modèle à écrire
+        nom (str): Le nom de la langue
+        ordre (int): L'ordre maximal des n-grammes comptés
+        processus (int): Le nombre de processus (par défaut, le nombre de coeurs)
+        taille_morceau (int): Le nombre de caractères lus par morceau
+    Returns:
+        int: Le nombre de lettres du corpus
+    """
+    frequences, comptes = compte_corpus(fichiers, ordre, processus, taille_morceau)
+    # Le fichier est remplacé d'un coup : un ancien modèle projeté en mémoire reste
+    # lisible, et il est relu au prochain appel à modele_langue()
+    ecrire_modele_langue(fichier_modele + ".tmp", nom, frequences, comptes)
+    os.replace(fichier_modele + ".tmp", fichier_modele)
+    _MODELES.pop(os.path.splitext(os.path.basename(fichier_modele))[0], None)
+    return sum(comptes[0])
+
+
+# Modèles déjà chargés, par code de langue
+_MODELES = {}
+
+
+def langues_disponibles():
+    """
+    Renvoie les codes des langues dont le modèle est dans DOSSIER_LANGUES.
+    Ajouter une langue revient à y déposer un fichier <code>.vlm.
+    Returns:
+        list: Les codes des langues, triés
+    """
+    if not os.path.isdir(DOSSIER_LANGUES):
+        return []
+    return sorted(nom[:-len(EXTENSION_MODELE)] for nom in os.listdir(DOSSIER_LANGUES)
+                  if nom.endswith(EXTENSION_MODELE))
+
+
+def modele_langue(code):
+    """
+    Renvoie le modèle d'une langue, chargé une seule fois par processus.
+    Args:
+        code (str): Le code de la langue (voir langues_disponibles())
+    Returns:
+        ModeleLangue: Le modèle de la langue
+    """
+    if code not in _MODELES:
+        _MODELES[code] = ModeleLangue(os.path.join(DOSSIER_LANGUES, code + EXTENSION_MODELE))
+    return _MODELES[code]
+
+
+def frequences_langue(freqs):
+    """
+    Renvoie une table de fréquences des lettres.
+    Args:
+        freqs: Une table de fréquences, le code d'une langue, ou None pour le français
+    Returns:
+        list: La table de fréquences
+    """
+    if freqs is None:
+        return freq_FR
+    if isinstance(freqs, str):
+        return modele_langue(freqs).frequences
+    return freqs
+
+
+################################################################
+
+
+### Examen de Kasiski : les répétitions d'un même n-gramme dans le
+### texte chiffré sont le plus souvent espacées d'un multiple de la
+### longueur de la clé.
+
+def index_kasiski(cipher, taille_ngramme=2):
+    """
+    Indexe les répétitions des n-grammes d'un texte en un seul parcours.
+    Chaque n-gramme est cherché dans une table de hachage qui garde sa
+    dernière position ; à chaque répétition, la distance à l'occurrence
+    précédente est comptée.
+    Args:
+        cipher (str): Le texte chiffré
+        taille_ngramme (int): La longueur des n-grammes
+    Returns:
+        list: par_distance[d] est le nombre de répétitions à la distance d
+    """
+    par_distance = [0] * (len(cipher) + 1)
+    derniere = {}
+    for position in range(len(cipher) - taille_ngramme + 1):
+        ngramme = cipher[position:position + taille_ngramme]
+        precedente = derniere.get(ngramme)
+        if precedente is not None:
+            par_distance[position - precedente] += 1
+        derniere[ngramme] = position
+    return par_distance
+
+
+def longueurs_kasiski(cipher, max_key_length=26, nb_candidats=5, taille_ngramme=2):
+    """
+    Classe les longueurs de clé de 2 à max_key_length par l'examen de Kasiski.
+    Pour une longueur k, on compte les distances entre répétitions divisibles
+    par k, moins le nombre attendu si les répétitions étaient dues au hasard
+    (une sur k). Ce score est le plus grand pour la vraie longueur : ses
+    multiples ne gardent qu'une partie des répétitions, et ses diviseurs
+    ont une part attendue plus grande.
+    Args:
+        cipher (str): Le texte chiffré
+        max_key_length (int): La plus grande longueur de clé cherchée
+        nb_candidats (int): Le nombre de longueurs renvoyées
+        taille_ngramme (int): La longueur des n-grammes répétés
+    Returns:
+        list: Les nb_candidats meilleures longueurs, de la plus probable à la moins probable
+        (vide si le texte n'a aucune répétition)
+    """
+    par_distance = index_kasiski(cipher, taille_ngramme)
+    total = sum(par_distance)
+    if total == 0:
+        return []
+    scores = {}
+    for key_length in range(2, min(max_key_length, len(cipher)) + 1):
+        scores[key_length] = sum(par_distance[key_length::key_length]) - total / key_length
+    return sorted(scores, key=lambda k: (-scores[k], k))[:nb_candidats]
+
+
+################################################################
+
+
+### Mot probable : un mot connu du texte clair (un en-tête, une
+### signature) donne, à chaque position où il peut se trouver, le
+### morceau de clé qui le chiffrerait. Aux bonnes positions, ce morceau
+### se répète avec la période de la clé.
+
+# Tables de soustraction : la lettre l devient l'indice de (l - d) mod 26
+_TABLES_SOUSTRACTION = [bytes.maketrans(_LETTRES, bytes((l - d) % len(alphabet) for l in range(len(alphabet))))
+                        for d in range(len(alphabet))]
+
+# Nombre minimal de lettres du mot qui doivent répéter la clé pour retenir une position
+MIN_CONTROLES = 5
+
+
+def _positions_mot(codes, mot, max_key_length, min_controles):
+    """
+    Fait le travail de positions_mot_probable() sur le texte et le mot en octets ASCII.
+    """
+    taille = len(mot)
+    nb = len(codes) - taille + 1
+    if nb <= 0:
+        return {}
+    indices = mot.translate(_VERS_CODES)
+    # La ligne j contient, pour toutes les positions p à la fois, le décalage
+    # qui chiffre la lettre j du mot placé en p ; en entier, une ligne se
+    # compare aux autres d'un seul XOR
+    lignes = [int.from_bytes(codes[j:j + nb].translate(_TABLES_SOUSTRACTION[indices[j]]), "big")
+              for j in range(taille)]
+    clefs = {}
+    for key_length in range(1, min(max_key_length, taille - min_controles) + 1):
+        # Octet nul aux positions où le morceau de clé a la période key_length
+        ecarts = 0
+        for j in range(taille - key_length):
+            ecarts |= lignes[j] ^ lignes[j + key_length]
+        for trouve in re.finditer(b"\x00", ecarts.to_bytes(nb, "big")):
+            position = trouve.start()
+            if position in clefs:
+                continue
+            morceau = [(codes[position + j] - _LETTRES[0] - indices[j]) % len(alphabet) for j in range(key_length)]
+            clefs[position] = [morceau[(i - position) % key_length] for i in range(key_length)]
+    return clefs
+
+
+def positions_mot_probable(cipher, mot, max_key_length=26, min_controles=MIN_CONTROLES):
+    """
+    Cherche les positions du texte chiffré où un mot probable du texte clair
+    peut se trouver, et la clé qu'il donne à chacune.
+    En position p, la lettre j du mot est chiffrée avec le décalage
+    cipher[p + j] - mot[j] : si le mot est vraiment là, ces décalages se
+    répètent avec la période de la clé. Tout le texte est traité en une
+    fois par position : le texte est traduit en décalages pour chaque lettre
+    du mot (bytes.translate()), et les lignes obtenues sont comparées deux à
+    deux par des XOR de grands entiers, puis les octets nuls sont cherchés
+    par re.finditer(). Le coût ne dépend que de la longueur du texte, de la
+    longueur du mot et de max_key_length.
+    Une longueur de clé k n'est vérifiée que si au moins min_controles lettres
+    du mot répètent la clé (k <= len(mot) - min_controles) : chaque contrôle
+    divise par 26 les chances qu'une position quelconque soit retenue.
+    Args:
+        cipher (str): Le texte chiffré
+        mot (str): Le mot probable
+        max_key_length (int): La plus grande longueur de clé cherchée
+        min_controles (int): Le nombre minimal de lettres du mot qui répètent la clé
+    Returns:
+        list: Les tuples (position, clé), par position croissante, la clé étant
+        la plus courte qui donne le mot à cette position
+    Raises:
+        ValueError: si le texte ou le mot contient un caractère hors de l'alphabet
+    """
+    if min_controles < 1:
+        raise ValueError("min_controles doit être au moins 1")
+    clefs = _positions_mot(_vers_octets(cipher), _vers_octets(mot.upper()), max_key_length, min_controles)
+    return sorted(clefs.items())
+
+
+def cryptanalyse_mots_probables(cipher, mots, max_key_length=26, min_controles=MIN_CONTROLES):
+    """
+    Cherche plusieurs mots probables dans un texte chiffré (voir
+    positions_mot_probable()) et déchiffre le texte avec chaque clé trouvée.
+    Le texte n'est converti qu'une fois pour tous les mots.
+    Args:
+        cipher (str): Le texte chiffré
+        mots (list): Les mots probables
+        max_key_length (int): La plus grande longueur de clé cherchée
+        min_controles (int): Le nombre minimal de lettres d'un mot qui répètent la clé
+    Returns:
+        list: Un tuple (clé, texte déchiffré, occurrences) par clé trouvée,
+        occurrences étant la liste des (mot, position) qui donnent cette clé ;
+        les clés données par le plus d'occurrences d'abord
+    """
+    if min_controles < 1:
+        raise ValueError("min_controles doit être au moins 1")
+    codes = _vers_octets(cipher)
+    occurrences = {}
+    for mot in mots:
+        for position, key in sorted(_positions_mot(codes, _vers_octets(mot.upper()), max_key_length,
+                                                   min_controles).items()):
+            occurrences.setdefault(tuple(key), []).append((mot, position))
+    clefs = sorted(occurrences, key=lambda key: -len(occurrences[key]))
+    return [(list(key), dechiffre_vigenere(cipher, list(key)), occurrences[key]) for key in clefs]
+
+
+################################################################
+
+
+### Les fonctions suivantes sont utiles uniquement
+### pour la cryptanalyse V4 : la clé de la V3 est affinée
+### en maximisant la vraisemblance des n-grammes du texte déchiffré.
+
+# Table de conversion des lettres (ASCII) vers leurs indices dans l'alphabet
+_VERS_CODES = bytes.maketrans(_LETTRES, bytes(range(len(alphabet))))
+
+# Nombre de lettres par colonne de la clé sur lesquelles se fait l'affinage
+FENETRE_AFFINAGE = 4000
+
+
+def affine_clef(cipher, key, langue="FR", ordre=None, max_tours=10, fenetre=FENETRE_AFFINAGE):
+    """
+    Affine une clé par montée de colline sur la vraisemblance des n-grammes.
+    Pour chaque lettre de la clé, on essaie les 26 décalages et on garde celui
+    qui maximise la somme des log-probabilités des n-grammes du texte déchiffré,
+    jusqu'à ce qu'un tour complet de la clé n'améliore plus rien.
+    Par défaut, on affine successivement avec les bigrammes, puis les trigrammes,
+    jusqu'à l'ordre maximal du modèle : les petits ordres, moins creux, évitent
+    de rester bloqué sur un optimum local des grands ordres.
+    Seules les fenetre * len(key) premières lettres du texte servent : quelques
+    milliers de lettres par colonne départagent largement les 26 décalages, et
+    le coût ne dépend plus de la longueur du texte. Chaque tour de la clé coûte
+    26 * ordre * fenetre * len(key) opérations, sur des tableaux plats de
+    quelques octets par lettre de la fenêtre.
+    Args:
+        cipher (str): Le texte chiffré
+        key (list): La clé de départ (par exemple celle de la V3)
+        langue (str): Le code de la langue (voir langues_disponibles())
+        ordre (int): L'ordre des n-grammes (par défaut, de 2 à l'ordre maximal du modèle)
+        max_tours (int): Le nombre maximal de tours de la clé, pour chaque ordre
+        fenetre (int): Le nombre de lettres par colonne utilisées (None : tout le texte)
+    Returns:
+        (float, list): La log-probabilité moyenne par n-gramme de la fenêtre déchiffrée
+        et la clé affinée
+    """
+    modele = modele_langue(langue)
+    ordres = range(2, modele.ordre + 1) if ordre is None else [ordre]
+    key = [d % len(alphabet) for d in key]
+    codes = _vers_octets(cipher)
+    if fenetre is not None:
+        codes = codes[:fenetre * len(key)]
+    codes = codes.translate(_VERS_CODES)
+    score = 0.0
+    for o in ordres:
+        score, key = _monte_colline(codes, key, modele.table(o), o, max_tours)
+    return score, key
+
+
+# _DECHIFFRES[d][c] est la lettre claire de la lettre chiffrée c avec le décalage d
+_DECHIFFRES = [[(c - d) % len(alphabet) for c in range(len(alphabet))] for d in range(len(alphabet))]
+# Les mêmes, en tables pour bytes.translate()
+_TABLES_DECHIFFRES = [bytes(clair) + bytes(256 - len(alphabet)) for clair in _DECHIFFRES]
+
+
+def _monte_colline(codes, key, table, ordre, max_tours):
+    """
+    Montée de colline de affine_clef() pour un ordre de n-grammes.
+    Changer la lettre i de la clé ne modifie que les n-grammes qui contiennent
+    une lettre de la colonne i : seuls ceux-là sont recalculés, à partir de
+    l'indice de chaque n-gramme dans la table, sans déchiffrer le texte.
+    Args:
+        codes (bytes): Le texte chiffré, en indices dans l'alphabet
+        key (list): La clé de départ, modifiée en place
+        table: La table des log10 des probabilités des n-grammes
+        ordre (int): L'ordre des n-grammes
+        max_tours (int): Le nombre maximal de tours de la clé
+    Returns:
+        (float, list): La log-probabilité moyenne par n-gramme et la clé affinée
+    """
+    n = len(alphabet)
+    key_length = len(key)
+    nb_ngrammes = len(codes) - ordre + 1
+    if nb_ngrammes <= 0:
+        return 0.0, key
+    poids = [n ** (ordre - 1 - o) for o in range(ordre)]
+    plain = bytearray(len(codes))
+    for colonne in range(key_length):
+        plain[colonne::key_length] = codes[colonne::key_length].translate(_TABLES_DECHIFFRES[key[colonne]])
+
+    # Indice dans la table de chaque n-gramme du texte déchiffré
+    indices = array("l", [sum([plain[w + o] * poids[o] for o in range(ordre)]) for w in range(nb_ngrammes)])
+
+    # Pour chaque colonne et chaque rang o dans les n-grammes, les n-grammes dont
+    # la lettre o est dans la colonne commencent tous les key_length lettres :
+    # on garde le premier, le poids du rang et leurs lettres chiffrées (bytes)
+    blocs = []
+    for colonne in range(key_length):
+        blocs.append([])
+        for o in range(ordre):
+            premiere = o + (colonne - o) % key_length
+            if premiere - o < nb_ngrammes:
+                blocs[-1].append((premiere - o, poids[o], codes[premiere:nb_ngrammes + o:key_length]))
+
+    # Si la clé est au moins aussi longue que les n-grammes, chaque n-gramme n'a
+    # qu'une lettre dans la colonne : les blocs sont mis bout à bout dans des
+    # tableaux plats (n-gramme, poids, lettre chiffrée). Sinon, chaque n-gramme
+    # touche toutes les colonnes, et tous les indices sont recalculés
+    simple = key_length >= ordre
+    if simple:
+        touches = []
+        for blocs_colonne in blocs:
+            ngrammes, facteurs, lettres = array("l"), array("l"), bytearray()
+            for premier, p, chiffrees in blocs_colonne:
+                ngrammes.extend(range(premier, nb_ngrammes, key_length))
+                facteurs.extend([p] * len(chiffrees))
+                lettres += chiffrees
+            touches.append((ngrammes, facteurs, lettres))
+
+    for tour in range(max_tours):
+        amelioree = False
+        for colonne in range(key_length):
+            ancien = _DECHIFFRES[key[colonne]]
+            if simple:
+                ngrammes, facteurs, lettres = touches[colonne]
+                # Indice de chaque n-gramme touché sans la lettre de la colonne
+                bases = [indices[w] - p * ancien[c] for w, p, c in zip(ngrammes, facteurs, lettres)]
+                meilleurs_indices = [indices[w] for w in ngrammes]
+            else:
+                bases = list(indices)
+                for premier, p, chiffrees in blocs[colonne]:
+                    bases[premier::key_length] = [b - p * ancien[c]
+                                                  for b, c in zip(bases[premier::key_length], chiffrees)]
+                meilleurs_indices = list(indices)
+
+            meilleur = key[colonne]
+            meilleur_score = sum(map(table.__getitem__, meilleurs_indices))
+            for decalage in range(n):
+                if decalage == key[colonne]:
+                    continue
+                clair = _DECHIFFRES[decalage]
+                if simple:
+                    candidats = [b + p * clair[c] for b, p, c in zip(bases, facteurs, lettres)]
+                else:
+                    candidats = list(bases)
+                    for premier, p, chiffrees in blocs[colonne]:
+                        candidats[premier::key_length] = [b + p * clair[c]
+                                                          for b, c in zip(candidats[premier::key_length], chiffrees)]
+                score = sum(map(table.__getitem__, candidats))
+                if score > meilleur_score:
+                    meilleur, meilleur_score, meilleurs_indices = decalage, score, candidats
+            if meilleur != key[colonne]:
+                key[colonne] = meilleur
+                amelioree = True
+                if simple:
+                    for w, i in zip(ngrammes, meilleurs_indices):
+                        indices[w] = i
+                else:
+                    indices = array("l", meilleurs_indices)
+        if not amelioree:
+            break
+
+    return sum(map(table.__getitem__, indices)) / nb_ngrammes, key
+
+
+# Cryptanalyse V4 : V3 puis affinage de la clé par les n-grammes
+def cryptanalyse_v4(cipher, langue="FR", max_key_length=26, selection=None, nb_candidats=5, mesures=None):
+    """
+    Renvoie le texte déchiffré.
+    La clé trouvée par la V3 est affinée par affine_clef() : la V3 choisit le
+    décalage de chaque colonne indépendamment, ce qui échoue sur les textes courts
+    quand quelques colonnes ont trop peu de lettres ; les n-grammes, eux, tiennent
+    compte des lettres voisines, qui appartiennent aux autres colonnes.
+
+    100/100 textes dechiffres : les 6 echecs de la V3 avaient la bonne longueur
+    de cle mais un a quatre decalages faux.
+    Args:
+        cipher (str): Le texte à dechiffrer
+        langue (str): Le code de la langue (voir langues_disponibles())
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): Le choix des longueurs évaluées (voir cryptanalyse_v3_clef())
+        nb_candidats (int): Le nombre de longueurs gardées par la sélection
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+    Returns:
+        str: Le texte déchiffré
+    """
+    key = cryptanalyse_v4_clef(cipher, langue, max_key_length, selection, nb_candidats, mesures)[1]
+    return _dechiffre_clef(cipher, key, mesures)
+
+
+def cryptanalyse_v4_clef(cipher, langue="FR", max_key_length=26, selection=None, nb_candidats=5, mesures=None,
+                         progression=None):
+    """
+    Renvoie la clé trouvée par la cryptanalyse V4 (voir cryptanalyse_v4()) et son score,
+    la log-probabilité moyenne par n-gramme du texte déchiffré.
+    Args:
+        cipher (str): Le texte chiffré
+        langue (str): Le code de la langue (voir langues_disponibles())
+        max_key_length (int): La plus grande longueur de clé cherchée
+        selection (str): Le choix des longueurs évaluées (voir cryptanalyse_v3_clef())
+        nb_candidats (int): Le nombre de longueurs gardées par la sélection
+        mesures (Mesures): L'instrumentation de la cryptanalyse (désactivée par défaut)
+        progression (function): La fonction de progression de la V3 (voir cryptanalyse_v3_clef())
+    Returns:
+        (float, list): Un tuple du score et de la clé (None si la V3 n'a pas trouvé de clé)
+    """
+    score, key = cryptanalyse_v3_clef(cipher, langue, max_key_length, selection, nb_candidats, mesures,
+                                      progression)
+    if key is None:
+        return score, key
+    if mesures is None:
+        return affine_clef(cipher, key, langue)
+    with mesures.etape("affinage"):
+        return affine_clef(cipher, key, langue)
+
+
+################################################################
+
+
+### Cryptanalyse d'un dossier entier de textes chiffrés,
+### répartie sur plusieurs processus.
+
+# Fonctions de recherche de clé, par version
+CLEFS_CRYPTANALYSE = {
+    1: cryptanalyse_v1_clef,
+    2: cryptanalyse_v2_clef,
+    3: cryptanalyse_v3_clef,
+    4: cryptanalyse_v4_clef,
+}
+
+
+def _cryptanalyse_fichier(tache):
+    """
+    Cryptanalyse un fichier et écrit le texte déchiffré dans le dossier de sortie.
+    Exécutée dans les processus de cryptanalyse_lot().
+    Args:
+        tache (tuple): Le fichier chiffré, la version et le dossier de sortie
+    Returns:
+        dict: Le fichier, la clé, le score, le chemin du texte déchiffré,
+        le nombre de caractères, la durée en secondes et l'erreur éventuelle.
+        Un fichier qui ne peut pas être cryptanalysé n'arrête pas le lot :
+        sa clé et son texte déchiffré restent vides et l'erreur est notée.
+    """
+    fichier, version, dossier_sortie = tache
+    debut = time.perf_counter()
+    resultat = {"fichier": fichier, "clef": None, "score": None, "clair": "", "caracteres": 0, "erreur": ""}
+    try:
+        cipher = read(fichier)
+        resultat["caracteres"] = len(cipher)
+        score, key = CLEFS_CRYPTANALYSE[version](cipher)
+        if key is None:
+            raise ValueError("Aucune clé n'a un score positif")
+        nom = os.path.splitext(os.path.basename(fichier))[0]
+        clair = os.path.join(dossier_sortie, nom + ".decrypted")
+        with open(clair, "w") as f:
+            f.write(dechiffre_vigenere(cipher, key) + "\n")
+        resultat.update(clef=key, score=score, clair=clair)
+    except (OSError, IndexError, ValueError) as e:
+        resultat["erreur"] = str(e)
+    resultat["duree"] = time.perf_counter() - debut
+    return resultat
+
+
+def cryptanalyse_lot(fichiers, version, dossier_sortie, processus=None, taille_paquet=None):
+    """
+    Cryptanalyse une liste de fichiers en les répartissant sur un groupe de processus.
+    Les fichiers sont envoyés aux processus par paquets de taille_paquet pour
+    limiter le coût des échanges entre processus.
+    Args:
+        fichiers (list): Les fichiers chiffrés
+        version (int): La version de la cryptanalyse (1, 2, 3 ou 4)
+        dossier_sortie (str): Le dossier où écrire les textes déchiffrés
+        processus (int): Le nombre de processus (par défaut, le nombre de coeurs)
+        taille_paquet (int): Le nombre de fichiers par envoi (par défaut, calculé
+        pour donner environ quatre paquets à chaque processus)
+    Returns:
+        list: Les résultats de _cryptanalyse_fichier(), dans l'ordre des fichiers
+    """
+    if processus is None:
+        processus = os.cpu_count() or 1
+    if taille_paquet is None:
+        taille_paquet = max(1, len(fichiers) // (4 * processus))
+    os.makedirs(dossier_sortie, exist_ok=True)
+    taches = [(fichier, version, dossier_sortie) for fichier in fichiers]
+    with ProcessPoolExecutor(max_workers=processus) as executor:
+        return list(executor.map(_cryptanalyse_fichier, taches, chunksize=taille_paquet))
+
+
+def ecrire_resultats_lot(resultats, fichier):
+    """
+    Ecrit les résultats de cryptanalyse_lot() dans un fichier, une ligne
+    par texte, colonnes séparées par des tabulations.
+    Args:
+        resultats (list): Les résultats de cryptanalyse_lot()
+        fichier (str): Le fichier à écrire
+    """
+    with open(fichier, "w") as f:
+        f.write("fichier\tclef\tscore\tclair\tduree\terreur\n")
+        for r in resultats:
+            clef = "" if r["clef"] is None else r["clef"]
+            score = "" if r["score"] is None else "%.6f" % r["score"]
+            f.write("%s\t%s\t%s\t%s\t%.6f\t%s\n" % (r["fichier"], clef, score, r["clair"], r["duree"], r["erreur"]))
+
+
+
+################################################################
+
+
+### Cache des résultats de cryptanalyse : les textes chiffrés déjà
+### cryptanalysés ne sont pas recalculés.
+
+# Dossier par défaut du cache sur disque
+DOSSIER_CACHE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                             "enervige")
+
+# Nombre de résultats gardés en mémoire par défaut
+TAILLE_CACHE = 1024
+
+# Version des résultats du cache, dans l'empreinte de chaque résultat :
+# à augmenter à chaque changement d'une cryptanalyse qui peut changer les
+# clés trouvées, pour que les anciens résultats sur disque ne servent plus
+VERSION_CACHE = 3
+
+
+class CacheCryptanalyse:
+    """
+    Cache des clés trouvées par la cryptanalyse, indexé par une empreinte
+    (SHA-256) du texte chiffré et des paramètres de l'analyse : version du
+    cache (VERSION_CACHE), version de la cryptanalyse, table de fréquences de
+    la langue, empreinte du modèle de langue (V4), longueur maximale de la
+    clé, sélection des longueurs. Seuls la clé et son score sont gardés, pas
+    le texte clair.
+    Le cache a deux niveaux : un LRU borné en mémoire, puis un fichier JSON
+    par résultat dans le dossier du cache (aucun cache sur disque si dossier
+    est None). Un résultat trouvé sur disque est remonté en mémoire.
+    Attributs:
+        taille (int): Le nombre maximal de résultats en mémoire
+        dossier (str): Le dossier du cache sur disque
+        succes_memoire (int): Le nombre de résultats trouvés en mémoire
+        succes_disque (int): Le nombre de résultats trouvés sur disque
+        echecs (int): Le nombre de résultats calculés
+    """
+
+    def __init__(self, taille=TAILLE_CACHE, dossier=None):
+        self.taille = taille
+        self.dossier = dossier
+        self.succes_memoire = 0
+        self.succes_disque = 0
+        self.echecs = 0
+        self._memoire = OrderedDict()
+
+    @staticmethod
+    def empreinte(cipher, parametres):
+        """
+        Renvoie l'empreinte d'un texte chiffré et des paramètres de son analyse.
+        Args:
+            cipher (str): Le texte chiffré
+            parametres (dict): Les paramètres de l'analyse (sérialisables en JSON)
+        Returns:
+            str: L'empreinte, en hexadécimal
+        """
+        h = hashlib.sha256(json.dumps(parametres, sort_keys=True).encode("utf-8"))
+        h.update(b"\0")
+        h.update(cipher.encode("utf-8"))
+        return h.hexdigest()
+
+    def _fichier(self, empreinte):
+        return os.path.join(self.dossier, empreinte[:2], empreinte + ".json")
+
+    def cherche(self, empreinte):
+        """
+        Renvoie le résultat d'une empreinte, (score, clé), ou None s'il n'est pas dans le cache.
+        La clé renvoyée est une copie, que l'appelant peut modifier.
+        """
+        if empreinte in self._memoire:
+            self._memoire.move_to_end(empreinte)
+            self.succes_memoire += 1
+            return self._copie(self._memoire[empreinte])
+        if self.dossier is not None:
+            try:
+                with open(self._fichier(empreinte)) as f:
+                    donnees = json.load(f)
+                resultat = (donnees["score"], donnees["clef"])
+            except (OSError, ValueError, KeyError):
+                return None
+            self.succes_disque += 1
+            self._garde(empreinte, resultat)
+            return self._copie(resultat)
+        return None
+
+    @staticmethod
+    def _copie(resultat):
+        score, key = resultat
+        return score, None if key is None else list(key)
+
+    def ajoute(self, empreinte, score, key):
+        """
+        Ajoute le résultat d'une empreinte aux deux niveaux du cache.
+        """
+        self._garde(empreinte, self._copie((score, key)))
+        if self.dossier is None:
+            return
+        fichier = self._fichier(empreinte)
+        try:
+            os.makedirs(os.path.dirname(fichier), exist_ok=True)
+            # Écriture dans un fichier temporaire puis renommage, pour qu'un
+            # autre processus ne lise jamais un fichier à moitié écrit
+            temporaire = fichier + "." + str(os.getpid())
+            with open(temporaire, "w") as f:
+                json.dump({"score": score, "clef": key}, f)
+            os.replace(temporaire, fichier)
+        except OSError:
+            # Un dossier de cache inaccessible ne doit pas empêcher la cryptanalyse
+            pass
+
+    def _garde(self, empreinte, resultat):
+        self._memoire[empreinte] = resultat
+        self._memoire.move_to_end(empreinte)
+        while len(self._memoire) > self.taille:
+            self._memoire.popitem(last=False)
+
+    def clef(self, cipher, version, langue=None, max_key_length=None, selection=None, nb_candidats=5,
+             mesures=None, progression=None):
+        """
+        Renvoie la clé trouvée par la cryptanalyse d'une version (voir
+        CLEFS_CRYPTANALYSE) et son score, en la calculant seulement si elle
+        n'est pas dans le cache.
+        Args:
+            cipher (str): Le texte chiffré
+            version (int): La version de la cryptanalyse (1, 2, 3 ou 4)
+            langue (str): Le code de la langue ou la table de fréquences (V3 et V4) ; par
+            défaut, freq_FR pour la V3 et le modèle "FR" pour la V4, seule version
+            qui a besoin d'un fichier du dossier langues/
+            max_key_length (int): La plus grande longueur de clé cherchée
+            (par défaut, celle de la version)
+            selection (str): Le choix des longueurs évaluées (V3 et V4, voir cryptanalyse_v3_clef())
+            nb_candidats (int): Le nombre de longueurs gardées par la sélection (V3 et V4)
+            mesures (Mesures): L'instrumentation de la cryptanalyse, si elle est calculée
+            progression (function): La fonction de progression (V3 et V4, voir cryptanalyse_v3_clef())
+        Returns:
+            (float, list): Un tuple du score et de la clé
+        """
+        if version in (1, 2):
+            max_key_length = max_key_length or 20
+            parametres = {"cache": VERSION_CACHE, "version": version, "max_key_length": max_key_length}
+        elif version in (3, 4):
+            max_key_length = max_key_length or 26
+            if version == 4 and langue is None:
+                langue = "FR"
+            parametres = {"cache": VERSION_CACHE, "version": version, "max_key_length": max_key_length,
+                          "langue": langue if isinstance(langue, str) else None,
+                          "freqs": frequences_langue(langue),
+                          "selection": selection, "nb_candidats": nb_candidats}
+            if version == 4:
+                # La V4 dépend aussi des tables de n-grammes du modèle
+                parametres["modele"] = modele_langue(langue).empreinte
+        else:
+            raise ValueError("Version inconnue : " + str(version))
+
+        empreinte = self.empreinte(cipher, parametres)
+        resultat = self.cherche(empreinte)
+        if resultat is not None:
+            return resultat
+        self.echecs += 1
+        if version in (1, 2):
+            score, key = CLEFS_CRYPTANALYSE[version](cipher, max_key_length, mesures)
+        else:
+            score, key = CLEFS_CRYPTANALYSE[version](cipher, langue, max_key_length, selection, nb_candidats,
+                                                     mesures, progression)
+        self.ajoute(empreinte, score, key)
+        return score, key
+
+    def statistiques(self):
+        """
+        Renvoie le nombre de résultats trouvés en mémoire et sur disque, le
+        nombre de résultats calculés, le taux de succès et le nombre de
+        résultats en mémoire.
+        """
+        succes = self.succes_memoire + self.succes_disque
+        total = succes + self.echecs
+        return {"succes_memoire": self.succes_memoire, "succes_disque": self.succes_disque,
+                "echecs": self.echecs, "taux_succes": succes / total if total else None,
+                "en_memoire": len(self._memoire)}
 
 
 ################################################################
@@ -547,27 +2855,112 @@ def read(fichier):
 
 
 # Execute la fonction cryptanalyse_vN où N est la version
-def cryptanalyse(fichier, version):
+def cryptanalyse(fichier, version, mesures=None, cache=None):
     cipher = read(fichier)
+    if cache is not None:
+        return _dechiffre_clef(cipher, cache.clef(cipher, version, mesures=mesures)[1], mesures)
     if version == 1:
-        return cryptanalyse_v1(cipher)
+        return cryptanalyse_v1(cipher, mesures=mesures)
     elif version == 2:
-        return cryptanalyse_v2(cipher)
+        return cryptanalyse_v2(cipher, mesures=mesures)
     elif version == 3:
-        return cryptanalyse_v3(cipher)
+        return cryptanalyse_v3(cipher, mesures=mesures)
+    elif version == 4:
+        return cryptanalyse_v4(cipher, mesures=mesures)
 
 
 def usage():
-    print("Usage: python3 cryptanalyse_vigenere.py -v <1,2,3> -f <FichierACryptanalyser>", file=sys.stderr)
+    print("Usage: python3 cryptanalyse_vigenere.py -v <1,2,3,4> -f <FichierACryptanalyser> [-m <Mesures.json>]"
+          " [-n]", file=sys.stderr)
+    print("       python3 cryptanalyse_vigenere.py -e -f <FichierACryptanalyser> [-m <Mesures.json>]", file=sys.stderr)
+    print("       python3 cryptanalyse_vigenere.py -v <1,2,3,4> -d <DossierACryptanalyser> -o <DossierDeSortie>"
+          " [-j <processus>] [-p <fichiers par paquet>]", file=sys.stderr)
+    print("       python3 cryptanalyse_vigenere.py -c|-x <Clef> -f <Fichier> -o <FichierDeSortie>", file=sys.stderr)
+    print("       python3 cryptanalyse_vigenere.py -k <NombreDeClefs> -f <FichierACryptanalyser>", file=sys.stderr)
+    print("       python3 cryptanalyse_vigenere.py -w <MotProbable> [-w <MotProbable> ...] -f <FichierACryptanalyser>",
+          file=sys.stderr)
     sys.exit(1)
 
 
+# Chiffre (signe = 1) ou déchiffre (signe = -1) un fichier par blocs
+def main_fichier(fichier, sortie, key, signe):
+    if signe == 1:
+        lettres = chiffre_vigenere_fichier(fichier, sortie, key)
+    else:
+        lettres = dechiffre_vigenere_fichier(fichier, sortie, key)
+    print(("Chiffrement" if signe == 1 else "Dechiffrement") + " de " + str(lettres)
+          + " lettres du fichier " + fichier + " dans " + sortie)
+
+
+# Affiche les meilleures clés de la V3 d'un fichier, avec leurs marges
+def main_candidats(fichier, nb):
+    print("Meilleures clefs du fichier " + fichier + " :")
+    print("%8s %8s  %s" % ("score", "marge", "clef"))
+    for score, key, marges in candidats_clefs(read(fichier), nb):
+        print("%8.4f %8.4f  %s" % (score, min(marges), "".join(alphabet[d] for d in key)))
+
+
+# Cherche des mots probables dans un fichier et le déchiffre avec la clé la plus souvent trouvée
+def main_mots_probables(fichier, mots):
+    resultats = cryptanalyse_mots_probables(read(fichier), mots)
+    if not resultats:
+        print("Aucun mot probable trouve dans le fichier " + fichier)
+        return
+    for key, texte, occurrences in resultats:
+        print("".join(alphabet[d] for d in key) + " : "
+              + ", ".join(mot + " en " + str(position) for mot, position in occurrences))
+    print(resultats[0][1])
+
+
+# Cryptanalyse V3 d'un très long fichier sur un échantillon
+def main_echantillon(fichier, fichier_mesures):
+    mesures = Mesures() if fichier_mesures != '' else None
+    cipher = read(fichier)
+    print("Cryptanalyse version 3 sur un echantillon du fichier " + fichier + " :")
+    with (mesures or SANS_MESURES).etape("total"):
+        score, key, confiance = cryptanalyse_v3_echantillon_clef(cipher, mesures=mesures)
+        print(_dechiffre_clef(cipher, key, mesures))
+    print("Confiance : %.6f" % confiance, file=sys.stderr)
+    if mesures is not None:
+        mesures.ecrire(fichier_mesures)
+
+
+# Cryptanalyse tous les fichiers .cipher d'un dossier
+def main_lot(dossier, version, dossier_sortie, processus, taille_paquet):
+    fichiers = sorted(os.path.join(dossier, nom) for nom in os.listdir(dossier) if nom.endswith(".cipher"))
+    debut = time.perf_counter()
+    resultats = cryptanalyse_lot(fichiers, version, dossier_sortie, processus, taille_paquet)
+    duree = time.perf_counter() - debut
+    ecrire_resultats_lot(resultats, os.path.join(dossier_sortie, "resultats.tsv"))
+
+    caracteres = sum(r["caracteres"] for r in resultats)
+    erreurs = sum(1 for r in resultats if r["erreur"])
+    print("Cryptanalyse version " + str(version) + " de " + str(len(resultats)) + " fichiers du dossier "
+          + dossier + " en %.2f s" % duree)
+    if erreurs:
+        print(str(erreurs) + " fichiers n'ont pas pu etre cryptanalyses")
+    if duree > 0:
+        print("Debit : %.1f fichiers/s, %.0f caracteres/s" % (len(resultats) / duree, caracteres / duree))
+    print("Resultats : " + os.path.join(dossier_sortie, "resultats.tsv"))
+
+
 def main(argv):
     size = -1
     version = 0
     fichier = ''
+    dossier = ''
+    dossier_sortie = ''
+    processus = None
+    taille_paquet = None
+    key = None
+    signe = 0
+    fichier_mesures = ''
+    sans_cache = False
+    nb_clefs = 0
+    mots = []
+    echantillon = False
     try:
-        opts, args = getopt.getopt(argv, "hv:f:")
+        opts, args = getopt.getopt(argv, "hv:f:d:o:j:p:c:x:m:nk:w:e")
     except getopt.GetoptError:
         usage()
     for opt, arg in opts:
@@ -577,13 +2970,70 @@ def main(argv):
             version = int(arg)
         elif opt in ("-f"):
             fichier = arg
-    if fichier == '':
+        elif opt in ("-d"):
+            dossier = arg
+        elif opt in ("-o"):
+            dossier_sortie = arg
+        elif opt in ("-j"):
+            processus = int(arg)
+        elif opt in ("-p"):
+            taille_paquet = int(arg)
+        elif opt in ("-c", "-x"):
+            key = clef_depuis_texte(arg)
+            signe = 1 if opt == "-c" else -1
+        elif opt in ("-m"):
+            fichier_mesures = arg
+        elif opt in ("-n"):
+            sans_cache = True
+        elif opt in ("-k"):
+            nb_clefs = int(arg)
+        elif opt in ("-w"):
+            mots.append(arg)
+        elif opt in ("-e"):
+            echantillon = True
+    if key is not None:
+        if fichier == '' or dossier_sortie == '':
+            usage()
+        main_fichier(fichier, dossier_sortie, key, signe)
+        return
+    if nb_clefs > 0:
+        if fichier == '':
+            usage()
+        main_candidats(fichier, nb_clefs)
+        return
+    if mots:
+        if fichier == '':
+            usage()
+        main_mots_probables(fichier, mots)
+        return
+    if echantillon:
+        if fichier == '':
+            usage()
+        main_echantillon(fichier, fichier_mesures)
+        return
+    if version not in CLEFS_CRYPTANALYSE:
         usage()
-    if not (version == 1 or version == 2 or version == 3):
+    if dossier != '':
+        if dossier_sortie == '':
+            usage()
+        main_lot(dossier, version, dossier_sortie, processus, taille_paquet)
+        return
+    if fichier == '':
         usage()
 
     print("Cryptanalyse version " + str(version) + " du fichier " + fichier + " :")
-    print(cryptanalyse(fichier, version))
+    if fichier_mesures == '':
+        # Les mesures doivent porter sur une vraie cryptanalyse : le cache n'est
+        # utilisé que sans -m
+        cache = None if sans_cache else CacheCryptanalyse(dossier=DOSSIER_CACHE)
+        print(cryptanalyse(fichier, version, cache=cache))
+        if cache is not None:
+            print("Cache : " + str(cache.statistiques()), file=sys.stderr)
+        return
+    mesures = Mesures()
+    with mesures.etape("total"):
+        print(cryptanalyse(fichier, version, mesures))
+    mesures.ecrire(fichier_mesures)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+import queue
+import threading
 import tkinter as tk
 import traceback
 from tkinter import messagebox
@@ -17,7 +19,7 @@ class CryptanalysisApp:
         self.root.title("Enervige- A Cryptanalysis Tool.")
         self.root.geometry("1000x1000")
 
-        self.text_label = tk.Label(root, text="Enter Plain/Ciphertext. Only Letters and Spaces are accepted.\n:")
+        self.text_label = tk.Label(root, text="Enter Plain/Ciphertext. Letters are encrypted, other characters are kept as they are.\n:")
         self.text_label.grid(row=0, column=0, columnspan=2, pady=5)
 
         self.input_text = tk.Text(root, height=5, width=40)
@@ -59,6 +61,14 @@ class CryptanalysisApp:
         self.vigenere_radio = tk.Radiobutton(root, text="Vigenère", variable=self.method_var, value="vigenere")
         self.vigenere_radio.grid(row=6, column=1)
 
+        # Alphabet used by César and Vigenère; cryptanalysis always works on A-Z
+        self.alphabets = {"A-Z": cryptanalyse_vigenere.ALPHABET_LATIN,
+                          "French accents": cryptanalyse_vigenere.ALPHABET_FRANCAIS,
+                          "A-Z and digits": cryptanalyse_vigenere.ALPHABET_ALPHANUMERIQUE}
+        self.alphabet_var = tk.StringVar(value="A-Z")
+        self.alphabet_menu = tk.OptionMenu(root, self.alphabet_var, *self.alphabets)
+        self.alphabet_menu.grid(row=6, column=2)
+
         self.cryptanalyse_radio = tk.Radiobutton(root, text="Cryptanalysis", variable=self.method_var,
                                                  value="cryptanalyse")
         self.cryptanalyse_radio.grid(row=7, column=0, columnspan=2)
@@ -67,12 +77,26 @@ class CryptanalysisApp:
         self.language_label = tk.Label(root, text="Choose Language (for Cryptanalysis):")
         self.language_label.grid(row=8, column=0, columnspan=2, pady=5)
 
-        self.language_var = tk.StringVar(value="English")  # Default to English
-        self.english_radio = tk.Radiobutton(root, text="English", variable=self.language_var, value="English")
-        self.english_radio.grid(row=9, column=0)
-
-        self.french_radio = tk.Radiobutton(root, text="French", variable=self.language_var, value="French")
-        self.french_radio.grid(row=9, column=1)
+        # One radio button per language model found in the langues/ directory
+        languages = cryptanalyse_vigenere.langues_disponibles()
+        self.language_radios = []
+        if not languages:
+            # No model file: only the built-in French frequency table (freq_FR) is available
+            self.language_var = tk.StringVar(value="")
+            radio = tk.Radiobutton(root, text="French (built-in)", variable=self.language_var, value="")
+            radio.grid(row=9, column=0)
+            self.language_radios.append(radio)
+        else:
+            self.language_var = tk.StringVar(value="EN" if "EN" in languages else languages[0])  # Default to English
+            for index, code in enumerate(languages):
+                radio = tk.Radiobutton(root, text=cryptanalyse_vigenere.modele_langue(code).nom,
+                                       variable=self.language_var, value=code)
+                radio.grid(row=9, column=index)
+                self.language_radios.append(radio)
+            # "Auto" detects the language along with the key
+            radio = tk.Radiobutton(root, text="Auto", variable=self.language_var, value="auto")
+            radio.grid(row=9, column=len(languages))
+            self.language_radios.append(radio)
 
         # Decryption Button
         self.decrypt_button = tk.Button(root, text="Decrypt", command= lambda: self.decrypt_text(root))
@@ -82,6 +106,10 @@ class CryptanalysisApp:
         self.encrypt_button = tk.Button(root, text="Encrypt", command=self.encrypt_text)
         self.encrypt_button.grid(row=10, column=1, pady=20)
 
+        # Cancel Button, enabled while a task runs in the background
+        self.cancel_button = tk.Button(root, text="Cancel", command=self.cancel_task, state="disabled")
+        self.cancel_button.grid(row=10, column=2, pady=20)
+
         # Decrypted Text Output Section
         self.result_label = tk.Label(root, text="Processed Text:")
         self.result_label.grid(row=11, column=0, columnspan=2, pady=5)
@@ -92,16 +120,89 @@ class CryptanalysisApp:
         self.waiting_label = tk.Label(root, text="")
         self.waiting_label.grid(row=10, column=3, columnspan=2, pady=5)
 
+        # Keys already found are not searched again, even across sessions
+        self.cache = cryptanalyse_vigenere.CacheCryptanalyse(dossier=cryptanalyse_vigenere.DOSSIER_CACHE)
+
+        # Background worker: it only talks to Tk through this queue,
+        # which poll_worker() empties on the main loop
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.worker_messages = queue.Queue()
+
+    def run_in_background(self, task, title):
+        """Runs task() in a worker thread. task returns (text to display, status message)."""
+        if self.worker is not None:
+            return
+        self.cancel_event.clear()
+        self.decrypt_button.config(state="disabled")
+        self.encrypt_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.waiting_label.config(text=title)
+
+        def work():
+            try:
+                self.worker_messages.put(("done", task()))
+            except cryptanalyse_vigenere.AnalyseInterrompue:
+                self.worker_messages.put(("cancelled", None))
+            except Exception as e:
+                print("An error occurred in the background task:")
+                print(traceback.format_exc())  # Detailed traceback to console
+                self.worker_messages.put(("error", e))
+
+        self.worker = threading.Thread(target=work, daemon=True)
+        self.worker.start()
+        self.root.after(50, self.poll_worker)
+
+    def report_progress(self, stage, done, total):
+        """Progress callback of the cryptanalysis, called from the worker thread."""
+        if self.cancel_event.is_set():
+            raise cryptanalyse_vigenere.AnalyseInterrompue()
+        self.worker_messages.put(("progress", (stage, done, total)))
+
+    def poll_worker(self):
+        while True:
+            try:
+                kind, value = self.worker_messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                stage, done, total = value
+                if stage == "histogrammes":
+                    self.waiting_label.config(text=f"Counting letters: {done}/{total}")
+                else:
+                    self.waiting_label.config(text=f"Key lengths tried: {done}/{total}")
+                continue
+            self.worker = None
+            self.decrypt_button.config(state="normal")
+            self.encrypt_button.config(state="normal")
+            self.cancel_button.config(state="disabled")
+            if kind == "done":
+                processed_text, status = value
+                self.result_text.delete("1.0", "end")
+                self.result_text.insert("1.0", processed_text)
+                self.waiting_label.config(text=status)
+            elif kind == "cancelled":
+                self.waiting_label.config(text="Cancelled")
+            else:
+                self.waiting_label.config(text="")
+                messagebox.showerror("Error", f"Error: {value}")
+            return
+        self.root.after(50, self.poll_worker)
+
+    def cancel_task(self):
+        # The search stops at the next key length
+        self.cancel_event.set()
+        self.waiting_label.config(text="Cancelling...")
+
 
 
     def decrypt_text(self, root):
         # Get user input
-        ciphertext = self.input_text.get("1.0", "end-1c").strip().upper()
-        ciphertext = ciphertext.replace(" ", "")
-        decrypted_text = ""
+        ciphertext = self.input_text.get("1.0", "end-1c").upper()
         key = self.key_entry.get().strip()
         method = self.method_var.get()
         language = self.language_var.get()
+        alphabet = self.alphabets[self.alphabet_var.get()]
 
         # Debug: Print input values
         print(f"decrypt_text - Ciphertext: {ciphertext}, Key: {key}, Method: {method}")
@@ -113,30 +214,39 @@ class CryptanalysisApp:
                     print("Key is not digit")
                     raise ValueError("Key must be an integer for César cipher.")
                 key = int(key)
-                decrypted_text = cryptanalyse_vigenere.dechiffre_cesar(ciphertext, key)
-                print(f"Decrypted Text: {decrypted_text}")
+                self.run_in_background(
+                    lambda: (cryptanalyse_vigenere.dechiffre_cesar(ciphertext, key, alphabet, True), "Done"), "Decrypting...")
             elif method == "vigenere":
                 if not key.isalpha():
                     raise ValueError("Key must be alphabetic for Vigenère cipher.")
                 positions = self.KeyToArray(key)
 
-                decrypted_text = cryptanalyse_vigenere.dechiffre_vigenere(ciphertext, positions)
+                self.run_in_background(
+                    lambda: (cryptanalyse_vigenere.dechiffre_vigenere(ciphertext, positions, alphabet, True), "Done"), "Decrypting...")
 
             elif method == "cryptanalyse":
-
-                if language == "French":
-                    decrypted_text += cryptanalyse_vigenere.cryptanalyse_v3(ciphertext)
-                elif language == "English":
-                    decrypted_text += cryptanalyse_vigenere.cryptanalyse_v3_anglais(ciphertext)
-
+                def cryptanalysis():
+                    # Only the letters are analysed, spaces and punctuation are kept in the result
+                    letters = cryptanalyse_vigenere.ALPHABET_LATIN.lettres_de(ciphertext)
+                    if language == "auto":
+                        detected, score, key = cryptanalyse_vigenere.cryptanalyse_langues(
+                            letters, progression=self.report_progress)
+                        status = f"Detected language: {detected}"
+                    else:
+                        freqs = language or cryptanalyse_vigenere.freq_FR
+                        score, key = self.cache.clef(letters, 3, freqs, progression=self.report_progress)
+                        stats = self.cache.statistiques()
+                        hits = stats["succes_memoire"] + stats["succes_disque"]
+                        status = f"Done (cache: {hits} hits, {stats['echecs']} misses)"
+                    if key is None:
+                        raise ValueError("We could not figure this one out!")
+                    return cryptanalyse_vigenere.dechiffre_vigenere(ciphertext, key, conserve=True), status
+
+                self.run_in_background(cryptanalysis, "Analysing...")
 
             else:
                 raise ValueError("We could not figure this one out!")
 
-            # Display decrypted text
-            self.result_text.delete("1.0", "end")
-            self.result_text.insert("1.0", decrypted_text)
-
         except Exception as e:
             messagebox.showerror("Error", f"Error: {e}")
             print("An error occurred during decryption:")
@@ -154,10 +264,10 @@ class CryptanalysisApp:
 
     def encrypt_text(self):
         # Get user input
-        cleartext = self.input_text.get("1.0", "end-1c").strip().upper()
-        cleartext = cleartext.replace(" ", "")
+        cleartext = self.input_text.get("1.0", "end-1c").upper()
         key = self.key_entry.get().strip()
         method = self.method_var.get()
+        alphabet = self.alphabets[self.alphabet_var.get()]
 
         # Debug: Print input values
         print(f"encrypt_text - Cleartext: {cleartext}, Key: {key}, Method: {method}")
@@ -168,22 +278,19 @@ class CryptanalysisApp:
                 if not key.isdigit():
                     raise ValueError("Key must be an integer for César cipher.")
                 key = int(key)
-                encrypted_text = cryptanalyse_vigenere.chiffre_cesar(cleartext, key)
-                print(f"Encrypted Text: {encrypted_text}")
+                self.run_in_background(
+                    lambda: (cryptanalyse_vigenere.chiffre_cesar(cleartext, key, alphabet, True), "Done"), "Encrypting...")
 
             elif method == "vigenere":
                 if not key.isalpha():
                     raise ValueError("Key must be alphabetic for Vigenère cipher.")
                 positions = self.KeyToArray(key)
-                encrypted_text = cryptanalyse_vigenere.chiffre_vigenere(cleartext, positions)
+                self.run_in_background(
+                    lambda: (cryptanalyse_vigenere.chiffre_vigenere(cleartext, positions, alphabet, True), "Done"), "Encrypting...")
 
             else:
                 raise ValueError("Error encountered while encrypting")
 
-            # Display encrypted text
-            self.result_text.delete("1.0", "end")
-            self.result_text.insert("1.0", encrypted_text)
-
         except Exception as e:
             messagebox.showerror("Error", f"Error: {e}")
             print("An error occurred during encryption:")
@@ -0,0 +1,57 @@
+import sys, getopt, os, time
+
+from cryptanalyse_vigenere import (entraine_modele_langue, DOSSIER_LANGUES, EXTENSION_MODELE, ORDRE_MODELE,
+                                   TAILLE_MORCEAU_CORPUS)
+
+# Construit le modèle d'une langue (fréquences des lettres et tables de
+# n-grammes) à partir d'un corpus de fichiers texte de n'importe quelle
+# taille, et l'écrit dans langues/<code>.vlm, où toute la cryptanalyse le
+# trouve (voir entraine_modele_langue()).
+
+
+def usage():
+    print("Usage: python3 entraine_langue.py -c <code> -n <nom> [-r <ordre>] [-j <processus>]"
+          " [-t <caracteres par morceau>] [-o <fichier.vlm>] <corpus> [<corpus> ...]", file=sys.stderr)
+    sys.exit(1)
+
+
+def main(argv):
+    code = ''
+    nom = ''
+    ordre = ORDRE_MODELE
+    processus = None
+    taille_morceau = TAILLE_MORCEAU_CORPUS
+    sortie = ''
+    try:
+        opts, args = getopt.getopt(argv, "hc:n:r:j:t:o:")
+    except getopt.GetoptError:
+        usage()
+    for opt, arg in opts:
+        if opt == '-h':
+            usage()
+        elif opt == '-c':
+            code = arg
+        elif opt == '-n':
+            nom = arg
+        elif opt == '-r':
+            ordre = int(arg)
+        elif opt == '-j':
+            processus = int(arg)
+        elif opt == '-t':
+            taille_morceau = int(arg)
+        elif opt == '-o':
+            sortie = arg
+    if (code == '' and sortie == '') or nom == '' or not args:
+        usage()
+    if sortie == '':
+        sortie = os.path.join(DOSSIER_LANGUES, code + EXTENSION_MODELE)
+
+    debut = time.perf_counter()
+    lettres = entraine_modele_langue(args, sortie, nom, ordre, processus, taille_morceau)
+    duree = time.perf_counter() - debut
+    print("Modele " + nom + " (n-grammes jusqu'a l'ordre " + str(ordre) + ") ecrit dans " + sortie)
+    print(str(lettres) + " lettres comptees en %.2f s" % duree)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,424 @@
+import sys, getopt, json, time, asyncio, os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptanalyse_vigenere import (chiffre_vigenere, chiffre_vigenere_lot, dechiffre_vigenere,
+                                   dechiffre_vigenere_lot, clef_depuis_texte, cryptanalyse_langues, langues_disponibles, modele_langue,
+                                   ALPHABET_LATIN, CLEFS_CRYPTANALYSE)
+
+# Service local de chiffrement et de cryptanalyse.
+# Les requêtes HTTP (POST /chiffre, /dechiffre, /cryptanalyse avec un corps
+# JSON, GET /mesures) sont mises en file ; les requêtes arrivées à quelques
+# millisecondes d'intervalle sont regroupées en lots, et chaque lot est traité
+# en un seul appel par un groupe de processus déjà chargés.
+
+PORT = 8765
+
+# Un lot part dès qu'il a TAILLE_LOT requêtes, ou DELAI_LOT secondes après sa première requête
+TAILLE_LOT = 32
+DELAI_LOT = 0.005
+
+# Au-delà de MAX_ATTENTE requêtes en cours, les nouvelles requêtes
+# sont refusées (503) au lieu d'allonger la file
+MAX_ATTENTE = 256
+
+# Taille maximale du corps d'une requête, en octets
+TAILLE_MAX = 16 * 1024 * 1024
+
+# Nombre de latences gardées pour les percentiles de /mesures
+NB_LATENCES = 10000
+
+# Lettres acceptées dans le texte d'un chiffrement ou d'un déchiffrement
+_LETTRES = ALPHABET_LATIN.lettres.encode("ascii")
+
+_MESSAGES_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class RequeteInvalide(Exception):
+    """
+    Erreur HTTP renvoyée au client, avec son statut.
+    """
+
+    def __init__(self, statut, message):
+        super().__init__(message)
+        self.statut = statut
+
+
+def _clef(parametres):
+    """
+    Renvoie la clé d'une requête, donnée en lettres, en décalages séparés
+    par des virgules (voir clef_depuis_texte()) ou en liste de décalages.
+    """
+    clef = parametres.get("clef")
+    if isinstance(clef, str):
+        clef = clef_depuis_texte(clef)
+    elif not (isinstance(clef, list) and all(isinstance(d, int) for d in clef)):
+        raise ValueError("La clé doit être une chaîne ou une liste d'entiers")
+    if not clef:
+        raise ValueError("La clé est vide")
+    return clef
+
+
+def _verifie_texte(texte):
+    """
+    Vérifie que le texte d'un chiffrement ou d'un déchiffrement ne contient que
+    des lettres de l'alphabet, avant de le mettre avec les autres textes du lot.
+    """
+    if not texte.isascii() or texte.encode("ascii").translate(None, _LETTRES):
+        raise ValueError("Le texte contient des caractères hors de l'alphabet")
+
+
+def _cryptanalyse(parametres):
+    """
+    Cryptanalyse le texte d'une requête avec la version et la langue demandées
+    (V3 par défaut ; sans langue, la table freq_FR en V3 et le modèle "FR" en V4 ;
+    "auto" pour détecter la langue, en V3 seulement). La langue doit être l'une
+    de langues_disponibles() : elle ne sert jamais de chemin de fichier.
+    """
+    texte = parametres["texte"]
+    version = parametres.get("version", 3)
+    langue = parametres.get("langue")
+    # type() et non isinstance() : True ne doit pas passer pour la version 1
+    if type(version) is not int or version not in CLEFS_CRYPTANALYSE:
+        raise ValueError("Version inconnue : " + str(version))
+    if langue is None and version == 4:
+        langue = "FR"
+    if langue == "auto":
+        if version != 3:
+            raise ValueError("La langue \"auto\" n'existe qu'en version 3")
+    elif langue is not None and langue not in langues_disponibles():
+        raise ValueError("Langue inconnue : " + str(langue))
+    resultat = {"version": version}
+    if langue == "auto":
+        resultat["langue"], score, key = cryptanalyse_langues(texte)
+    elif version in (3, 4):
+        score, key = CLEFS_CRYPTANALYSE[version](texte, langue)
+    else:
+        score, key = CLEFS_CRYPTANALYSE[version](texte)
+    if key is None:
+        raise ValueError("Aucune clé n'a un score positif")
+    resultat.update(clef=key, score=score, texte=dechiffre_vigenere(texte, key))
+    return resultat
+
+
+# Opérations faites en un seul appel pour les textes courts et valides d'un lot,
+# avec la fonction qui traite un texte long seul
+OPERATIONS_LOT = {"chiffre": (chiffre_vigenere_lot, chiffre_vigenere),
+                  "dechiffre": (dechiffre_vigenere_lot, dechiffre_vigenere)}
+
+# Au-delà de cette longueur, un texte est plus vite chiffré seul, colonne par
+# colonne, qu'avec les autres textes du lot
+TAILLE_MAX_GROUPE = 256
+
+# Opérations faites requête par requête
+OPERATIONS_REQUETE = {"cryptanalyse": _cryptanalyse}
+
+OPERATIONS = [*OPERATIONS_LOT, *OPERATIONS_REQUETE]
+
+_ERREURS_REQUETE = (OSError, IndexError, KeyError, TypeError, ValueError)
+
+
+def _traite_lot(lot):
+    """
+    Traite un lot de requêtes dans un processus du groupe.
+    Chaque requête est d'abord vérifiée seule : une requête invalide n'empêche
+    pas le traitement des autres. Les chiffrements, puis les déchiffrements,
+    valides d'au plus TAILLE_MAX_GROUPE lettres sont ensuite faits en un seul
+    appel à chiffre_vigenere_lot() et dechiffre_vigenere_lot().
+    Args:
+        lot (list): Les couples (opération, paramètres)
+    Returns:
+        list: Pour chaque requête, ("ok", résultat) ou ("erreur", message)
+    """
+    reponses = [None] * len(lot)
+    a_grouper = {operation: [] for operation in OPERATIONS_LOT}
+    for rang, (operation, parametres) in enumerate(lot):
+        try:
+            texte = parametres.get("texte")
+            if not isinstance(texte, str):
+                raise ValueError("Le texte doit être une chaîne")
+            if operation in OPERATIONS_LOT:
+                key = _clef(parametres)
+                if len(texte) <= TAILLE_MAX_GROUPE:
+                    _verifie_texte(texte)
+                    a_grouper[operation].append((rang, texte, key))
+                else:
+                    reponses[rang] = ("ok", {"texte": OPERATIONS_LOT[operation][1](texte, key)})
+            else:
+                reponses[rang] = ("ok", OPERATIONS_REQUETE[operation](parametres))
+        except _ERREURS_REQUETE as e:
+            reponses[rang] = ("erreur", str(e))
+    for operation, requetes in a_grouper.items():
+        if not requetes:
+            continue
+        rangs, textes, keys = zip(*requetes)
+        try:
+            resultats = [("ok", {"texte": texte}) for texte in OPERATIONS_LOT[operation][0](list(textes), list(keys))]
+        except _ERREURS_REQUETE as e:
+            resultats = [("erreur", str(e))] * len(rangs)
+        for rang, resultat in zip(rangs, resultats):
+            reponses[rang] = resultat
+    return reponses
+
+
+def _prechauffe():
+    """
+    Charge les modèles de langue dans chaque processus du groupe, avant la première requête.
+    """
+    for code in langues_disponibles():
+        modele_langue(code)
+
+
+class ServeurVigenere:
+    """
+    Service HTTP local de chiffrement et de cryptanalyse (voir le début du module).
+    Attributs:
+        processus (int): Le nombre de processus du groupe
+        taille_lot (int): Le nombre maximal de requêtes par lot
+        delai_lot (float): L'attente maximale, en secondes, pour compléter un lot
+        max_attente (int): Le nombre maximal de requêtes en cours
+    """
+
+    def __init__(self, processus=None, taille_lot=TAILLE_LOT, delai_lot=DELAI_LOT, max_attente=MAX_ATTENTE):
+        self.processus = processus or os.cpu_count() or 1
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        self.max_attente = max_attente
+        self._groupe = None
+        self._serveur = None
+        self._groupeur = None
+        self._file = None
+        self._places = None
+        self._en_cours = 0
+        self._debut = time.perf_counter()
+        self._requetes = {operation: 0 for operation in OPERATIONS}
+        self._rejetees = 0
+        self._erreurs = 0
+        self._lots = 0
+        self._requetes_lots = 0
+        self._caracteres = 0
+        self._latences = deque(maxlen=NB_LATENCES)
+
+    async def demarre(self, hote="127.0.0.1", port=PORT):
+        """
+        Démarre le groupe de processus et écoute sur hote:port (port 0 : un port libre).
+        Returns:
+            int: Le port d'écoute
+        """
+        self._groupe = ProcessPoolExecutor(max_workers=self.processus, initializer=_prechauffe)
+        self._file = asyncio.Queue()
+        # Un lot par processus au plus : les lots suivants attendent dans la file
+        self._places = asyncio.Semaphore(self.processus)
+        self._groupeur = asyncio.create_task(self._groupe_requetes())
+        self._serveur = await asyncio.start_server(self._connexion, hote, port)
+        return self._serveur.sockets[0].getsockname()[1]
+
+    async def arrete(self):
+        self._serveur.close()
+        await self._serveur.wait_closed()
+        self._groupeur.cancel()
+        self._groupe.shutdown()
+
+    async def soumet(self, operation, parametres):
+        """
+        Met une requête en file et attend son résultat.
+        Args:
+            operation (str): "chiffre", "dechiffre" ou "cryptanalyse"
+            parametres (dict): Les paramètres de la requête
+        Returns:
+            dict: Le résultat de l'opération
+        """
+        if self._en_cours >= self.max_attente:
+            self._rejetees += 1
+            raise RequeteInvalide(503, "Trop de requêtes en cours")
+        self._en_cours += 1
+        debut = time.perf_counter()
+        try:
+            futur = asyncio.get_running_loop().create_future()
+            await self._file.put((operation, parametres, futur))
+            etat, resultat = await futur
+        finally:
+            self._en_cours -= 1
+        self._requetes[operation] += 1
+        self._latences.append(time.perf_counter() - debut)
+        if etat == "erreur":
+            self._erreurs += 1
+            raise RequeteInvalide(400, resultat)
+        self._caracteres += len(parametres["texte"])
+        return resultat
+
+    async def _groupe_requetes(self):
+        """
+        Regroupe les requêtes de la file en lots et les envoie au groupe de processus.
+        """
+        boucle = asyncio.get_running_loop()
+        while True:
+            lot = [await self._file.get()]
+            fin = boucle.time() + self.delai_lot
+            while len(lot) < self.taille_lot:
+                reste = fin - boucle.time()
+                if reste <= 0:
+                    break
+                try:
+                    lot.append(await asyncio.wait_for(self._file.get(), reste))
+                except asyncio.TimeoutError:
+                    break
+            await self._places.acquire()
+            asyncio.create_task(self._traite(lot))
+
+    async def _traite(self, lot):
+        try:
+            reponses = await asyncio.get_running_loop().run_in_executor(
+                self._groupe, _traite_lot, [(operation, parametres) for operation, parametres, futur in lot])
+        except Exception as e:
+            reponses = [("erreur", str(e))] * len(lot)
+        finally:
+            self._places.release()
+        self._lots += 1
+        self._requetes_lots += len(lot)
+        for (operation, parametres, futur), reponse in zip(lot, reponses):
+            if not futur.done():
+                futur.set_result(reponse)
+
+    def mesures(self):
+        """
+        Renvoie les mesures du service : requêtes traitées par opération,
+        requêtes refusées et en erreur, taille moyenne des lots, latences
+        (moyenne et percentiles, en secondes) et débits depuis le démarrage.
+        """
+        duree = time.perf_counter() - self._debut
+        latences = sorted(self._latences)
+        total = sum(self._requetes.values())
+
+        def percentile(p):
+            return latences[min(len(latences) - 1, int(p * len(latences)))] if latences else None
+
+        return {"requetes": dict(self._requetes),
+                "rejetees": self._rejetees,
+                "erreurs": self._erreurs,
+                "en_cours": self._en_cours,
+                "lots": self._lots,
+                "taille_moyenne_lot": self._requetes_lots / self._lots if self._lots else None,
+                "latence": {"moyenne": sum(latences) / len(latences) if latences else None,
+                            "p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)},
+                "requetes_par_seconde": total / duree,
+                "caracteres_par_seconde": self._caracteres / duree,
+                "duree": duree}
+
+    async def _connexion(self, lecteur, ecrivain):
+        """
+        Sert les requêtes HTTP/1.1 d'une connexion, tant que le client la garde ouverte.
+        """
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                try:
+                    methode, chemin, version = ligne.decode("latin-1").split()
+                except ValueError:
+                    await self._repond(ecrivain, 400, {"erreur": "Requête invalide"}, False)
+                    break
+                entetes = {}
+                while True:
+                    entete = await lecteur.readline()
+                    if entete in (b"\r\n", b"\n", b""):
+                        break
+                    nom, _, valeur = entete.decode("latin-1").partition(":")
+                    entetes[nom.strip().lower()] = valeur.strip()
+                garde = entetes.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                longueur = entetes.get("content-length", "0") or "0"
+                if not (longueur.isascii() and longueur.isdigit()):
+                    await self._repond(ecrivain, 400, {"erreur": "Content-Length invalide"}, False)
+                    break
+                taille = int(longueur)
+                if taille > TAILLE_MAX:
+                    await self._repond(ecrivain, 413, {"erreur": "Requête trop grande"}, False)
+                    break
+                corps = await lecteur.readexactly(taille) if taille else b""
+                statut, reponse = await self._route(methode, chemin, corps)
+                await self._repond(ecrivain, statut, reponse, garde)
+                if not garde:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            ecrivain.close()
+
+    async def _route(self, methode, chemin, corps):
+        try:
+            operation = chemin.strip("/")
+            if operation == "mesures":
+                if methode != "GET":
+                    raise RequeteInvalide(405, "Utiliser GET")
+                return 200, self.mesures()
+            if operation not in OPERATIONS:
+                raise RequeteInvalide(404, "Opération inconnue : " + chemin)
+            if methode != "POST":
+                raise RequeteInvalide(405, "Utiliser POST")
+            try:
+                parametres = json.loads(corps)
+            except ValueError:
+                raise RequeteInvalide(400, "Le corps doit être un objet JSON")
+            if not isinstance(parametres, dict):
+                raise RequeteInvalide(400, "Le corps doit être un objet JSON")
+            return 200, await self.soumet(operation, parametres)
+        except RequeteInvalide as e:
+            return e.statut, {"erreur": str(e)}
+
+    async def _repond(self, ecrivain, statut, reponse, garde):
+        corps = json.dumps(reponse).encode("utf-8")
+        entetes = ["HTTP/1.1 %d %s" % (statut, _MESSAGES_HTTP[statut]),
+                   "Content-Type: application/json",
+                   "Content-Length: " + str(len(corps)),
+                   "Connection: " + ("keep-alive" if garde else "close")]
+        if statut == 503:
+            entetes.append("Retry-After: 1")
+        ecrivain.write(("\r\n".join(entetes) + "\r\n\r\n").encode("latin-1") + corps)
+        await ecrivain.drain()
+
+
+def usage():
+    print("Usage: python3 serveur_vigenere.py [-a <adresse>] [-p <port>] [-j <processus>] [-l <requetes par lot>]"
+          " [-q <requetes en cours max>]", file=sys.stderr)
+    sys.exit(1)
+
+
+async def sert(serveur, hote, port):
+    port = await serveur.demarre(hote, port)
+    print("Service de cryptanalyse sur http://%s:%d (%d processus)" % (hote, port, serveur.processus))
+    await asyncio.Event().wait()
+
+
+def main(argv):
+    hote = "127.0.0.1"
+    port = PORT
+    processus = None
+    taille_lot = TAILLE_LOT
+    max_attente = MAX_ATTENTE
+    try:
+        opts, args = getopt.getopt(argv, "ha:p:j:l:q:")
+    except getopt.GetoptError:
+        usage()
+    for opt, arg in opts:
+        if opt == '-h':
+            usage()
+        elif opt == '-a':
+            hote = arg
+        elif opt == '-p':
+            port = int(arg)
+        elif opt == '-j':
+            processus = int(arg)
+        elif opt == '-l':
+            taille_lot = int(arg)
+        elif opt == '-q':
+            max_attente = int(arg)
+    try:
+        asyncio.run(sert(ServeurVigenere(processus, taille_lot, max_attente=max_attente), hote, port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -7,3 +7,23 @@ python3 test-6-ICM-decalages.py
 python3 test-7-cryptanalyse-V2.py
 python3 test-8-correlations.py
 python3 test-9-cryptanalyse-V3.py
+python3 test-10-analyse.py
+python3 test-11-cryptanalyse-lot.py
+python3 test-12-fichiers.py
+python3 test-13-kasiski.py
+python3 test-14-longueurs.py
+python3 test-15-langues.py
+python3 test-16-cryptanalyse-V4.py
+python3 test-17-langues-auto.py
+python3 test-18-mesures.py
+python3 test-19-progression.py
+python3 test-20-serveur.py
+python3 test-21-cache.py
+python3 test-22-alphabets.py
+python3 test-23-candidats.py
+python3 test-24-incremental.py
+python3 test-25-messages.py
+python3 test-26-mot-probable.py
+python3 test-27-lot.py
+python3 test-28-corpus.py
+python3 test-29-echantillon.py
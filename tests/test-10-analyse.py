@@ -0,0 +1,58 @@
+import cryptanalyse_vigenere
+
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+text2 = read("data/text2.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 10 : Analyse du chiffre")
+
+print("---------------------")
+
+print("Test AnalyseChiffre")
+analyse = AnalyseChiffre(text1, 26)
+for key_length in range(1, 31):
+    assert analyse.histogrammes(key_length) == [freq(col) for col in columnsExtractor(text1, key_length)]
+assert AnalyseChiffre("ALKINDI", 5).histogrammes(5) == [freq(col) for col in columnsExtractor("ALKINDI", 5)]
+assert AnalyseChiffre("", 3).histogrammes(3) == [[0.0] * 26] * 3
+# Sur un long texte, plusieurs longueurs sont comptées sur une période commune
+groupes = cryptanalyse_vigenere._regroupe_longueurs(list(range(26, 13, -1)), 1000)
+assert sorted(k for periode, longueurs in groupes for k in longueurs) == list(range(14, 27))
+assert all(periode <= 1000 and all(periode % k == 0 for k in longueurs) for periode, longueurs in groupes)
+assert len(groupes) < 13
+long1 = text1 * 600
+mesures = Mesures()
+analyse = AnalyseChiffre(long1, 26, mesures)
+assert mesures.compteurs["caracteres_lus"] < 13 * len(long1)
+for key_length in range(1, 27):
+    assert analyse.histogrammes(key_length) == [freq(col) for col in columnsExtractor(long1, key_length)]
+print("Test AnalyseChiffre : OK")
+
+print("---------------------")
+
+print("Test colonnes")
+assert columnsExtractor("ALKINDI", 3) == ["AII", "LN", "KD"]
+assert columnsExtractor("AB", 4) == ["A", "B", "", ""]
+for key_length in [1, 2, 7, 26, len(text1), len(text1) + 3]:
+    assert constructTextFromColumns(columnsExtractor(text1, key_length)) == text1
+assert constructTextFromColumns(["ÉA", "C"]) == "ÉCA"
+assert constructTextFromColumns([]) == ""
+print("Test colonnes : OK")
+
+print("---------------------")
+
+print("Test analyse partagee")
+analyse = AnalyseChiffre(text2, 26)
+assert longueur_clef(text2, analyse) == 10
+assert clef_par_decalages(text2, 10, analyse) == clef_par_decalages(text2, 10)
+assert tableau_decalages_ICM(text2, 10, analyse) == [0, 25, 5, 6, 13, 25, 1, 16, 4, 8]
+assert clef_correlations(text2, 10, analyse=analyse) == clef_correlations(text2, 10)
+# Sans analyse partagée, seule la longueur demandée est comptée
+mesures = Mesures()
+AnalyseChiffre(text2, 0, mesures).histogrammes(10)
+assert mesures.compteurs["histogrammes"] == 10
+print("Test analyse partagee : OK")
+
+print("\n\n----------------------------------------------\n\n")
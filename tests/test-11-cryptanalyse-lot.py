@@ -0,0 +1,35 @@
+import os, tempfile
+
+from cryptanalyse_vigenere import *
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 11 : Cryptanalyse d'un lot de fichiers")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3_clef")
+(score1, key1) = cryptanalyse_v3_clef(read("data/text1.cipher"))
+assert abs(score1 - 0.89) < 0.01
+assert key1 == [10, 9, 7, 0, 24, 22, 0]
+assert dechiffre_vigenere(read("data/text1.cipher"), cryptanalyse_v1_clef(read("data/text1.cipher"))[1]) == cryptanalyse_v1(read("data/text1.cipher"))
+assert dechiffre_vigenere(read("data/text1.cipher"), cryptanalyse_v2_clef(read("data/text1.cipher"))[1]) == cryptanalyse_v2(read("data/text1.cipher"))
+print("Test cryptanalyse_v3_clef : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_lot")
+fichiers = ["data/text" + str(i) + ".cipher" for i in range(1, 11)]
+with tempfile.TemporaryDirectory() as sortie:
+    resultats = cryptanalyse_lot(fichiers, 3, sortie, processus=2, taille_paquet=3)
+    assert [r["fichier"] for r in resultats] == fichiers
+    for i, r in enumerate(resultats, 1):
+        assert r["erreur"] == ""
+        assert r["clef"] == cryptanalyse_v3_clef(read(fichiers[i - 1]))[1]
+        assert read(r["clair"]) == cryptanalyse_v3(read(fichiers[i - 1]))
+    ecrire_resultats_lot(resultats, os.path.join(sortie, "resultats.tsv"))
+    with open(os.path.join(sortie, "resultats.tsv")) as f:
+        assert len(f.readlines()) == len(fichiers) + 1
+print("Test cryptanalyse_lot : OK")
+
+print("\n\n----------------------------------------------\n\n")
@@ -0,0 +1,43 @@
+import os, tempfile
+
+from cryptanalyse_vigenere import *
+
+plain1 = read("data/text1.plain")
+key1 = [10, 9, 7, 0, 24, 22, 0]
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 12 : Chiffrement de fichiers par blocs")
+
+print("---------------------")
+
+print("Test chiffre_vigenere_fichier")
+with tempfile.TemporaryDirectory() as dossier:
+    source = os.path.join(dossier, "clair")
+    chiffre = os.path.join(dossier, "chiffre")
+    dechiffre = os.path.join(dossier, "dechiffre")
+    with open(source, "w") as f:
+        f.write(plain1[:200] + "\n" + plain1[200:] + "\n")
+    for taille_bloc in [1, 5, 7, 64, TAILLE_BLOC]:
+        assert chiffre_vigenere_fichier(source, chiffre, key1, taille_bloc) == len(plain1)
+        assert read(chiffre) == read("data/text1.cipher")
+        assert dechiffre_vigenere_fichier(chiffre, dechiffre, key1, taille_bloc) == len(plain1)
+        assert read(dechiffre) == plain1
+    with open(source, "w") as f:
+        f.write("ALICE ET BOB")
+    try:
+        chiffre_vigenere_fichier(source, chiffre, key1)
+        assert False
+    except ValueError:
+        pass
+print("Test chiffre_vigenere_fichier : OK")
+
+print("---------------------")
+
+print("Test clef_depuis_texte")
+assert clef_depuis_texte("KJHAYWA") == key1
+assert clef_depuis_texte("kjhaywa") == key1
+assert clef_depuis_texte("10,9,7,0,24,22,0") == key1
+print("Test clef_depuis_texte : OK")
+
+print("\n\n----------------------------------------------\n\n")
@@ -0,0 +1,36 @@
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+text2 = read("data/text2.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 13 : Examen de Kasiski")
+
+print("---------------------")
+
+print("Test index_kasiski")
+par_distance = index_kasiski("ABCXABCYAB", 2)
+assert par_distance[4] == 3
+assert sum(par_distance) == 3
+assert index_kasiski("ABCXABCYAB", 3)[4] == 1
+assert sum(index_kasiski("ABCDEFGH", 2)) == 0
+print("Test index_kasiski : OK")
+
+print("---------------------")
+
+print("Test longueurs_kasiski")
+assert 7 in longueurs_kasiski(text1, 26, 3)
+assert 10 in longueurs_kasiski(text2, 26, 3)
+assert longueurs_kasiski("ABCDEFGH", 26, 3) == []
+assert len(longueurs_kasiski(text1, 500, 5)) == 5
+print("Test longueurs_kasiski : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3_clef avec Kasiski")
+assert cryptanalyse_v3_clef(text1, selection="kasiski") == cryptanalyse_v3_clef(text1)
+assert cryptanalyse_v3_clef(text2, max_key_length=500, selection="kasiski")[1] == cryptanalyse_v3_clef(text2)[1]
+print("Test cryptanalyse_v3_clef avec Kasiski : OK")
+
+print("\n\n----------------------------------------------\n\n")
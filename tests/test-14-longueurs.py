@@ -0,0 +1,39 @@
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+text2 = read("data/text2.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 14 : Selection des longueurs de clé")
+
+print("---------------------")
+
+print("Test coincidences")
+analyse = AnalyseChiffre(text1, 10)
+for key_length in [1, 7, 10, 30, 100]:
+    hists = [freq(col) for col in columnsExtractor(text1, key_length)]
+    egales = sum([int(c) * (int(c) - 1) // 2 for h in hists for c in h])
+    paires = sum([len(col) * (len(col) - 1) // 2 for col in columnsExtractor(text1, key_length)])
+    assert analyse.coincidences(key_length) == (egales, paires)
+print("Test coincidences : OK")
+
+print("---------------------")
+
+print("Test longueurs_ic")
+assert longueurs_ic(text1, 26, 1) == [7]
+assert longueurs_ic(text2, 500, 1) == [10]
+assert len(longueurs_ic(text1, 500, 5)) == 5
+assert longueur_clef(text1, max_key_length=5) == 0
+assert longueur_clef(text1, max_key_length=30) == 7
+print("Test longueurs_ic : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3_clef avec selection IC")
+assert cryptanalyse_v3_clef(text1, selection="ic") == cryptanalyse_v3_clef(text1)
+assert cryptanalyse_v3_clef(text2, max_key_length=500, selection="ic")[1] == [24, 23, 3, 4, 11, 23, 25, 14, 2, 6]
+assert cryptanalyse_v3(text2, 500, "ic") == read("data/text2.plain")
+print("Test cryptanalyse_v3_clef avec selection IC : OK")
+
+print("\n\n----------------------------------------------\n\n")
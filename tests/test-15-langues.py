@@ -0,0 +1,50 @@
+import os, tempfile
+
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 15 : Modeles de langue")
+
+print("---------------------")
+
+print("Test normalise_texte et compte_ngrammes")
+assert normalise_texte("Élève, cœur! 42") == b"ELEVECOEUR"
+assert compte_ngrammes(b"ABAB", 1)[:3] == [2, 2, 0]
+assert compte_ngrammes(b"ABAB", 2)[1] == 2
+assert compte_ngrammes(b"ABAB", 2)[26] == 1
+assert sum(compte_ngrammes(b"ABCDEFG", 4)) == 4
+print("Test normalise_texte et compte_ngrammes : OK")
+
+print("---------------------")
+
+print("Test ecrire_modele_langue")
+with tempfile.TemporaryDirectory() as dossier:
+    fichier = os.path.join(dossier, "XX.vlm")
+    lettres = normalise_texte("Le chiffre de Vigenère est un système de chiffrement par substitution")
+    ecrire_modele_langue(fichier, "Test", freq_EN, [compte_ngrammes(lettres, n) for n in range(1, 3)])
+    modele = ModeleLangue(fichier)
+    assert modele.nom == "Test"
+    assert modele.ordre == 2
+    assert modele.frequences == freq_EN
+    assert len(modele.table(2)) == 26 * 26
+    assert abs(10 ** modele.table(1)[alphabet.index("E")] - lettres.count(b"E") / len(lettres)) < 1e-6
+    assert modele.table(2)[alphabet.index("D") * 26 + alphabet.index("E")] > modele.table(2)[0]
+print("Test ecrire_modele_langue : OK")
+
+print("---------------------")
+
+print("Test langues_disponibles")
+assert "FR" in langues_disponibles()
+assert "EN" in langues_disponibles()
+assert modele_langue("FR").frequences == freq_FR
+assert modele_langue("EN").frequences == freq_EN
+assert modele_langue("FR").ordre == 4
+assert modele_langue("FR") is modele_langue("FR")
+assert clef_correlations(text1, 7, "FR") == clef_correlations(text1, 7)
+assert clef_correlations(text1, 7, "EN") == clef_correlations_anglais(text1, 7)
+print("Test langues_disponibles : OK")
+
+print("\n\n----------------------------------------------\n\n")
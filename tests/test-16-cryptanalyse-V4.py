@@ -0,0 +1,46 @@
+from cryptanalyse_vigenere import *
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 16 : Cryptanalyse V4")
+
+print("---------------------")
+
+print("Test affine_clef")
+text94 = read("data/text94.cipher")
+key94 = [22, 12, 23, 19, 13, 6, 7, 8, 10, 9, 2, 18, 7, 25, 17, 16, 10, 13]
+(score_v3, key_v3) = cryptanalyse_v3_clef(text94)
+assert key_v3 != key94
+(score, key) = affine_clef(text94, key_v3)
+assert key == key94
+assert affine_clef(text94, key94) == (score, key94)
+# Avec un seul ordre, l'affinage améliore la clé de la V3 : meilleur score pour
+# cet ordre (max_tours=0 donne le score de la clé sans la modifier) et plus de lettres justes
+plain94 = read("data/text94.plain")
+justes = lambda key: sum(a == b for a, b in zip(dechiffre_vigenere(text94, key), plain94))
+for ordre in [2, 3, 4]:
+    (score_ordre, key_ordre) = affine_clef(text94, key_v3, ordre=ordre)
+    assert score_ordre > affine_clef(text94, key_v3, ordre=ordre, max_tours=0)[0]
+    assert justes(key_ordre) > justes(key_v3)
+assert affine_clef(text94, key_v3, ordre=2)[1] == key94
+assert affine_clef("ABC", [3], ordre=4) == (0.0, [3])
+# Seules les FENETRE_AFFINAGE premières lettres par colonne servent à l'affinage
+long94 = text94 * 1000
+assert affine_clef(long94, key_v3) == affine_clef(long94[:FENETRE_AFFINAGE * len(key_v3)], key_v3, fenetre=None)
+print("Test affine_clef : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v4")
+count = 0
+for i in range(1,101):
+    if cryptanalyse_v4(read("data/text"+str(i)+".cipher")) == read("data/text"+str(i)+".plain"):
+        count+=1
+        print("Cryptanalysis of data/text"+str(i)+" = SUCCESS")
+    else:
+        print("Cryptanalysis of data/text"+str(i)+" = FAILED")
+print("\n"+str(count)+" texts successfully unciphered.")
+assert count > 94
+print("Test cryptanalyse_v4 : OK")
+
+print("\n\n----------------------------------------------\n\n")
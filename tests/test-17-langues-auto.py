@@ -0,0 +1,43 @@
+from cryptanalyse_vigenere import *
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 17 : Detection de la langue")
+
+print("---------------------")
+
+print("Test clef_correlations_langues")
+text1 = read("data/text1.cipher")
+for key_length in [1, 7, 13]:
+    scores = clef_correlations_langues(text1, key_length, ["FR", "EN", freq_FR])
+    assert scores[0] == clef_correlations(text1, key_length, freq_FR)
+    assert scores[1] == clef_correlations(text1, key_length, freq_EN)
+    assert scores[2] == scores[0]
+print("Test clef_correlations_langues : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_langues")
+anglais = normalise_texte(
+    "It was a bright cold day in April, and the people of the town went about their "
+    "business as if nothing had happened during the night. The baker opened his shop "
+    "early, the children walked to school along the river, and the old man who kept "
+    "the lighthouse climbed the stairs once more to look at the sea. Nobody noticed the "
+    "letter that had been left on the table of the station master, written in a hand "
+    "that nobody in the village would have recognised, and signed with a single letter."
+).decode()
+clef = [7, 4, 11, 11, 14]
+assert cryptanalyse_langues(chiffre_vigenere(anglais, clef)) == \
+    ("EN",) + cryptanalyse_v3_clef(chiffre_vigenere(anglais, clef), "EN")
+assert cryptanalyse_langues(chiffre_vigenere(anglais, clef))[2] == clef
+assert cryptanalyse_langues(text1, ["FR"]) == ("FR",) + cryptanalyse_v3_clef(text1)
+count = 0
+for i in range(1,101):
+    (langue, score, key) = cryptanalyse_langues(read("data/text"+str(i)+".cipher"))
+    if langue == "FR":
+        count+=1
+print("\n"+str(count)+" texts detected as French.")
+assert count == 100
+print("Test cryptanalyse_langues : OK")
+
+print("\n\n----------------------------------------------\n\n")
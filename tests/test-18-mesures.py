@@ -0,0 +1,64 @@
+import json, os, tempfile
+
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 18 : Instrumentation")
+
+print("---------------------")
+
+print("Test Mesures")
+mesures = Mesures()
+with mesures.etape("a"):
+    mesures.compte("x")
+    mesures.compte("x", 2)
+with mesures.etape("a"):
+    pass
+assert mesures.etapes["a"]["appels"] == 2
+assert mesures.etapes["a"]["duree"] >= 0
+assert mesures.compteurs == {"x": 3}
+with SANS_MESURES.etape("a"):
+    SANS_MESURES.compte("x")
+assert SANS_MESURES.en_dict() == {"etapes": {}, "compteurs": {}}
+print("Test Mesures : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3 avec mesures")
+mesures = Mesures()
+assert cryptanalyse_v3(text1, mesures=mesures) == cryptanalyse_v3(text1)
+assert set(mesures.etapes) == {"histogrammes", "selection_longueurs", "correlations", "dechiffrement"}
+assert mesures.compteurs["longueurs_evaluees"] == 26
+assert mesures.compteurs["histogrammes"] == sum(range(1, 27))
+assert mesures.compteurs["correlations"] == 26 * sum(range(1, 27))
+assert mesures.compteurs["caracteres_lus"] == 13 * len(text1)
+assert mesures.compteurs["caracteres_dechiffres"] == len(text1)
+print("Test cryptanalyse_v3 avec mesures : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v1, v2 et v4 avec mesures")
+for version, etapes in [(cryptanalyse_v1, {"longueur_clef", "decalages"}),
+                        (cryptanalyse_v2, {"longueur_clef", "decalages"}),
+                        (cryptanalyse_v4, {"selection_longueurs", "correlations", "affinage"})]:
+    mesures = Mesures()
+    assert version(text1, mesures=mesures) == version(text1)
+    assert etapes | {"histogrammes", "dechiffrement"} == set(mesures.etapes)
+print("Test cryptanalyse_v1, v2 et v4 avec mesures : OK")
+
+print("---------------------")
+
+print("Test export JSON")
+with tempfile.TemporaryDirectory() as dossier:
+    fichier = os.path.join(dossier, "mesures.json")
+    main(["-v", "3", "-f", "data/text1.cipher", "-m", fichier])
+    with open(fichier) as f:
+        export = json.load(f)
+    assert export["compteurs"]["longueurs_evaluees"] == 26
+    assert export["etapes"]["total"]["duree"] >= export["etapes"]["correlations"]["duree"]
+print("Test export JSON : OK")
+
+print("\n\n----------------------------------------------\n\n")
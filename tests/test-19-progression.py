@@ -0,0 +1,46 @@
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 19 : Progression et interruption")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3_clef avec progression")
+appels = []
+assert cryptanalyse_v3_clef(text1, progression=lambda *p: appels.append(p)) == cryptanalyse_v3_clef(text1)
+assert appels == [("histogrammes", k, 13) for k in range(13)] + [("longueurs", k, 26) for k in range(27)]
+appels = []
+cryptanalyse_v3_clef(text1, selection="ic", progression=lambda *p: appels.append(p))
+assert appels[-1] == ("longueurs", 5, 5)
+print("Test cryptanalyse_v3_clef avec progression : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_langues avec progression")
+appels = []
+assert cryptanalyse_langues(text1, progression=lambda *p: appels.append(p)) == cryptanalyse_langues(text1)
+assert appels[-1] == ("longueurs", 31, 31)
+print("Test cryptanalyse_langues avec progression : OK")
+
+print("---------------------")
+
+print("Test AnalyseInterrompue")
+def interrompt(etape, faites, total):
+    appels.append((etape, faites, total))
+    if etape == "longueurs" and faites == 3:
+        raise AnalyseInterrompue()
+
+for recherche in [cryptanalyse_v3_clef, cryptanalyse_v4_clef]:
+    appels = []
+    try:
+        recherche(text1, progression=interrompt)
+        assert False
+    except AnalyseInterrompue:
+        pass
+    assert appels[-1] == ("longueurs", 3, 26)
+print("Test AnalyseInterrompue : OK")
+
+print("\n\n----------------------------------------------\n\n")
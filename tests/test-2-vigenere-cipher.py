@@ -10,6 +10,9 @@ assert chiffre_vigenere("ALICE",[0]) == "ALICE"
 assert chiffre_vigenere("ALICE",[3]) == "DOLFH"
 assert chiffre_vigenere("ALICE",[1,2,3]) == "BNLDG"
 assert chiffre_vigenere(read("data/text1.plain"),[10,9,7,0,24,22,0]) == read("data/text1.cipher")
+assert chiffre_vigenere("ALICE",[1,2,3,4,5,6,7,8]) == "BNLGJ"
+assert chiffre_vigenere("ALICE",[-1,27]) == "ZMHDD"
+assert chiffre_vigenere("",[1,2,3]) == ""
 print("Test chiffre_vigenere : OK")
 
 print("---------------------")
@@ -19,6 +22,8 @@ assert dechiffre_vigenere("ALICE",[0]) == "ALICE"
 assert dechiffre_vigenere("DOLFH",[3]) == "ALICE"
 assert dechiffre_vigenere("BNLDG",[1,2,3]) == "ALICE"
 assert dechiffre_vigenere(read("data/text1.cipher"),[10,9,7,0,24,22,0]) == read("data/text1.plain")
+assert dechiffre_vigenere("BNLGJ",[1,2,3,4,5,6,7,8]) == "ALICE"
+assert dechiffre_vigenere("ZMHDD",[-1,27]) == "ALICE"
 print("Test dechiffre_vigenere : OK")
 
 print("\n\n----------------------------------------------\n\n")
@@ -0,0 +1,128 @@
+import asyncio, http.client, json, socket, threading
+
+from cryptanalyse_vigenere import *
+from serveur_vigenere import ServeurVigenere, _traite_lot
+
+text1 = read("data/text1.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 20 : Service local")
+
+print("---------------------")
+
+serveur = ServeurVigenere(processus=1, max_attente=2)
+boucle = asyncio.new_event_loop()
+port = boucle.run_until_complete(serveur.demarre(port=0))
+threading.Thread(target=boucle.run_forever, daemon=True).start()
+
+
+def requete(methode, chemin, corps=None):
+    connexion = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    connexion.request(methode, chemin, None if corps is None else json.dumps(corps))
+    reponse = connexion.getresponse()
+    resultat = (reponse.status, json.loads(reponse.read()))
+    connexion.close()
+    return resultat
+
+
+def requete_brute(donnees):
+    # Requête HTTP écrite à la main, pour des en-têtes que http.client refuse d'envoyer
+    with socket.create_connection(("127.0.0.1", port), timeout=60) as connexion:
+        connexion.sendall(donnees)
+        return int(connexion.recv(65536).split(b" ")[1])
+
+
+print("Test chiffre, dechiffre et cryptanalyse")
+assert requete("POST", "/chiffre", {"texte": "ALKINDI", "clef": "KJH"}) == \
+    (200, {"texte": chiffre_vigenere("ALKINDI", [10, 9, 7])})
+assert requete("POST", "/dechiffre", {"texte": text1, "clef": [10, 9, 7, 0, 24, 22, 0]}) == \
+    (200, {"texte": read("data/text1.plain")})
+(statut, reponse) = requete("POST", "/cryptanalyse", {"texte": text1})
+assert statut == 200
+assert reponse["clef"] == [10, 9, 7, 0, 24, 22, 0]
+assert reponse["texte"] == read("data/text1.plain")
+(statut, reponse) = requete("POST", "/cryptanalyse", {"texte": text1, "version": 3, "langue": "auto"})
+assert reponse["langue"] == "FR"
+print("Test chiffre, dechiffre et cryptanalyse : OK")
+
+print("---------------------")
+
+print("Test erreurs")
+assert requete("POST", "/chiffre", {"texte": "abc", "clef": "KJH"})[0] == 400
+assert requete("POST", "/chiffre", {"texte": "ABC"})[0] == 400
+assert requete("POST", "/cryptanalyse", {"texte": text1, "version": 7})[0] == 400
+assert requete("GET", "/chiffre")[0] == 405
+assert requete("POST", "/cryptanalyse", {"texte": text1, "version": True})[0] == 400
+assert requete("POST", "/cryptanalyse", {"texte": text1, "langue": 5})[0] == 400
+# La langue n'est jamais un chemin, et "auto" n'existe qu'en V3
+(statut, reponse) = requete("POST", "/cryptanalyse", {"texte": text1, "version": 3, "langue": "../data/text1"})
+assert (statut, reponse) == (400, {"erreur": "Langue inconnue : ../data/text1"})
+(statut, reponse) = requete("POST", "/cryptanalyse", {"texte": text1, "version": 4, "langue": "auto"})
+assert (statut, reponse) == (400, {"erreur": "La langue \"auto\" n'existe qu'en version 3"})
+for longueur in [b"abc", b"-3", b"+3"]:
+    assert requete_brute(b"POST /chiffre HTTP/1.1\r\nContent-Length: " + longueur + b"\r\n\r\n{}") == 400
+# Une requête invalide n'échoue que pour elle-même, pas pour son lot
+reponses = _traite_lot([("chiffre", {"texte": "ALKINDI", "clef": [1]}),
+                        ("cryptanalyse", {"texte": text1, "langue": 5}),
+                        ("cryptanalyse", {"texte": text1, "langue": ["FR"]}),
+                        ("cryptanalyse", {"texte": text1, "version": True}),
+                        ("cryptanalyse", {"texte": text1, "version": 3.0}),
+                        ("cryptanalyse", {"texte": text1, "langue": "../langues/FR"}),
+                        ("cryptanalyse", {"texte": text1, "version": 2, "langue": "auto"}),
+                        ("cryptanalyse", {"texte": text1})])
+assert [statut for statut, resultat in reponses] == ["ok"] + ["erreur"] * 6 + ["ok"]
+assert reponses[0][1] == {"texte": chiffre_vigenere("ALKINDI", [1])}
+assert reponses[-1][1]["clef"] == [10, 9, 7, 0, 24, 22, 0]
+# Les chiffrements et déchiffrements courts et valides d'un lot sont faits ensemble,
+# les textes longs (text1) un par un
+reponses = _traite_lot([("chiffre", {"texte": "ALKINDI", "clef": "KJH"}),
+                        ("chiffre", {"texte": "abc", "clef": [1]}),
+                        ("dechiffre", {"texte": text1, "clef": [10, 9, 7, 0, 24, 22, 0]}),
+                        ("chiffre", {"texte": "ALKINDI", "clef": []}),
+                        ("dechiffre", {"texte": "ÉTÉ", "clef": [1]}),
+                        ("inconnue", {"texte": "ALKINDI"}),
+                        ("chiffre", {"texte": "", "clef": [-3, 300]}),
+                        ("chiffre", {"texte": "ZORRO", "clef": [-3, 300]}),
+                        ("chiffre", {"texte": text1.lower(), "clef": [1]})])
+assert [statut for statut, resultat in reponses] == \
+    ["ok", "erreur", "ok", "erreur", "erreur", "erreur", "ok", "ok", "erreur"]
+assert [resultat["texte"] for statut, resultat in reponses if statut == "ok"] == \
+    [chiffre_vigenere("ALKINDI", [10, 9, 7]), read("data/text1.plain"), "", chiffre_vigenere("ZORRO", [-3, 300])]
+assert reponses[3][1] == "La clé est vide"
+assert requete("POST", "/inconnue", {})[0] == 404
+print("Test erreurs : OK")
+
+print("---------------------")
+
+print("Test regroupement en lots")
+lots = serveur.mesures()["lots"]
+async def soumissions():
+    return await asyncio.gather(*[serveur.soumet("chiffre", {"texte": "ALKINDI", "clef": [i]}) for i in range(2)])
+resultats = asyncio.run_coroutine_threadsafe(soumissions(), boucle).result()
+assert [r["texte"] for r in resultats] == [chiffre_vigenere("ALKINDI", [i]) for i in range(2)]
+assert serveur.mesures()["lots"] == lots + 1
+print("Test regroupement en lots : OK")
+
+print("---------------------")
+
+print("Test limite de requetes en cours")
+long = text1 * 200
+statuts = []
+clients = [threading.Thread(target=lambda: statuts.append(requete("POST", "/cryptanalyse", {"texte": long})[0]))
+           for _ in range(6)]
+for client in clients:
+    client.start()
+for client in clients:
+    client.join()
+assert sorted(set(statuts)) == [200, 503]
+mesures = requete("GET", "/mesures")[1]
+assert mesures["rejetees"] == statuts.count(503)
+assert mesures["requetes"]["chiffre"] == 5
+assert mesures["erreurs"] == 7
+assert mesures["latence"]["p50"] <= mesures["latence"]["p99"]
+print("Test limite de requetes en cours : OK")
+
+asyncio.run_coroutine_threadsafe(serveur.arrete(), boucle).result()
+
+print("\n\n----------------------------------------------\n\n")
@@ -0,0 +1,100 @@
+import hashlib, os, tempfile
+
+import cryptanalyse_vigenere
+
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+text2 = read("data/text2.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 21 : Cache des resultats")
+
+print("---------------------")
+
+print("Test CacheCryptanalyse en memoire")
+cache = CacheCryptanalyse(taille=2)
+for version in CLEFS_CRYPTANALYSE:
+    assert cache.clef(text1, version) == CLEFS_CRYPTANALYSE[version](text1)
+assert cache.echecs == 4
+assert cache.clef(text1, 4) == cryptanalyse_v4_clef(text1)
+assert cache.succes_memoire == 1
+assert cache.clef(text1, 1) == cryptanalyse_v1_clef(text1)
+assert cache.echecs == 5
+assert cache.statistiques()["en_memoire"] == 2
+assert cache.clef(text1, 3, "EN") == cryptanalyse_v3_clef(text1, "EN")
+assert cache.clef(text1, 3, freq_EN) == cryptanalyse_v3_clef(text1, freq_EN)
+assert cache.clef(text1, 3, max_key_length=10) == cryptanalyse_v3_clef(text1, None, 10)
+assert cache.echecs == 8
+assert CacheCryptanalyse.empreinte(text1, {"version": 3}) != CacheCryptanalyse.empreinte(text2, {"version": 3})
+assert CacheCryptanalyse.empreinte(text1, {"version": 3}) != CacheCryptanalyse.empreinte(text1, {"version": 4})
+print("Test CacheCryptanalyse en memoire : OK")
+
+print("---------------------")
+
+print("Test CacheCryptanalyse sur disque")
+with tempfile.TemporaryDirectory() as dossier:
+    cache = CacheCryptanalyse(dossier=dossier)
+    resultat = cache.clef(text2, 3)
+    cache = CacheCryptanalyse(dossier=dossier)
+    assert cache.clef(text2, 3) == resultat
+    assert cache.clef(text2, 3) == resultat
+    assert cache.statistiques() == {"succes_memoire": 1, "succes_disque": 1, "echecs": 0,
+                                    "taux_succes": 1.0, "en_memoire": 1}
+    fichiers = [f for racine, dossiers, noms in os.walk(dossier) for f in noms]
+    assert len(fichiers) == 1
+    with open(os.path.join(dossier, fichiers[0][:2], fichiers[0])) as f:
+        assert read("data/text2.plain")[:20] not in f.read()
+    # Les résultats d'une autre version du cache ne servent plus
+    cryptanalyse_vigenere.VERSION_CACHE += 1
+    try:
+        cache = CacheCryptanalyse(dossier=dossier)
+        assert cache.clef(text2, 3) == resultat
+        assert cache.echecs == 1
+    finally:
+        cryptanalyse_vigenere.VERSION_CACHE -= 1
+print("Test CacheCryptanalyse sur disque : OK")
+
+print("---------------------")
+
+print("Test CacheCryptanalyse copies des clefs")
+cache = CacheCryptanalyse()
+score, key = cache.clef(text1, 3)
+attendue = list(key)
+key[0] = 99
+score, key = cache.clef(text1, 3)
+assert key == attendue
+key.append(0)
+assert cache.clef(text1, 3)[1] == attendue
+with open(os.path.join(DOSSIER_LANGUES, "FR" + EXTENSION_MODELE), "rb") as f:
+    assert modele_langue("FR").empreinte == hashlib.sha256(f.read()).hexdigest()
+print("Test CacheCryptanalyse copies des clefs : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse avec cache")
+cache = CacheCryptanalyse()
+for version in CLEFS_CRYPTANALYSE:
+    assert cryptanalyse("data/text1.cipher", version, cache=cache) == cryptanalyse("data/text1.cipher", version)
+    assert cryptanalyse("data/text1.cipher", version, cache=cache) == cryptanalyse("data/text1.cipher", version)
+assert cache.statistiques()["taux_succes"] == 0.5
+print("Test cryptanalyse avec cache : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse V3 avec cache sans modele de langue")
+# Sans dossier langues/, la V3 se contente de freq_FR, avec ou sans cache
+attendu = cryptanalyse("data/text1.cipher", 3)
+dossier, modeles = cryptanalyse_vigenere.DOSSIER_LANGUES, dict(cryptanalyse_vigenere._MODELES)
+with tempfile.TemporaryDirectory() as vide:
+    cryptanalyse_vigenere.DOSSIER_LANGUES = vide
+    cryptanalyse_vigenere._MODELES.clear()
+    try:
+        assert cryptanalyse("data/text1.cipher", 3, cache=CacheCryptanalyse()) == attendu
+    finally:
+        cryptanalyse_vigenere.DOSSIER_LANGUES = dossier
+        cryptanalyse_vigenere._MODELES.update(modeles)
+print("Test cryptanalyse V3 avec cache sans modele de langue : OK")
+
+print("\n\n----------------------------------------------\n\n")
@@ -0,0 +1,78 @@
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+plain1 = read("data/text1.plain")
+score1, key1 = cryptanalyse_v3_clef(text1)
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 22 : Alphabets et caracteres conserves")
+
+print("---------------------")
+
+print("Test Alphabet")
+assert len(ALPHABET_LATIN) == 26 and len(ALPHABET_ALPHANUMERIQUE) == 36
+assert ALPHABET_FRANCAIS.indice("É") == ALPHABET_FRANCAIS.lettres.index("É")
+try:
+    ALPHABET_LATIN.indice("É")
+    assert False
+except ValueError:
+    pass
+try:
+    Alphabet("ABA")
+    assert False
+except ValueError:
+    pass
+assert ALPHABET_LATIN.lettres_de("Hello, WORLD! Élève") == "HELLOWORLDELEVE"
+assert ALPHABET_FRANCAIS.lettres_de("Élève, cœur") == "ÉLÈVECŒUR"
+assert Alphabet("A-]^").chiffre("A-]^", [1]) == "-]^A"
+assert ALPHABET_LATIN.chiffre(plain1, key1) == chiffre_vigenere(plain1, key1)
+print("Test Alphabet : OK")
+
+print("---------------------")
+
+print("Test Alphabets accentue et alphanumerique")
+for alpha, clair in [(ALPHABET_FRANCAIS, "ÉLÈVEÀLÉCOLEŒUVRE"), (ALPHABET_ALPHANUMERIQUE, "RENDEZVOUS12H30")]:
+    for key in [[0], [7], [3, 30, 1, 15]]:
+        chiffre = chiffre_vigenere(clair, key, alpha)
+        assert dechiffre_vigenere(chiffre, key, alpha) == clair
+    assert chiffre_cesar(clair, 5, alpha) == chiffre_vigenere(clair, [5], alpha)
+    assert dechiffre_cesar(chiffre_cesar(clair, 5, alpha), 5, alpha) == clair
+assert chiffre_vigenere("Z9", [1], ALPHABET_ALPHANUMERIQUE) == "0A"
+try:
+    chiffre_vigenere("ÉTÉ", [1])
+    assert False
+except ValueError:
+    pass
+print("Test Alphabets accentue et alphanumerique : OK")
+
+print("---------------------")
+
+print("Test mode conserve")
+# Aucune lettre ne reste en clair : minuscules et accents sont chiffrés, seuls les autres caractères passent
+for alpha, clair in [(ALPHABET_LATIN, "attaque à l'aube, ÉTÉ À PARIS, cœur"),
+                     (ALPHABET_FRANCAIS, "attaque à l'aube, ÉTÉ À PARIS, cœur"),
+                     (ALPHABET_ALPHANUMERIQUE, "rendez-vous à 12h30")]:
+    chiffre = chiffre_vigenere(clair, [1, 2, 3], alpha, conserve=True)
+    assert all(c in alpha.indices or not c.isalpha() for c in chiffre)
+    assert alpha.lettres_de(chiffre) == chiffre_vigenere(alpha.lettres_de(clair), [1, 2, 3], alpha)
+    assert [c for c in chiffre if c not in alpha.indices] == [c for c in alpha.normalise(clair)
+                                                               if c not in alpha.indices]
+assert chiffre_vigenere("attaque à l'aube", [1, 2, 3], conserve=True) == "BVWBSXF C O'BWEF"
+assert chiffre_vigenere("Hello, WORLD! ABC", [1, 2], conserve=True) == "IGMNP, YPTMF! BDD"
+for lettre in ["Ω", "ø"]:
+    try:
+        chiffre_vigenere("ABC " + lettre, [1], conserve=True)
+        assert False
+    except ValueError:
+        pass
+texte = "RENDEZ-VOUS A 12H30, QUAI N° 4.\n"
+chiffre = chiffre_vigenere(texte, [3, 1, 4], conserve=True)
+assert ALPHABET_LATIN.lettres_de(chiffre) == chiffre_vigenere(ALPHABET_LATIN.lettres_de(texte), [3, 1, 4])
+assert dechiffre_vigenere(chiffre, [3, 1, 4], conserve=True) == texte
+assert chiffre_cesar(" !?", 4, conserve=True) == " !?"
+# Un texte chiffré avec ses espaces se casse sur ses seules lettres
+espaces = " ".join(text1[i:i + 5] for i in range(0, len(text1), 5)) + "."
+assert cryptanalyse_v3_clef(ALPHABET_LATIN.lettres_de(espaces)) == (score1, key1)
+assert dechiffre_vigenere(espaces, key1, conserve=True).replace(" ", "") == plain1 + "."
+print("Test mode conserve : OK")
@@ -0,0 +1,45 @@
+import itertools
+
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+text2 = read("data/text2.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 23 : Meilleures clefs candidates")
+
+print("---------------------")
+
+print("Test candidats_clefs")
+for text in [text1, text2]:
+    candidats = candidats_clefs(text, 10)
+    assert len(candidats) == 10
+    assert candidats[0][:2] == cryptanalyse_v3_clef(text)
+    assert all(m > 0 for m in candidats[0][2])
+    scores = [score for score, key, marges in candidats]
+    assert scores == sorted(scores, reverse=True)
+    assert len(set(tuple(key) for score, key, marges in candidats)) == 10
+assert candidats_clefs(text1, 1, "EN")[0][:2] == cryptanalyse_v3_clef(text1, "EN")
+assert candidats_clefs(text1, 1, selection="ic")[0][:2] == cryptanalyse_v3_clef(text1, selection="ic")
+print("Test candidats_clefs : OK")
+
+print("---------------------")
+
+print("Test candidats_clefs contre toutes les clefs")
+# Toutes les clés de longueur 1 et 2, une clé répétée (AA) étant la même que sa période (A)
+text = text1[:300]
+toutes = {}
+for key_length in [1, 2]:
+    correlations = [correlations_decalages(freq_FR, hist) for hist in AnalyseChiffre(text).histogrammes(key_length)]
+    for key in itertools.product(range(26), repeat=key_length):
+        score = sum(correlations[i][d] for i, d in enumerate(key)) / key_length
+        periode = key[:1] if len(set(key)) == 1 else key
+        toutes[periode] = max(toutes.get(periode, score), score)
+attendus = sorted(toutes.values(), reverse=True)[:40]
+candidats = candidats_clefs(text, 40, max_key_length=2)
+assert all(abs(score - attendu) < 1e-9 for (score, key, marges), attendu in zip(candidats, attendus))
+for score, key, marges in candidats:
+    periode = tuple(key[:1]) if len(set(key)) == 1 else tuple(key)
+    assert abs(toutes[periode] - score) < 1e-9
+print("Test candidats_clefs contre toutes les clefs : OK")
@@ -0,0 +1,51 @@
+from cryptanalyse_vigenere import *
+
+text1 = read("data/text1.cipher")
+text2 = read("data/text2.cipher")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 24 : Cryptanalyse incrementale")
+
+print("---------------------")
+
+print("Test AnalyseIncrementale")
+for text in [text1, text2]:
+    for taille in [1, 7, 100, 500]:
+        analyse = AnalyseIncrementale()
+        for i in range(0, len(text), taille):
+            analyse.append(text[i:i + taille])
+        assert analyse.cipher == text
+        complete = AnalyseChiffre(text)
+        for key_length in [1, 5, 13, 26, 40]:
+            assert analyse.histogrammes(key_length) == complete.histogrammes(key_length)
+        assert analyse.coincidences(30) == complete.coincidences(30)
+        assert analyse.clef() == cryptanalyse_v3_clef(text)
+print("Test AnalyseIncrementale : OK")
+
+print("---------------------")
+
+print("Test AnalyseIncrementale au fil du texte")
+analyse = AnalyseIncrementale(max_key_length=20)
+for fin in range(150, len(text1), 150):
+    analyse.append(text1[fin - 150:fin])
+    assert analyse.clef("EN") == cryptanalyse_v3_clef(text1[:fin], "EN", 20)
+    # Une longueur comptée à la demande suit les ajouts suivants
+    assert analyse.histogrammes(31) == AnalyseChiffre(text1[:fin]).histogrammes(31)
+# Les histogrammes des colonnes déjà renvoyés ne changent pas avec les ajouts suivants
+avant = list(analyse.histogrammes(7))
+copie = [hist[:] for hist in avant]
+analyse.append("A")
+analyse.append(text1[:1000])
+assert avant == copie and analyse.histogrammes(7) != copie
+analyse = AnalyseIncrementale(max_key_length=20)
+analyse.append(text1[:fin])
+try:
+    analyse.append("abc")
+    assert False
+except ValueError:
+    pass
+assert analyse.cipher == text1[:fin]
+analyse.append("")
+assert analyse.cipher == text1[:fin]
+print("Test AnalyseIncrementale au fil du texte : OK")
@@ -0,0 +1,42 @@
+from cryptanalyse_vigenere import *
+
+plain1 = read("data/text1.plain")
+plain2 = read("data/text2.plain")
+text1 = read("data/text1.cipher")
+key1 = cryptanalyse_v3_clef(text1)[1]
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 25 : Messages chiffres avec la meme clef")
+
+print("---------------------")
+
+print("Test AnalyseMessages")
+seul = AnalyseMessages([text1])
+complete = AnalyseChiffre(text1)
+for key_length in [1, 7, 26, 30]:
+    assert seul.histogrammes(key_length) == complete.histogrammes(key_length)
+    assert seul.coincidences(key_length) == complete.coincidences(key_length)
+assert cryptanalyse_messages_clef([text1]) == cryptanalyse_v3_clef(text1)
+
+messages = [text1[:100], text1[100:207], text1[300:]]
+analyse = AnalyseMessages(messages)
+for key_length in [3, 7, 40]:
+    for i, hist in enumerate(analyse.histogrammes(key_length)):
+        assert hist == freq("".join(m[i::key_length] for m in messages))
+egales, paires = analyse.coincidences(5)
+assert paires == sum(len(c) * (len(c) - 1) for c in ["".join(m[i::5] for m in messages) for i in range(5)]) // 2
+print("Test AnalyseMessages : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_messages")
+# Des morceaux de 40 lettres, trop courts pour la V3, chiffrés chacun depuis le début de la clé
+clair = plain1 + plain2
+morceaux = [clair[i:i + 40] for i in range(0, 40 * 30, 40)]
+messages = [chiffre_vigenere(morceau, key1) for morceau in morceaux]
+assert cryptanalyse_v3_clef(messages[0])[1] != key1
+assert cryptanalyse_messages_clef(messages)[1] == key1
+assert cryptanalyse_messages(messages) == morceaux
+assert cryptanalyse_messages_clef(messages + ["ABC"], max_key_length=10)[1] == key1
+print("Test cryptanalyse_messages : OK")
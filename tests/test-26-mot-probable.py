@@ -0,0 +1,53 @@
+from cryptanalyse_vigenere import *
+
+plain1 = read("data/text1.plain")
+text1 = read("data/text1.cipher")
+key1 = cryptanalyse_v3_clef(text1)[1]
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 26 : Mot probable")
+
+print("---------------------")
+
+print("Test positions_mot_probable")
+mot = plain1[200:214]
+assert (200, key1) in positions_mot_probable(text1, mot)
+assert (200, key1) in positions_mot_probable(text1, mot.lower())
+assert all(len(key) <= 6 for position, key in positions_mot_probable(text1, mot, max_key_length=6))
+assert positions_mot_probable(text1, mot, min_controles=8) == []
+assert positions_mot_probable("ABC", mot) == []
+
+
+# Recherche position par position, pour comparer
+def positions_une_a_une(cipher, mot, max_key_length, min_controles):
+    resultats = []
+    for position in range(len(cipher) - len(mot) + 1):
+        morceau = [(alphabet.index(cipher[position + j]) - alphabet.index(mot[j])) % 26 for j in range(len(mot))]
+        for k in range(1, min(max_key_length, len(mot) - min_controles) + 1):
+            if all(morceau[j] == morceau[j + k] for j in range(len(mot) - k)):
+                resultats.append((position, [morceau[(i - position) % k] for i in range(k)]))
+                break
+    return resultats
+
+
+court = text1[:600]
+for mot, min_controles in [(plain1[40:52], 5), ("EEEEEEE", 3), ("ABAB", 1), ("QUE", 1)]:
+    assert positions_mot_probable(court, mot, 26, min_controles) == positions_une_a_une(court, mot, 26, min_controles)
+try:
+    positions_mot_probable(text1, "MOT PROBABLE")
+    assert False
+except ValueError:
+    pass
+print("Test positions_mot_probable : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_mots_probables")
+resultats = cryptanalyse_mots_probables(text1, [plain1[17:33], plain1[94:110], "TRUC"])
+key, texte, occurrences = resultats[0]
+assert key == key1
+assert texte == plain1
+assert occurrences == [(plain1[17:33], 17), (plain1[94:110], 94)]
+assert cryptanalyse_mots_probables(text1, ["TRUC"]) == []
+print("Test cryptanalyse_mots_probables : OK")
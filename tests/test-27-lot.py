@@ -0,0 +1,38 @@
+import random
+
+from cryptanalyse_vigenere import *
+
+plain1 = read("data/text1.plain")
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 27 : Chiffrement par lots")
+
+print("---------------------")
+
+print("Test chiffre_vigenere_lot")
+rng = random.Random(27)
+messages = []
+keys = []
+for i in range(500):
+    debut = rng.randrange(len(plain1))
+    messages.append(plain1[debut:debut + rng.randrange(0, 50)])
+    keys.append([rng.randrange(-30, 300) for j in range(rng.randrange(1, 15))])
+chiffres = chiffre_vigenere_lot(messages, keys)
+assert chiffres == [chiffre_vigenere(message, key) for message, key in zip(messages, keys)]
+assert dechiffre_vigenere_lot(chiffres, keys) == messages
+assert dechiffre_vigenere_lot(chiffres, keys) == [dechiffre_vigenere(c, key) for c, key in zip(chiffres, keys)]
+assert chiffre_vigenere_lot(["ZZZ", "", "AB"], [[25], [1], [1, 2]]) == ["YYY", "", "BD"]
+assert chiffre_vigenere_lot([], []) == []
+print("Test chiffre_vigenere_lot : OK")
+
+print("---------------------")
+
+print("Test chiffre_vigenere_lot erreurs")
+for messages, keys in [(["ABC", "abc"], [[1], [1]]), (["ABC"], [[]]), (["ABC", "DEF"], [[1]])]:
+    try:
+        chiffre_vigenere_lot(messages, keys)
+        assert False
+    except ValueError:
+        pass
+print("Test chiffre_vigenere_lot erreurs : OK")
@@ -0,0 +1,56 @@
+import os, tempfile
+
+from cryptanalyse_vigenere import *
+
+corpus = "".join(read("data/text" + str(i) + ".plain") + "\n" for i in range(1, 21))
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 28 : Entrainement d'un modele de langue")
+
+print("---------------------")
+
+print("Test compte_corpus")
+with tempfile.TemporaryDirectory() as dossier:
+    premier = os.path.join(dossier, "premier.txt")
+    second = os.path.join(dossier, "second.txt")
+    with open(premier, "w", encoding="utf-8") as f:
+        f.write("L'élève, le cœur... et 42 ans !\n" + corpus)
+    with open(second, "w", encoding="utf-8") as f:
+        f.write(corpus[:1000])
+    lettres = [normalise_texte("L'élève, le cœur... et 42 ans !\n" + corpus), normalise_texte(corpus[:1000])]
+    # Les morceaux coupent les n-grammes, mais les n-grammes ne passent pas d'un fichier à l'autre
+    for taille_morceau in [1, 5, 300, TAILLE_MORCEAU_CORPUS]:
+        frequences, comptes = compte_corpus([premier, second], 4, 2, taille_morceau)
+        for n in range(1, 5):
+            attendus = [a + b for a, b in zip(compte_ngrammes(lettres[0], n), compte_ngrammes(lettres[1], n))]
+            assert comptes[n - 1] == attendus
+    assert abs(sum(frequences) - 1) < 1e-9
+    assert frequences[alphabet.index("E")] == max(frequences)
+    assert len(compte_corpus([second], 2, 1)[1]) == 2
+    vide = os.path.join(dossier, "vide.txt")
+    with open(vide, "w") as f:
+        f.write("123 !?\n")
+    try:
+        compte_corpus([vide], 4, 1)
+        assert False
+    except ValueError:
+        pass
+print("Test compte_corpus : OK")
+
+print("---------------------")
+
+print("Test entraine_modele_langue")
+with tempfile.TemporaryDirectory() as dossier:
+    fichier = os.path.join(dossier, "corpus.txt")
+    with open(fichier, "w", encoding="utf-8") as f:
+        f.write(corpus)
+    modele = os.path.join(dossier, "XX.vlm")
+    assert entraine_modele_langue([fichier], modele, "Essai", processus=2) == len(normalise_texte(corpus))
+    essai = ModeleLangue(modele)
+    assert essai.nom == "Essai" and essai.ordre == 4
+    assert not os.path.exists(modele + ".tmp")
+    # Le modèle entraîné sert directement à la cryptanalyse
+    text1 = read("data/text1.cipher")
+    assert clef_correlations(text1, 7, essai.frequences)[1] == cryptanalyse_v3_clef(text1)[1]
+print("Test entraine_modele_langue : OK")
@@ -0,0 +1,67 @@
+import random
+
+from cryptanalyse_vigenere import *
+
+textes = [read("data/text" + str(i) + ".cipher") for i in range(1, 11)]
+
+# Un très long texte clair : les textes de data/ mélangés, plusieurs fois
+rng = random.Random(29)
+clairs = [read("data/text" + str(i) + ".plain") for i in range(1, 101)]
+long_clair = "".join("".join(rng.sample(clairs, len(clairs))) for i in range(12))
+
+print("\n\n----------------------------------------------\n\n")
+
+print("Test 29 : Cryptanalyse sur un echantillon")
+
+print("---------------------")
+
+print("Test confiance_decalage")
+hist = freq(textes[0][0::7])
+confiances = [confiance_decalage(freq_FR, hist, d) for d in range(26)]
+assert abs(sum(confiances) - 1) < 1e-9
+assert confiances.index(max(confiances)) == cryptanalyse_v3_clef(textes[0])[1][0]
+print("Test confiance_decalage : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3_echantillon_clef sur des textes courts")
+for text in textes:
+    score, key, confiance = cryptanalyse_v3_echantillon_clef(text)
+    assert (score, key) == cryptanalyse_v3_clef(text)
+    assert 0 < confiance <= 1
+print("Test cryptanalyse_v3_echantillon_clef sur des textes courts : OK")
+
+print("---------------------")
+
+print("Test cryptanalyse_v3_echantillon_clef sur un texte long")
+lus = []
+for key_length in [3, 20]:
+    key = [rng.randrange(26) for i in range(key_length)]
+    for taille in [len(long_clair) // 2, len(long_clair)]:
+        cipher = chiffre_vigenere(long_clair[:taille], key)
+        mesures = Mesures()
+        score, trouvee, confiance = cryptanalyse_v3_echantillon_clef(cipher, mesures=mesures)
+        assert dechiffre_vigenere(cipher[:1000], trouvee) == long_clair[:1000]
+        assert confiance > CONFIANCE_MIN
+        lus.append(mesures.compteurs["caracteres_lus"])
+# Le nombre de lettres lues ne dépend pas de la longueur du texte
+assert max(lus) < 30 * 26 * TAILLE_ECHANTILLON
+assert max(lus) < len(long_clair) // 2
+print("Test cryptanalyse_v3_echantillon_clef sur un texte long : OK")
+
+print("---------------------")
+
+print("Test elargissement de l'echantillon")
+key = [rng.randrange(26) for i in range(11)]
+cipher = chiffre_vigenere(long_clair, key)
+sans, avec = Mesures(), Mesures()
+score, cle_sans, confiance_sans = cryptanalyse_v3_echantillon_clef(cipher, None, 26, 2, 2, mesures=sans)
+score, cle_avec, confiance_avec = cryptanalyse_v3_echantillon_clef(cipher, None, 26, 2, 4096, mesures=avec)
+assert avec.compteurs["caracteres_lus"] > sans.compteurs["caracteres_lus"]
+assert cle_avec == key
+assert confiance_avec > confiance_sans
+analyse = AnalyseEchantillon(cipher, 8, 100)
+analyse.histogrammes(5)
+assert analyse.elargit(5, 0)
+assert not analyse.elargit(5, 0)
+print("Test elargissement de l'echantillon : OK")
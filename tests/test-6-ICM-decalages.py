@@ -17,6 +17,16 @@ print("Test tableau_decalages_naif : OK")
 
 print("---------------------")
 
+print("Test scores_decalages")
+f1 = freq(text1)
+f2 = freq(text2)
+produits = scores_decalages(matrice_decalages(f1), f2)
+for d in range(26):
+    assert abs(produits[d] / (sum(f1) * sum(f2)) - indice_coincidence_mutuelle(f1, f2, d)) < 1e-12
+print("Test scores_decalages : OK")
+
+print("---------------------")
+
 print("Test tableau_decalages_ICM")
 assert tableau_decalages_ICM("GHGHGH",2) == [0,1]
 assert tableau_decalages_ICM(text1,7) == [0, 25, 23, 16, 14, 12, 16]
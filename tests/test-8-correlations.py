@@ -17,6 +17,16 @@ print("Test correlations : OK")
 
 print("---------------------")
 
+print("Test correlations_decalages")
+hist = freq(text1)
+correlations = correlations_decalages(freq_FR, hist)
+assert len(correlations) == 26
+for d in range(26):
+    assert abs(correlations[d] - correlation(freq_FR, hist[d:] + hist[:d])) < 1e-9
+print("Test correlations_decalages : OK")
+
+print("---------------------")
+
 print("Test clef_correlations")
 (score0, key0) = clef_correlations("ALKINDI",2)
 assert abs(score0-0.34)<0.01